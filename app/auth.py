@@ -1,11 +1,18 @@
+import hashlib
+import hmac
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status, Response, Request
-from jose import JWTError, jwt
+import jwt
+from jwt.exceptions import InvalidTokenError
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from .database import get_db
 from .models import User
@@ -16,11 +23,83 @@ if not SECRET_KEY:
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
 
-pwd_context = CryptContext(schemes=["bcrypt_sha256"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt_sha256"], bcrypt_sha256__default_rounds=12, deprecated="auto")
+# Pin the native bcrypt backend (no silent pure-Python fallback) and hash once
+# so backend selection happens at import instead of on the first login.
+pwd_context.handler("bcrypt_sha256").set_backend("bcrypt")
+try:
+    pwd_context.hash("warmup")
+except Exception:
+    pass
+
+# bcrypt results, keyed by (hash, HMAC(SECRET_KEY, plaintext)) so resubmitting
+# the same credentials (redirect bounces, double posts) skips the ~100ms hash.
+# The plaintext itself is never stored; entries expire after a short TTL.
+# Set VERIFY_CACHE_ENABLED=false to always run bcrypt.
+VERIFY_CACHE_ENABLED = os.getenv("VERIFY_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+VERIFY_CACHE_TTL_SECONDS = int(os.getenv("VERIFY_CACHE_TTL_SECONDS", "60"))
+VERIFY_CACHE_MAX_SIZE = 10000
+_verify_cache: "OrderedDict[tuple, tuple[bool, float]]" = OrderedDict()
+# Logins run on threadpool threads; held only around cache reads and writes,
+# never across bcrypt
+_verify_cache_lock = threading.Lock()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    if not VERIFY_CACHE_ENABLED:
+        return pwd_context.verify(plain_password, hashed_password)
+
+    mac = hmac.new(SECRET_KEY.encode(), plain_password.encode(), hashlib.sha256).digest()
+    key = (hashed_password, mac)
+    now = time.monotonic()
+    with _verify_cache_lock:
+        cached = _verify_cache.get(key)
+        if cached is not None:
+            if cached[1] > now:
+                _verify_cache.move_to_end(key)
+                return cached[0]
+            del _verify_cache[key]
+
+    ok = pwd_context.verify(plain_password, hashed_password)
+    with _verify_cache_lock:
+        _verify_cache[key] = (ok, now + VERIFY_CACHE_TTL_SECONDS)
+        if len(_verify_cache) > VERIFY_CACHE_MAX_SIZE:
+            _verify_cache.popitem(last=False)
+    return ok
+
+
+# Failed logins per client IP within a sliding window. Distinct wrong passwords
+# always miss the cache above, so this is what bounds bcrypt work per attacker.
+LOGIN_MAX_FAILURES = int(os.getenv("LOGIN_MAX_FAILURES", "10"))
+LOGIN_FAILURE_WINDOW_SECONDS = 300
+# Past this many tracked IPs, those with no failure inside the window are dropped
+LOGIN_FAILURE_MAX_IPS = 10000
+_login_failures: "dict[str, list[float]]" = {}
+# Checked and recorded from threadpool threads and the event loop alike; a
+# failure appended while login_throttled swaps in the pruned list must not be lost
+_login_failures_lock = threading.Lock()
+
+
+def login_throttled(client_ip: str) -> bool:
+    now = time.monotonic()
+    with _login_failures_lock:
+        recent = [t for t in _login_failures.get(client_ip, ()) if t > now - LOGIN_FAILURE_WINDOW_SECONDS]
+        if recent:
+            _login_failures[client_ip] = recent
+        else:
+            _login_failures.pop(client_ip, None)
+    return len(recent) >= LOGIN_MAX_FAILURES
+
+
+def record_login_failure(client_ip: str):
+    now = time.monotonic()
+    with _login_failures_lock:
+        _login_failures.setdefault(client_ip, []).append(now)
+        if len(_login_failures) > LOGIN_FAILURE_MAX_IPS:
+            cutoff = now - LOGIN_FAILURE_WINDOW_SECONDS
+            for ip, times in list(_login_failures.items()):
+                if not times or times[-1] <= cutoff:
+                    del _login_failures[ip]
 
 
 def get_password_hash(password: str) -> str:
@@ -50,19 +129,118 @@ def clear_auth_cookie(response: Response):
     response.delete_cookie("access_token", path="/")
 
 
-async def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
+# Decoded JWT payloads keyed by the raw token, so a cookie presented repeatedly
+# within its lifetime skips signature verification. PyJWT compares signatures
+# with hmac.compare_digest on a miss.
+TOKEN_CACHE_MAX_SIZE = 10000
+_token_cache: "dict[str, tuple[dict, float]]" = {}
+
+
+def _decode_token(token: str) -> dict:
+    now = time.time()
+    cached = _token_cache.get(token)
+    if cached is not None:
+        payload, exp = cached
+        if exp > now:
+            return payload
+        # Request threads share the cache; another may have dropped it already
+        _token_cache.pop(token, None)
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options={"require": ["exp", "sub"]})
+    if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+        for key in [k for k, (_, e) in list(_token_cache.items()) if e <= now]:
+            _token_cache.pop(key, None)
+        if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+            return payload
+    _token_cache[token] = (payload, float(payload["exp"]))
+    return payload
+
+
+# username -> (User column values, expiry) so authenticated requests can skip
+# the user SELECT. Off by default. Entries are dropped when a User is flushed
+# as changed or deleted in this process; other worker processes see such a
+# change once their entry expires.
+USER_CACHE_ENABLED = os.getenv("USER_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = 10000
+_USER_CACHE_COLUMNS = ("id", "username", "hashed_password", "created_at")
+_user_cache: "dict[str, tuple[dict, float]]" = {}
+
+
+def _load_user(db: Session, username: str) -> Optional[User]:
+    if not USER_CACHE_ENABLED:
+        return db.query(User).filter(User.username == username).first()
+
+    now = time.monotonic()
+    cached = _user_cache.get(username)
+    if cached is not None:
+        values, exp = cached
+        if exp > now:
+            # A fresh detached instance per request: attributes are loaded,
+            # and db.merge()/db.add() treat it as the existing row.
+            user = User(**values)
+            make_transient_to_detached(user)
+            return user
+        _user_cache.pop(username, None)
+
+    user = db.query(User).filter(User.username == username).first()
+    if user is None:
+        return None
+    if len(_user_cache) >= USER_CACHE_MAX_SIZE:
+        for key in [k for k, (_, e) in list(_user_cache.items()) if e <= now]:
+            _user_cache.pop(key, None)
+        if len(_user_cache) >= USER_CACHE_MAX_SIZE:
+            return user
+    _user_cache[username] = (
+        {c: getattr(user, c) for c in _USER_CACHE_COLUMNS},
+        now + USER_CACHE_TTL_SECONDS,
+    )
+    return user
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_cached_users(session, flush_context):
+    if not _user_cache:
+        return
+    changed = {obj.id for obj in (*session.dirty, *session.deleted) if isinstance(obj, User)}
+    if changed:
+        for key, (values, _) in list(_user_cache.items()):
+            if values["id"] in changed:
+                _user_cache.pop(key, None)
+
+
+class HTMLAuthRequired(HTTPException):
+    """401 from a browser-facing route; the app turns it into a redirect to /login."""
+
+    def __init__(self, detail: str = "Not authenticated"):
+        super().__init__(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+
+
+def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
+    # Sync on purpose: FastAPI runs it in the threadpool, keeping the DB lookup
+    # off the event loop.
     token = request.cookies.get("access_token")
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_token(token)
         username: str = payload.get("sub")
         if username is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
-    except JWTError:
+    except InvalidTokenError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token invalid or expired")
 
-    user = db.query(User).filter(User.username == username).first()
+    user = _load_user(db, username)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     return user
+
+
+def get_current_user_html(request: Request, db: Session = Depends(get_db)) -> User:
+    """get_current_user for pages and links opened by the browser: raises HTMLAuthRequired instead."""
+    try:
+        return get_current_user(request, db)
+    except HTTPException as exc:
+        if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+            raise HTMLAuthRequired(detail=exc.detail) from None
+        raise
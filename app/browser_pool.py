@@ -0,0 +1,166 @@
+"""
+Pool of warm Chrome webdrivers shared across scrapes
+"""
+import os
+import time
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledDriver:
+    """A webdriver plus the bookkeeping used to decide when to recycle it"""
+
+    __slots__ = ('driver', 'created_at', 'pages_processed')
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.pages_processed = 0
+
+
+class BrowserPool:
+    """
+    Hand out up to `size` Chrome instances, reusing them between scrapes.
+
+    Starting Chrome costs far more than opening a window in a running one, so
+    drivers are kept alive after release. Each acquire() clears cookies and
+    all site storage (localStorage, IndexedDB, service workers, ...) and
+    switches to a fresh window so scrapes don't see each other's session.
+    Drivers are quit and replaced once they have served
+    `max_pages_processed` scrapes or are older than `max_age_seconds`, which
+    bounds the memory Chrome accumulates over a long run.
+    """
+
+    def __init__(
+        self,
+        driver_factory: Callable,
+        size: int = 2,
+        max_pages_processed: int = 50,
+        max_age_seconds: float = 1800,
+    ):
+        self.driver_factory = driver_factory
+        self.size = size
+        self.max_pages_processed = max_pages_processed
+        self.max_age_seconds = max_age_seconds
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle: List[_PooledDriver] = []
+        self._in_use: Dict[int, _PooledDriver] = {}
+        self._closed = False
+
+    def warm(self, count: Optional[int] = None):
+        """Start drivers ahead of the first scrape (e.g. at app startup)"""
+        count = self.size if count is None else min(count, self.size)
+        with self._lock:
+            missing = count - len(self._idle) - len(self._in_use)
+        for _ in range(max(missing, 0)):
+            entry = _PooledDriver(self.driver_factory())
+            with self._lock:
+                self._idle.append(entry)
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Return an isolated driver, blocking while all `size` are in use"""
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        if not self._slots.acquire(timeout=timeout if timeout is not None else -1):
+            raise TimeoutError("No browser available in pool")
+        try:
+            entry = None
+            with self._lock:
+                while self._idle and entry is None:
+                    candidate = self._idle.pop()
+                    if self._expired(candidate):
+                        self._quit(candidate)
+                    else:
+                        entry = candidate
+            if entry is None:
+                entry = _PooledDriver(self.driver_factory())
+            self._isolate(entry.driver)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._in_use[id(entry.driver)] = entry
+        return entry.driver
+
+    def release(self, driver):
+        """Return a driver to the pool, recycling it if it has aged out"""
+        with self._lock:
+            entry = self._in_use.pop(id(driver), None)
+        if entry is None:
+            return
+        entry.pages_processed += 1
+        try:
+            if self._closed or self._expired(entry):
+                self._quit(entry)
+            else:
+                with self._lock:
+                    self._idle.append(entry)
+        finally:
+            self._slots.release()
+
+    def recycle_idle(self):
+        """Quit idle drivers past their age or page budget"""
+        with self._lock:
+            expired = [e for e in self._idle if self._expired(e)]
+            self._idle = [e for e in self._idle if not self._expired(e)]
+        for entry in expired:
+            self._quit(entry)
+
+    def close(self):
+        """Quit every idle driver; in-use drivers are quit when released"""
+        self._closed = True
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for entry in idle:
+            self._quit(entry)
+
+    def _expired(self, entry: _PooledDriver) -> bool:
+        return (
+            entry.pages_processed >= self.max_pages_processed
+            or time.monotonic() - entry.created_at >= self.max_age_seconds
+        )
+
+    @staticmethod
+    def _isolate(driver):
+        """Drop the previous scrape's cookies and storage and start from a fresh window"""
+        # delete_all_cookies() only covers the current page's domain, so go
+        # through CDP to wipe every origin the last scrape touched
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": "*", "storageTypes": "all"})
+        old_handles = driver.window_handles
+        driver.switch_to.new_window('window')
+        fresh = driver.current_window_handle
+        for handle in old_handles:
+            if handle != fresh:
+                driver.switch_to.window(handle)
+                driver.close()
+        driver.switch_to.window(fresh)
+
+    @staticmethod
+    def _quit(entry: _PooledDriver):
+        try:
+            entry.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting pooled browser: {e}")
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool(driver_factory: Callable) -> BrowserPool:
+    """Return the process-wide pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(
+                driver_factory,
+                size=int(os.getenv("BROWSER_POOL_SIZE", "2")),
+                max_pages_processed=int(os.getenv("BROWSER_MAX_PAGES", "50")),
+                max_age_seconds=float(os.getenv("BROWSER_MAX_AGE_SECONDS", "1800")),
+            )
+        return _pool
@@ -3,9 +3,27 @@ Credential encryption utilities
 """
 import os
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives import hashes, hmac, padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
+from functools import lru_cache
+
+# Every Fernet token starts with version byte 0x80, i.e. "gAAAA" once encoded
+FERNET_TOKEN_PREFIX = "gAAAA"
+
+
+@lru_cache(maxsize=None)
+def _derive_key(secret_key: str) -> bytes:
+    """Derive the Fernet key for a secret once per process"""
+    # Derive a 32-byte key from the secret
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=b'finlan-salt-2026',  # Static salt (in production, use per-user salts)
+        iterations=100000
+    )
+    return base64.urlsafe_b64encode(kdf.derive(secret_key.encode()))
 
 
 class CredentialEncryptor:
@@ -20,31 +38,67 @@ class CredentialEncryptor:
         if not secret_key:
             raise RuntimeError("SECRET_KEY environment variable must be set")
         
-        # Derive a 32-byte key from the secret
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=b'finlan-salt-2026',  # Static salt (in production, use per-user salts)
-            iterations=100000
-        )
-        
-        key = base64.urlsafe_b64encode(kdf.derive(secret_key.encode()))
+        key = _derive_key(secret_key)
         self.cipher = Fernet(key)
+        # Fernet key layout: 16-byte HMAC signing key, then 16-byte AES key
+        raw_key = base64.urlsafe_b64decode(key)
+        self._hmac = hmac.HMAC(raw_key[:16], hashes.SHA256())
+        self._aes = algorithms.AES(raw_key[16:])
     
     def encrypt(self, plaintext: str) -> str:
         """Encrypt a password or sensitive string"""
         if not plaintext:
             return ""
-        encrypted_bytes = self.cipher.encrypt(plaintext.encode())
-        return base64.urlsafe_b64encode(encrypted_bytes).decode()
+        # Fernet tokens are already URL-safe base64
+        return self.cipher.encrypt(plaintext.encode()).decode()
     
     def decrypt(self, encrypted: str) -> str:
         """Decrypt an encrypted password"""
         if not encrypted:
             return ""
         try:
-            encrypted_bytes = base64.urlsafe_b64decode(encrypted.encode())
-            decrypted_bytes = self.cipher.decrypt(encrypted_bytes)
-            return decrypted_bytes.decode()
+            if not encrypted.startswith(FERNET_TOKEN_PREFIX):
+                # Legacy values were base64-encoded a second time
+                return self.cipher.decrypt(base64.urlsafe_b64decode(encrypted.encode())).decode()
+            return self.cipher.decrypt(encrypted.encode()).decode()
         except Exception:
             return ""
+    
+    def bulk_decrypt(self, ciphertexts: list) -> list:
+        """
+        Decrypt many values at once (e.g. loading every stored credential).
+        
+        Parses the Fernet token layout directly - version byte, 8-byte
+        timestamp, 16-byte IV, AES-CBC ciphertext, 32-byte HMAC - and reuses
+        one keyed HMAC context (copied per item) instead of Fernet's per-call
+        setup. Tokens are not TTL-checked, matching decrypt(). Values that
+        fail to verify decrypt to "", also matching decrypt().
+        """
+        results = []
+        for encrypted in ciphertexts:
+            if not encrypted:
+                results.append("")
+                continue
+            try:
+                results.append(self._decrypt_token(encrypted))
+            except Exception:
+                results.append("")
+        return results
+    
+    def _decrypt_token(self, encrypted: str) -> str:
+        """Verify and decrypt one Fernet token with the pre-keyed contexts"""
+        token = base64.urlsafe_b64decode(encrypted.encode())
+        if not encrypted.startswith(FERNET_TOKEN_PREFIX):
+            # Legacy values were base64-encoded a second time
+            token = base64.urlsafe_b64decode(token)
+        if len(token) < 57 or token[0] != 0x80:
+            raise ValueError("not a Fernet token")
+        
+        h = self._hmac.copy()
+        h.update(token[:-32])
+        h.verify(token[-32:])
+        
+        decryptor = Cipher(self._aes, modes.CBC(token[9:25])).decryptor()
+        padded = decryptor.update(token[25:-32]) + decryptor.finalize()
+        unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+        return (unpadder.update(padded) + unpadder.finalize()).decode()
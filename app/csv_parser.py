@@ -4,10 +4,163 @@ Handles: USB Bank, Chase, Fidelity, 401k, and generic CSV formats
 """
 import csv
 import io
-from datetime import datetime
+from datetime import date
 from decimal import Decimal
-from typing import List, Dict, Optional, Tuple
-import re
+from functools import lru_cache
+from itertools import chain, islice
+from typing import IO, Dict, Iterator, List, Optional, Tuple, Union
+
+# pyahocorasick matches every header signature in one pass; optional
+try:
+    import ahocorasick
+    _USE_AHOCORASICK = True
+except ImportError:
+    _USE_AHOCORASICK = False
+
+
+# Deletion table for money cells: one C-level pass instead of chained replace()
+_STRIP_MONEY = str.maketrans('', '', '$, ')
+
+# Shared zero for empty money cells; Decimal is immutable so reuse is safe
+ZERO = Decimal('0')
+
+# Parsers accept either the decoded text or an open (seekable) text stream
+CSVSource = Union[str, IO[str]]
+
+# Transactions per batch yielded by CSVParser.iter_transaction_batches
+TRANSACTION_BATCH_SIZE = 10000
+
+# Per-row parse failures reported back in parse_csv's 'row_errors'
+MAX_ROW_ERRORS = 100
+
+# Files with at least this many lines take the pandas path when available
+PANDAS_MIN_ROWS = 5000
+
+# How much of the first line is inspected when detecting the format
+HEADER_SCAN_CHARS = 512
+
+# Lowercased header fragments that identify a known export, checked in order
+HEADER_SIGNATURES = (
+    ('date","transaction","name","memo","amount', "usb_bank"),
+    ('details,posting date,description,amount,type,balance', "chase"),
+    ('account type,account,beginning mkt value', "fidelity_statement"),
+    ('run date,account,action,symbol,security description,quantity', "fidelity_transactions"),
+)
+
+
+def _build_signature_automaton():
+    """Aho-Corasick automaton over HEADER_SIGNATURES (value: (priority, format))"""
+    automaton = ahocorasick.Automaton()
+    for priority, (signature, format_type) in enumerate(HEADER_SIGNATURES):
+        automaton.add_word(signature, (priority, format_type))
+    automaton.make_automaton()
+    return automaton
+
+
+_SIGNATURE_AUTOMATON = _build_signature_automaton() if _USE_AHOCORASICK else None
+
+
+def _match_signature(first_line: str) -> Optional[str]:
+    """Format of the highest-priority signature found in first_line, if any"""
+    if _SIGNATURE_AUTOMATON is not None:
+        hits = [value for _, value in _SIGNATURE_AUTOMATON.iter(first_line)]
+        return min(hits)[1] if hits else None
+    for signature, format_type in HEADER_SIGNATURES:
+        if signature in first_line:
+            return format_type
+    return None
+
+
+def _year(value: str) -> int:
+    """Four-digit year; a two-digit "24" is rejected rather than read as 0024"""
+    if len(value) != 4 or not value.isdigit():
+        raise ValueError(f"expected a four-digit year, got {value!r}")
+    return int(value)
+
+
+def _parse_ymd(value: str) -> date:
+    """YYYY-MM-DD without strptime's per-call format machinery"""
+    y, m, d = value.split('-')
+    return date(_year(y), int(m), int(d))
+
+
+def _parse_mdy(value: str) -> date:
+    """MM/DD/YYYY without strptime's per-call format machinery"""
+    m, d, y = value.split('/')
+    return date(_year(y), int(m), int(d))
+
+
+def _parse_dmy(value: str) -> date:
+    """DD/MM/YYYY without strptime's per-call format machinery"""
+    d, m, y = value.split('/')
+    return date(_year(y), int(m), int(d))
+
+
+def _parse_ymd_slash(value: str) -> date:
+    """YYYY/MM/DD without strptime's per-call format machinery"""
+    y, m, d = value.split('/')
+    return date(_year(y), int(m), int(d))
+
+
+# Date shapes tried by parse_generic, most common (US exports) first
+GENERIC_DATE_PARSERS = (_parse_mdy, _parse_ymd, _parse_dmy, _parse_ymd_slash)
+
+
+def _note_row_error(errors: Optional[List[str]], line_num: int, exc: Exception) -> None:
+    """Record a row failure, keeping at most MAX_ROW_ERRORS messages"""
+    if errors is not None and len(errors) < MAX_ROW_ERRORS:
+        errors.append(f"row {line_num}: {exc}")
+
+
+def _note_invalid_rows(errors: Optional[List[str]], valid) -> None:
+    """_note_row_error for the rows a vectorized parse masked out"""
+    if errors is None:
+        return
+    for i in valid.index[~valid.to_numpy()][:MAX_ROW_ERRORS - len(errors)]:
+        # +2: header line plus 1-based numbering
+        errors.append(f"row {i + 2}: invalid date or amount")
+
+
+def _to_columns(rows: Iterator[Dict]) -> Dict[str, List]:
+    """Collect row dicts into one list per key (struct-of-arrays)"""
+    columns: Dict[str, List] = {}
+    count = 0
+    for row in rows:
+        for key, value in row.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [None] * count
+            column.append(value)
+        count += 1
+    return columns
+
+
+def _text_stream(source: CSVSource) -> IO[str]:
+    """Return a text stream over source; file-like inputs are used as-is"""
+    return io.StringIO(source) if isinstance(source, str) else source
+
+
+@lru_cache(maxsize=None)
+def _pandas():
+    """
+    pandas (pulled in by yfinance) parses large exports in C; optional.
+    Imported on the first file that needs it rather than at startup, since
+    loading pandas costs far more than a typical upload; None if missing.
+    """
+    try:
+        import pandas
+    except ImportError:
+        return None
+    return pandas
+
+
+def _use_frame(source: CSVSource) -> bool:
+    """Whether source is in-memory text large enough for the pandas path"""
+    return (
+        isinstance(source, str)
+        and source.count('\n') >= PANDAS_MIN_ROWS
+        and _pandas() is not None
+    )
 
 
 class CSVParser:
@@ -16,30 +169,17 @@ class CSVParser:
     @staticmethod
     def detect_format(content: str) -> str:
         """Detect CSV format based on headers and content"""
-        lines = content.strip().split('\n')
-        if not lines:
-            return "unknown"
+        # Only the header matters, so never lowercase/split more than a prefix
+        head = content[:4096].strip()
+        newline = head.find('\n')
+        first_line = (head if newline == -1 else head[:newline])[:HEADER_SCAN_CHARS].lower()
         
-        first_line = lines[0].lower()
-        
-        # USB Bank format
-        if 'date","transaction","name","memo","amount' in first_line:
-            return "usb_bank"
-        
-        # Chase format
-        if 'details,posting date,description,amount,type,balance' in first_line:
-            return "chase"
-        
-        # Fidelity Statement format
-        if 'account type,account,beginning mkt value' in first_line:
-            return "fidelity_statement"
-        
-        # Fidelity Transaction History format
-        if 'run date,account,action,symbol,security description,quantity' in first_line:
-            return "fidelity_transactions"
+        format_type = _match_signature(first_line)
+        if format_type:
+            return format_type
         
         # 401k format (has header rows)
-        if 'plan name:' in first_line or ('date range' in first_line and len(lines) > 2):
+        if 'plan name:' in first_line or ('date range' in first_line and head.count('\n') >= 2):
             return "401k"
         
         # Generic transaction format
@@ -49,63 +189,186 @@ class CSVParser:
         return "unknown"
     
     @staticmethod
-    def parse_usb_bank(content: str) -> List[Dict]:
+    def parse_usb_bank(content: CSVSource, errors: Optional[List[str]] = None) -> List[Dict]:
         """Parse USB Bank CSV format"""
-        transactions = []
-        reader = csv.DictReader(io.StringIO(content))
+        if _use_frame(content):
+            try:
+                return CSVParser._parse_usb_bank_frame(content, errors)
+            except ValueError:
+                pass  # ragged rows etc. - fall back to the row parser
+        return list(CSVParser._iter_usb_bank(content, errors))
+    
+    @staticmethod
+    def _iter_usb_bank(source: CSVSource, errors: Optional[List[str]] = None) -> Iterator[Dict]:
+        """Yield transactions from USB Bank CSV format"""
+        reader = csv.reader(_text_stream(source))
+        header = next(reader, None)
+        if not header:
+            return
+        idx = {h: i for i, h in enumerate(header)}
+        try:
+            d, t, n, a = idx['Date'], idx['Transaction'], idx['Name'], idx['Amount']
+        except KeyError:
+            return
+        m = idx.get('Memo')
+        
+        _Dec = Decimal
+        _parse_date = _parse_ymd
+        _strip = _STRIP_MONEY
         
         for row in reader:
+            if not row:
+                continue
             try:
-                amount = Decimal(row['Amount'].replace(',', ''))
+                amount = _Dec(row[a].translate(_strip))
                 trans_type = 'credit' if amount > 0 else 'debit'
                 
-                transactions.append({
-                    'date': datetime.strptime(row['Date'], '%Y-%m-%d').date(),
-                    'description': f"{row['Transaction']} - {row['Name']}",
-                    'memo': row.get('Memo', ''),
+                yield {
+                    'date': _parse_date(row[d]),
+                    'description': f"{row[t]} - {row[n]}",
+                    'memo': row[m] if m is not None and m < len(row) else '',
                     'amount': amount,
                     'transaction_type': trans_type,
                     'balance': None
-                })
+                }
             except Exception as e:
-                print(f"Error parsing USB row: {e}")
+                _note_row_error(errors, reader.line_num, e)
                 continue
-        
-        return transactions
     
     @staticmethod
-    def parse_chase(content: str) -> List[Dict]:
+    def parse_chase(content: CSVSource, errors: Optional[List[str]] = None) -> List[Dict]:
         """Parse Chase CSV format"""
-        transactions = []
-        reader = csv.DictReader(io.StringIO(content))
+        if _use_frame(content):
+            try:
+                return CSVParser._parse_chase_frame(content, errors)
+            except ValueError:
+                pass  # ragged rows etc. - fall back to the row parser
+        return list(CSVParser._iter_chase(content, errors))
+    
+    @staticmethod
+    def _iter_chase(source: CSVSource, errors: Optional[List[str]] = None) -> Iterator[Dict]:
+        """Yield transactions from Chase CSV format"""
+        reader = csv.reader(_text_stream(source))
+        header = next(reader, None)
+        if not header:
+            return
+        idx = {h: i for i, h in enumerate(header)}
+        try:
+            d, desc, a, t = idx['Posting Date'], idx['Description'], idx['Amount'], idx['Type']
+        except KeyError:
+            return
+        b = idx.get('Balance')
+        
+        _Dec = Decimal
+        _parse_date = _parse_mdy
+        _strip = _STRIP_MONEY
         
         for row in reader:
+            if not row:
+                continue
             try:
-                amount = Decimal(row['Amount'].replace(',', ''))
-                balance = Decimal(row['Balance'].replace(',', '')) if row.get('Balance') else None
+                amount = _Dec(row[a].translate(_strip))
+                balance_str = row[b] if b is not None and b < len(row) else ''
+                balance = _Dec(balance_str.translate(_strip)) if balance_str else None
                 
                 # Parse date (MM/DD/YYYY format)
-                date_str = row['Posting Date']
-                trans_date = datetime.strptime(date_str, '%m/%d/%Y').date()
+                trans_date = _parse_date(row[d])
                 
-                transactions.append({
+                yield {
                     'date': trans_date,
-                    'description': row['Description'],
+                    'description': row[desc],
                     'amount': amount,
-                    'transaction_type': row['Type'].lower(),
+                    'transaction_type': row[t].lower(),
                     'balance': balance
-                })
+                }
             except Exception as e:
-                print(f"Error parsing Chase row: {e}")
+                _note_row_error(errors, reader.line_num, e)
                 continue
+    
+    @staticmethod
+    def _read_frame(content: str):
+        """Load a CSV export into an all-string DataFrame with the C engine"""
+        return _pandas().read_csv(
+            io.StringIO(content), dtype=str, keep_default_na=False,
+            index_col=False, skip_blank_lines=True, engine='c'
+        )
+    
+    @staticmethod
+    def _parse_usb_bank_frame(content: str, errors: Optional[List[str]] = None) -> List[Dict]:
+        """Vectorized parse_usb_bank for large files (same output)"""
+        pd = _pandas()
+        df = CSVParser._read_frame(content)
+        if not {'Date', 'Transaction', 'Name', 'Amount'}.issubset(df.columns):
+            return []
+        
+        dates = pd.to_datetime(df['Date'], format='%Y-%m-%d', errors='coerce')
+        amounts = df['Amount'].str.translate(_STRIP_MONEY)
+        valid = dates.notna() & pd.to_numeric(amounts, errors='coerce').notna()
         
+        descriptions = df['Transaction'] + ' - ' + df['Name']
+        memos = df['Memo'] if 'Memo' in df.columns else pd.Series('', index=df.index)
+        
+        _note_invalid_rows(errors, valid)
+        
+        _Dec = Decimal
+        transactions = []
+        _append = transactions.append
+        for ts, desc, memo, amount_str in zip(
+            dates[valid], descriptions[valid], memos[valid], amounts[valid]
+        ):
+            amount = _Dec(amount_str)
+            _append({
+                'date': ts.date(),
+                'description': desc,
+                'memo': memo,
+                'amount': amount,
+                'transaction_type': 'credit' if amount > 0 else 'debit',
+                'balance': None
+            })
         return transactions
     
     @staticmethod
-    def parse_fidelity_statement(content: str) -> Tuple[List[Dict], List[Dict]]:
+    def _parse_chase_frame(content: str, errors: Optional[List[str]] = None) -> List[Dict]:
+        """Vectorized parse_chase for large files (same output)"""
+        pd = _pandas()
+        df = CSVParser._read_frame(content)
+        if not {'Posting Date', 'Description', 'Amount', 'Type'}.issubset(df.columns):
+            return []
+        
+        dates = pd.to_datetime(df['Posting Date'], format='%m/%d/%Y', errors='coerce')
+        amounts = df['Amount'].str.translate(_STRIP_MONEY)
+        balances = (
+            df['Balance'].str.translate(_STRIP_MONEY)
+            if 'Balance' in df.columns else pd.Series('', index=df.index)
+        )
+        valid = (
+            dates.notna()
+            & pd.to_numeric(amounts, errors='coerce').notna()
+            & ((balances == '') | pd.to_numeric(balances, errors='coerce').notna())
+        )
+        types = df['Type'].str.lower()
+        
+        _note_invalid_rows(errors, valid)
+        
+        _Dec = Decimal
+        transactions = []
+        _append = transactions.append
+        for ts, desc, amount_str, type_, balance_str in zip(
+            dates[valid], df['Description'][valid], amounts[valid], types[valid], balances[valid]
+        ):
+            _append({
+                'date': ts.date(),
+                'description': desc,
+                'amount': _Dec(amount_str),
+                'transaction_type': type_,
+                'balance': _Dec(balance_str) if balance_str else None
+            })
+        return transactions
+    
+    @staticmethod
+    def parse_fidelity_statement(content: CSVSource) -> Tuple[List[Dict], List[Dict]]:
         """Parse Fidelity statement CSV - returns (account_balances, holdings)"""
-        lines = content.strip().split('\n')
-        reader = csv.reader(io.StringIO(content))
+        reader = csv.reader(_text_stream(content))
         
         account_balances = []
         holdings = []
@@ -114,6 +377,11 @@ class CSVParser:
         in_holdings_section = False
         current_account = None
         
+        _Dec = Decimal
+        _strip = _STRIP_MONEY
+        _append_balance = account_balances.append
+        _append_holding = holdings.append
+        
         for row in reader:
             if not row or all(not cell.strip() for cell in row):
                 continue
@@ -126,9 +394,9 @@ class CSVParser:
                 try:
                     account_type = row[0]
                     account_num = row[1]
-                    ending_value = Decimal(row[4].replace(',', '').replace('$', '')) if row[4] else Decimal('0')
+                    ending_value = _Dec(row[4].translate(_strip)) if row[4] else ZERO
                     
-                    account_balances.append({
+                    _append_balance({
                         'account_type': account_type,
                         'account_number': account_num,
                         'balance': ending_value
@@ -146,13 +414,13 @@ class CSVParser:
             if in_holdings_section and len(row) >= 3 and row[0] and row[0] not in ['', ' ']:
                 try:
                     if row[0].strip() and not row[0].startswith('X') and len(row[0]) <= 10:
-                        holdings.append({
+                        _append_holding({
                             'account_number': current_account,
                             'symbol': row[0],
                             'description': row[1] if len(row) > 1 else '',
-                            'quantity': Decimal(row[2].replace(',', '')) if len(row) > 2 and row[2] else Decimal('0'),
-                            'price': Decimal(row[3].replace(',', '').replace('$', '')) if len(row) > 3 and row[3] else None,
-                            'value': Decimal(row[5].replace(',', '').replace('$', '')) if len(row) > 5 and row[5] else None,
+                            'quantity': _Dec(row[2].translate(_strip)) if len(row) > 2 and row[2] else ZERO,
+                            'price': _Dec(row[3].translate(_strip)) if len(row) > 3 and row[3] else None,
+                            'value': _Dec(row[5].translate(_strip)) if len(row) > 5 and row[5] else None,
                         })
                 except:
                     pass
@@ -160,97 +428,127 @@ class CSVParser:
         return account_balances, holdings
     
     @staticmethod
-    def parse_fidelity_transactions(content: str) -> List[Dict]:
+    def parse_fidelity_transactions(content: CSVSource, errors: Optional[List[str]] = None) -> List[Dict]:
         """Parse Fidelity transaction history CSV"""
-        transactions = []
-        lines = content.strip().split('\n')
+        return list(CSVParser._iter_fidelity_transactions(content, errors))
+    
+    @staticmethod
+    def _iter_fidelity_transactions(source: CSVSource, errors: Optional[List[str]] = None) -> Iterator[Dict]:
+        """Yield transactions from Fidelity transaction history CSV"""
+        reader = csv.reader(_text_stream(source))
+        header = next(reader, None)
+        if not header:
+            return
+        idx = {h: i for i, h in enumerate(header)}
+        d = idx.get('Run Date')
+        act = idx.get('Action')
+        sym = idx.get('Symbol')
+        desc = idx.get('Security Description')
+        qty = idx.get('Quantity')
+        amt = idx.get('Amount')
         
-        # Skip header
-        reader = csv.DictReader(io.StringIO(content))
+        _Dec = Decimal
+        _parse_date = _parse_mdy
+        _strip = _STRIP_MONEY
         
         for row in reader:
+            if not row:
+                continue
+            n = len(row)
             try:
                 # Parse date
-                date_str = row.get('Run Date', '')
+                date_str = row[d] if d is not None and d < n else ''
                 if date_str:
-                    trans_date = datetime.strptime(date_str, '%m/%d/%Y').date()
+                    trans_date = _parse_date(date_str)
                 else:
                     continue
                 
-                action = row.get('Action', '')
-                symbol = row.get('Symbol', '')
-                description = row.get('Security Description', '')
-                quantity = row.get('Quantity', '0')
-                amount = row.get('Amount', '0').replace('$', '').replace(',', '')
+                action = row[act] if act is not None and act < n else ''
+                symbol = row[sym] if sym is not None and sym < n else ''
+                description = row[desc] if desc is not None and desc < n else ''
+                quantity = row[qty] if qty is not None and qty < n else '0'
+                amount = (row[amt] if amt is not None and amt < n else '0').translate(_strip)
                 
-                transactions.append({
+                yield {
                     'date': trans_date,
                     'description': f"{action} {symbol} - {description}".strip(),
-                    'amount': Decimal(amount) if amount else Decimal('0'),
-                    'quantity': Decimal(quantity) if quantity else None,
+                    'amount': _Dec(amount) if amount else ZERO,
+                    'quantity': _Dec(quantity) if quantity else None,
                     'symbol': symbol,
                     'transaction_type': action.lower()
-                })
+                }
             except Exception as e:
-                print(f"Error parsing Fidelity transaction: {e}")
+                _note_row_error(errors, reader.line_num, e)
                 continue
-        
-        return transactions
     
     @staticmethod
-    def parse_401k(content: str) -> List[Dict]:
+    def parse_401k(content: CSVSource, errors: Optional[List[str]] = None) -> List[Dict]:
         """Parse 401k CSV format (with header rows)"""
-        lines = content.strip().split('\n')
+        return list(CSVParser._iter_401k(content, errors))
+    
+    @staticmethod
+    def _iter_401k(source: CSVSource, errors: Optional[List[str]] = None) -> Iterator[Dict]:
+        """Yield transactions from 401k CSV format (with header rows)"""
+        stream = _text_stream(source)
         
-        # Skip the first 2-3 header lines
-        data_start = 0
-        for i, line in enumerate(lines):
+        # Skip the first 2-3 header lines in a single pass over the stream,
+        # ignoring leading blank lines as the old strip().split() did
+        data_start = -1
+        header_line = None
+        for line in stream:
+            if data_start == -1 and not line.strip():
+                continue
+            data_start += 1
             if 'Date' in line and 'Transaction' in line:
-                data_start = i
+                header_line = line
                 break
         
-        if data_start == 0:
-            return []
+        if not header_line or data_start == 0:
+            return
         
-        # Parse from data start
-        csv_content = '\n'.join(lines[data_start:])
-        reader = csv.DictReader(io.StringIO(csv_content))
+        # The reader picks up from the stream's current position
+        reader = csv.DictReader(chain((header_line,), stream))
+        
+        _Dec = Decimal
+        _parse_date = _parse_mdy
+        _strip = _STRIP_MONEY
         
-        transactions = []
         for row in reader:
             try:
                 date_str = row.get('Date', '').strip()
                 if not date_str:
                     continue
                 
-                trans_date = datetime.strptime(date_str, '%m/%d/%Y').date()
+                trans_date = _parse_date(date_str)
                 
                 # Sum all amount columns
-                amount = Decimal('0')
+                amount = ZERO
                 for key, value in row.items():
                     if 'amount' in key.lower() and value:
                         try:
-                            amount += Decimal(value.replace('$', '').replace(',', ''))
+                            amount += _Dec(value.translate(_strip))
                         except:
                             pass
                 
-                transactions.append({
+                yield {
                     'date': trans_date,
                     'description': row.get('Transaction Type', 'Transaction'),
                     'amount': amount,
                     'transaction_type': 'contribution'
-                })
+                }
             except Exception as e:
-                print(f"Error parsing 401k row: {e}")
+                _note_row_error(errors, data_start + reader.line_num, e)
                 continue
-        
-        return transactions
     
     @staticmethod
-    def parse_generic(content: str) -> List[Dict]:
+    def parse_generic(content: CSVSource, errors: Optional[List[str]] = None) -> List[Dict]:
         """Parse generic CSV with date, amount, description"""
-        transactions = []
-        reader = csv.DictReader(io.StringIO(content))
+        return list(CSVParser._iter_generic(content, errors))
+    
+    @staticmethod
+    def _iter_generic(source: CSVSource, errors: Optional[List[str]] = None) -> Iterator[Dict]:
+        """Yield transactions from generic CSV with date, amount, description"""
+        reader = csv.DictReader(_text_stream(source))
         headers = reader.fieldnames
         
         # Find column mappings
@@ -259,42 +557,82 @@ class CSVParser:
         desc_col = next((h for h in headers if any(x in h.lower() for x in ['description', 'memo', 'name'])), None)
         
         if not all([date_col, amount_col, desc_col]):
-            return []
+            return
+        
+        _Dec = Decimal
+        _date_parsers = GENERIC_DATE_PARSERS
+        _strip = _STRIP_MONEY
         
         for row in reader:
             try:
                 # Try common date formats
                 date_str = row[date_col]
                 trans_date = None
-                for fmt in ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d']:
+                for parse_date in _date_parsers:
                     try:
-                        trans_date = datetime.strptime(date_str, fmt).date()
+                        trans_date = parse_date(date_str)
                         break
-                    except:
+                    except Exception:
                         continue
                 
                 if not trans_date:
                     continue
                 
-                amount = Decimal(row[amount_col].replace('$', '').replace(',', ''))
+                amount = _Dec(row[amount_col].translate(_strip))
                 
-                transactions.append({
+                yield {
                     'date': trans_date,
                     'description': row[desc_col],
                     'amount': amount,
                     'transaction_type': 'credit' if amount > 0 else 'debit',
                     'balance': None
-                })
+                }
             except Exception as e:
-                print(f"Error parsing generic row: {e}")
+                _note_row_error(errors, reader.line_num, e)
                 continue
+    
+    @classmethod
+    def iter_transaction_batches(
+        cls, source: CSVSource, format_type: Optional[str] = None,
+        batch_size: int = TRANSACTION_BATCH_SIZE, errors: Optional[List[str]] = None
+    ) -> Iterator[List[Dict]]:
+        """
+        Yield transactions in batches of at most batch_size rows so callers can
+        insert while parsing. Streams are read row by row, never buffered whole.
+        """
+        if format_type is None:
+            format_type = cls._detect_source_format(source)
         
-        return transactions
+        iter_rows = cls._ROW_ITERATORS.get(format_type)
+        if iter_rows is None:
+            return
+        rows = iter_rows(source, errors)
+        
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return
+            yield batch
+    
+    @classmethod
+    def _detect_source_format(cls, source: CSVSource) -> str:
+        """detect_format for text or a seekable stream (rewound afterwards)"""
+        if isinstance(source, str):
+            return cls.detect_format(source)
+        head = source.read(4096)
+        source.seek(0)
+        return cls.detect_format(head)
     
     @classmethod
-    def parse_csv(cls, content: str, filename: str = "") -> Dict:
-        """Main entry point - detect format and parse"""
-        format_type = cls.detect_format(content)
+    def parse_csv(cls, content: CSVSource, filename: str = "", columnar: bool = False) -> Dict:
+        """
+        Main entry point - detect format and parse.
+        
+        With columnar=True, 'transactions' is a dict of column lists
+        ({'date': [...], 'amount': [...], ...}) built straight from the row
+        parsers, so no per-row dict outlives its row.
+        """
+        format_type = cls._detect_source_format(content)
         
         result = {
             'format': format_type,
@@ -302,27 +640,44 @@ class CSVParser:
             'transactions': [],
             'account_balances': [],
             'holdings': [],
-            'errors': []
+            'errors': [],
+            # Rows skipped as unparseable; unlike 'errors' these do not fail the file
+            'row_errors': []
         }
+        row_errors = result['row_errors']
         
         try:
-            if format_type == "usb_bank":
-                result['transactions'] = cls.parse_usb_bank(content)
-            elif format_type == "chase":
-                result['transactions'] = cls.parse_chase(content)
-            elif format_type == "fidelity_statement":
-                balances, holdings = cls.parse_fidelity_statement(content)
+            iter_rows = cls._ROW_ITERATORS.get(format_type) if columnar else None
+            if iter_rows is not None:
+                result['transactions'] = _to_columns(iter_rows(content, row_errors))
+            elif format_type in cls._TRANSACTION_PARSERS:
+                result['transactions'] = cls._TRANSACTION_PARSERS[format_type](content, row_errors)
+            elif format_type in cls._STATEMENT_PARSERS:
+                balances, holdings = cls._STATEMENT_PARSERS[format_type](content)
                 result['account_balances'] = balances
                 result['holdings'] = holdings
-            elif format_type == "fidelity_transactions":
-                result['transactions'] = cls.parse_fidelity_transactions(content)
-            elif format_type == "401k":
-                result['transactions'] = cls.parse_401k(content)
-            elif format_type == "generic":
-                result['transactions'] = cls.parse_generic(content)
             else:
                 result['errors'].append(f"Unknown CSV format: {filename}")
         except Exception as e:
             result['errors'].append(f"Error parsing {filename}: {str(e)}")
         
         return result
+    
+    # Format dispatch tables (plain functions, so they are built after the parsers)
+    _TRANSACTION_PARSERS = {
+        "usb_bank": parse_usb_bank.__func__,
+        "chase": parse_chase.__func__,
+        "fidelity_transactions": parse_fidelity_transactions.__func__,
+        "401k": parse_401k.__func__,
+        "generic": parse_generic.__func__,
+    }
+    _STATEMENT_PARSERS = {
+        "fidelity_statement": parse_fidelity_statement.__func__,
+    }
+    _ROW_ITERATORS = {
+        "usb_bank": _iter_usb_bank.__func__,
+        "chase": _iter_chase.__func__,
+        "fidelity_transactions": _iter_fidelity_transactions.__func__,
+        "401k": _iter_401k.__func__,
+        "generic": _iter_generic.__func__,
+    }
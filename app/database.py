@@ -4,11 +4,28 @@ from sqlalchemy.orm import sessionmaker, declarative_base
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./finlan.db")
 
+# Rows per multi-row INSERT when bulk-inserting imports
+INSERT_PAGE_SIZE = int(os.getenv("DB_INSERT_PAGE_SIZE", "1000"))
+
+# Compiled SQL kept per engine; above the 500 default so the app's distinct
+# statements (per-route queries, bulk INSERT pages) are never evicted
+QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))
+
+engine_options = {}
+if DATABASE_URL.startswith(("postgresql://", "postgresql+psycopg2://")):
+    # Batch executemany UPDATE/DELETE too, not only INSERT
+    engine_options["executemany_mode"] = "values_plus_batch"
+
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
+    insertmanyvalues_page_size=INSERT_PAGE_SIZE,
+    query_cache_size=QUERY_CACHE_SIZE,
+    **engine_options,
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay readable after commit without a re-SELECT per instance;
+# call db.refresh() where a view needs values changed by another session
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 Base = declarative_base()
 
 
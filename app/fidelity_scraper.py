@@ -1,9 +1,9 @@
 """
 Fidelity web scraper for automated account sync
 """
-import time
+import re
 import logging
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 from datetime import date, datetime
 from typing import Dict, List, Optional
 from selenium import webdriver
@@ -15,129 +15,278 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
 
+# Playwright drives Chrome over a single CDP websocket instead of going through
+# chromedriver's HTTP API; used by AsyncFidelityScraper when installed
+try:
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+    _USE_PLAYWRIGHT = True
+except ImportError:
+    _USE_PLAYWRIGHT = False
+
+from . import scrape_cache
+from .browser_pool import BrowserPool
+from .scraper_types import AccountDTO, HoldingDTO
+
 logger = logging.getLogger(__name__)
 
+# How long to wait for a user to complete MFA before giving up
+MFA_TIMEOUT_SECONDS = 300
+
+# Requests the scraper never reads; blocked via CDP before any page loads
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.webp', '*.ico',
+    '*.woff', '*.woff2', '*.ttf',
+    '*.css',
+    '*.mp4', '*.webm',
+    '*analytics*', '*doubleclick*', '*/ads/*',
+]
+
+# Everything except digits, the decimal point and a minus sign ("$", ",", spaces)
+_NUM_RE = re.compile(r'[^\d.\-]')
+# Fast path for the usual "$1,234.56" cell: delete the formatting in C via translate
+_STRIP_MONEY = str.maketrans('', '', '$, \t\n')
+_ZERO = Decimal('0')
+
+
+def _to_decimal(s: Optional[str], default: Optional[Decimal] = _ZERO) -> Optional[Decimal]:
+    """Parse '$1,234.56'-style text, returning default for blank or unparseable cells"""
+    if not s:
+        return default
+    try:
+        value = Decimal(s.translate(_STRIP_MONEY))
+        if value.is_finite():
+            return value
+    except InvalidOperation:
+        pass
+    # Anything else ("1.5%", "n/a", "--") goes through the regex strip
+    cleaned = _NUM_RE.sub('', s)
+    if not cleaned:
+        return default
+    try:
+        return Decimal(cleaned)
+    except InvalidOperation:
+        return default
+
+
+# Read every position row in a single WebDriver round-trip. Rows with fewer
+# than 5 cells are skipped; a missing required field comes back as null.
+_POSITIONS_JS = """
+const text = (row, sel) => {
+    const el = row.querySelector(sel);
+    return el ? el.innerText : null;
+};
+return Array.from(document.querySelectorAll("tr[data-row-type='position']"))
+    .filter(row => row.querySelectorAll('td').length >= 5)
+    .map(row => ({
+        symbol: text(row, ".symbol, [data-testid='symbol']"),
+        name: text(row, ".description, [data-testid='description']"),
+        quantity: text(row, ".quantity, [data-testid='quantity']"),
+        price: text(row, ".last-price, [data-testid='last-price']"),
+        value: text(row, ".current-value, [data-testid='current-value']"),
+        cost: text(row, ".cost-basis, [data-testid='cost-basis']"),
+    }));
+"""
+
+_INNER_TEXT_JS = "return arguments[0].map(el => el.innerText);"
+
+LOGIN_URL = "https://digital.fidelity.com/prgw/digital/login/full-page"
+POSITIONS_URL = "https://digital.fidelity.com/ftgw/digital/portfolio/positions"
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'
+
+
+def _parse_accounts(option_texts: List[Optional[str]]) -> List[AccountDTO]:
+    """Turn account selector option texts into AccountDTOs"""
+    accounts = []
+    for account_text in option_texts:
+        try:
+            account_text = (account_text or '').strip()
+            if not account_text:
+                continue
+            
+            # Parse account info (format varies)
+            # Example: "INDIVIDUAL - TOD | ...1234 | $50,000.00"
+            parts = [p.strip() for p in account_text.split('|')]
+            
+            if len(parts) >= 3:
+                account_type = parts[0]
+                account_number = parts[1].replace('...', '')
+                balance = _to_decimal(parts[2])
+                
+                accounts.append(AccountDTO(
+                    institution='Fidelity',
+                    account_type=account_type,
+                    account_number_last4=account_number[-4:] if len(account_number) >= 4 else account_number,
+                    balance=balance,
+                    raw_type=account_type,
+                ))
+                
+        except Exception as e:
+            logger.error(f"Error parsing account option: {e}")
+            continue
+    return accounts
+
+
+def _parse_holdings(rows: List[Dict]) -> List[HoldingDTO]:
+    """Turn the raw cell texts returned by _POSITIONS_JS into HoldingDTOs"""
+    holdings = []
+    today = date.today()
+    for row in rows:
+        try:
+            required = (row['symbol'], row['name'], row['quantity'], row['price'], row['value'])
+            if any(v is None for v in required):
+                raise ValueError(f"missing field in position row {row['symbol']!r}")
+            
+            holdings.append(HoldingDTO(
+                symbol=row['symbol'].strip(),
+                name=row['name'].strip(),
+                quantity=_to_decimal(row['quantity']),
+                current_price=_to_decimal(row['price'], None),
+                current_value=_to_decimal(row['value'], None),
+                cost_basis=_to_decimal(row['cost'], None),
+                asset_type='stock',
+                snapshot_date=today,
+            ))
+            
+        except Exception as e:
+            logger.error(f"Error parsing holding row: {e}")
+            continue
+    return holdings
+
+
+def create_driver(headless: bool = True):
+    """Start a Chrome webdriver configured for scraping"""
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument('--headless=new')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--disable-software-rasterizer')
+    chrome_options.add_argument('--disable-dev-tools')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument('--no-first-run')
+    chrome_options.add_argument('--no-default-browser-check')
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    chrome_options.add_argument('--disable-features=Translate,BackForwardCache,MediaRouter')
+    chrome_options.add_argument('--js-flags=--max-old-space-size=512')
+    chrome_options.add_argument('--renderer-process-limit=2')
+    chrome_options.add_argument(
+        f'--user-agent={USER_AGENT}'
+    )
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    
+    # Use Google Chrome
+    chrome_options.binary_location = '/usr/bin/google-chrome-stable'
+    
+    # Let Selenium 4 handle driver management automatically
+    driver = webdriver.Chrome(options=chrome_options)
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    return driver
+
+
+# Login page conditions. Each resolves to whichever locator matches first, and
+# they live at module level because selenium conditions are plain functions
+# (a class attribute would be bound as a method).
+_USER_LOC = EC.any_of(
+    EC.presence_of_element_located((By.ID, "userId-input")),
+    EC.presence_of_element_located((By.NAME, "username")),
+    EC.presence_of_element_located((By.CSS_SELECTOR, "input[autocomplete='username']")),
+    EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='text'][name*='user'], input[type='text'][id*='user']")),
+)
+_PASSWORD_LOC = EC.any_of(
+    EC.presence_of_element_located((By.ID, "password")),
+    EC.presence_of_element_located((By.NAME, "password")),
+    EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='password']")),
+)
+_LOGIN_BUTTON_LOC = EC.any_of(
+    EC.presence_of_element_located((By.ID, "fs-login-button")),
+    EC.presence_of_element_located((By.CSS_SELECTOR, "button[type='submit']")),
+    EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='submit']")),
+)
+_DASHBOARD_LOC = EC.presence_of_element_located((By.CLASS_NAME, "acct-selector"))
+# After submitting: either the dashboard or an MFA challenge
+_POST_LOGIN_LOC = EC.any_of(
+    _DASHBOARD_LOC,
+    EC.url_contains("mfa"),
+    EC.url_contains("authenticate"),
+)
+
 
 class FidelityScraper:
     """Scrape account and holdings data from Fidelity"""
     
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, pool: Optional[BrowserPool] = None):
         self.headless = headless
+        self.pool = pool
         self.driver = None
+        # Login name scoping the scrape cache; set by login()
+        self.username: Optional[str] = None
         
     def _init_driver(self):
-        """Initialize Chrome webdriver"""
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument('--headless=new')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--disable-software-rasterizer')
-        chrome_options.add_argument('--disable-dev-tools')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--no-first-run')
-        chrome_options.add_argument('--no-default-browser-check')
-        chrome_options.add_argument('--disable-extensions')
-        chrome_options.add_argument(
-            '--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'
-        )
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        # Use Google Chrome
-        chrome_options.binary_location = '/usr/bin/google-chrome-stable'
-        
-        # Let Selenium 4 handle driver management automatically
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        """Initialize Chrome webdriver, borrowing a warm one from the pool if set"""
+        if self.pool is not None:
+            self.driver = self.pool.acquire()
+        else:
+            self.driver = create_driver(self.headless)
 
-    def _find_first(self, wait: WebDriverWait, locators: List[tuple]):
-        """Try multiple locators and return the first element found."""
-        last_error = None
-        for locator in locators:
-            try:
-                return wait.until(EC.presence_of_element_located(locator))
-            except Exception as e:
-                last_error = e
-        raise last_error
-        
     def login(self, username: str, password: str) -> bool:
         """
         Login to Fidelity
         Returns True if successful, False otherwise
         """
+        self.username = username
         try:
             if not self.driver:
                 self._init_driver()
             
             logger.info("Navigating to Fidelity login page")
-            self.driver.get("https://digital.fidelity.com/prgw/digital/login/full-page")
+            self.driver.get(LOGIN_URL)
             
             # Wait for username field
             wait = WebDriverWait(self.driver, 30)
-            username_field = self._find_first(
-                wait,
-                [
-                    (By.ID, "userId-input"),
-                    (By.NAME, "username"),
-                    (By.CSS_SELECTOR, "input[autocomplete='username']"),
-                    (By.CSS_SELECTOR, "input[type='text'][name*='user'], input[type='text'][id*='user']"),
-                ],
-            )
+            username_field = wait.until(_USER_LOC)
             
-            # Enter credentials
+            # Enter credentials (send_keys blocks until the keys are delivered)
             username_field.send_keys(username)
-            time.sleep(1)
-            
-            password_field = self._find_first(
-                wait,
-                [
-                    (By.ID, "password"),
-                    (By.NAME, "password"),
-                    (By.CSS_SELECTOR, "input[type='password']"),
-                ],
-            )
+            
+            password_field = wait.until(_PASSWORD_LOC)
             password_field.send_keys(password)
-            time.sleep(1)
             
             # Click login button
-            login_button = self._find_first(
-                wait,
-                [
-                    (By.ID, "fs-login-button"),
-                    (By.CSS_SELECTOR, "button[type='submit']"),
-                    (By.CSS_SELECTOR, "input[type='submit']"),
-                ],
-            )
+            login_button = wait.until(_LOGIN_BUTTON_LOC)
             self.driver.execute_script("arguments[0].click();", login_button)
             
             # Wait for either dashboard or MFA prompt
-            time.sleep(5)
+            try:
+                wait.until(_POST_LOGIN_LOC)
+            except TimeoutException:
+                logger.error("Login failed - unknown state")
+                return False
             
             # Check if we're at the dashboard (successful login)
-            try:
-                wait.until(EC.presence_of_element_located((By.CLASS_NAME, "acct-selector")))
+            current_url = self.driver.current_url.lower()
+            if 'mfa' not in current_url and 'authenticate' not in current_url:
                 logger.info("Login successful")
                 return True
+            
+            logger.warning("MFA required - manual intervention needed")
+            # Give user time to complete MFA; resolves as soon as the dashboard loads
+            try:
+                WebDriverWait(self.driver, MFA_TIMEOUT_SECONDS).until(_DASHBOARD_LOC)
+                logger.info("Login successful after MFA")
+                return True
             except TimeoutException:
-                # Check for MFA requirement
-                current_url = self.driver.current_url
-                if 'mfa' in current_url.lower() or 'authenticate' in current_url.lower():
-                    logger.warning("MFA required - manual intervention needed")
-                    # Give user time to complete MFA
-                    time.sleep(60)
-                    try:
-                        wait.until(EC.presence_of_element_located((By.CLASS_NAME, "acct-selector")))
-                        logger.info("Login successful after MFA")
-                        return True
-                    except TimeoutException:
-                        logger.error("MFA timeout or failed")
-                        return False
-                else:
-                    logger.error("Login failed - unknown state")
-                    return False
+                logger.error("MFA timeout or failed")
+                return False
                     
         except Exception as e:
             logger.error(f"Login error: {repr(e)}")
@@ -149,20 +298,28 @@ class FidelityScraper:
                 pass
             return False
     
-    def get_accounts(self) -> List[Dict]:
+    def _cache_key(self, account_id: Optional[str], kind: str) -> Optional[str]:
+        if not self.username:
+            return None
+        return scrape_cache.cache_key('Fidelity', self.username, account_id, kind)
+    
+    def get_accounts(self, force_refresh: bool = False) -> List[AccountDTO]:
         """
         Scrape account balances from Fidelity dashboard
-        Returns list of account dictionaries
+        Returns list of AccountDTOs
+        Results are cached for the day; pass force_refresh=True to re-scrape.
         """
-        accounts = []
-        
+        key = self._cache_key(None, 'accounts')
+        if key and not force_refresh:
+            cached = scrape_cache.get(key)
+            if cached is not None:
+                return cached
         try:
             if not self.driver:
                 raise Exception("Driver not initialized - call login() first")
             
             # Navigate to positions page
-            self.driver.get("https://digital.fidelity.com/ftgw/digital/portfolio/positions")
-            time.sleep(3)
+            self.driver.get(POSITIONS_URL)
             
             wait = WebDriverWait(self.driver, 20)
             
@@ -173,64 +330,42 @@ class FidelityScraper:
             
             # Click to expand accounts
             account_dropdown.click()
-            time.sleep(2)
             
-            # Get all account options
-            account_options = self.driver.find_elements(By.CSS_SELECTOR, ".acct-selector-option")
+            # Get all account options once the dropdown has rendered them
+            account_options = wait.until(
+                EC.visibility_of_all_elements_located((By.CSS_SELECTOR, ".acct-selector-option"))
+            )
             
-            for option in account_options:
-                try:
-                    account_text = option.text.strip()
-                    if not account_text:
-                        continue
-                    
-                    # Parse account info (format varies)
-                    # Example: "INDIVIDUAL - TOD | ...1234 | $50,000.00"
-                    parts = [p.strip() for p in account_text.split('|')]
-                    
-                    if len(parts) >= 3:
-                        account_type = parts[0]
-                        account_number = parts[1].replace('...', '')
-                        balance_str = parts[2].replace('$', '').replace(',', '').strip()
-                        
-                        try:
-                            balance = Decimal(balance_str)
-                        except:
-                            balance = Decimal('0')
-                        
-                        accounts.append({
-                            'institution': 'Fidelity',
-                            'account_type': account_type,
-                            'account_number_last4': account_number[-4:] if len(account_number) >= 4 else account_number,
-                            'balance': balance,
-                            'raw_type': account_type
-                        })
-                        
-                except Exception as e:
-                    logger.error(f"Error parsing account option: {e}")
-                    continue
+            option_texts = self.driver.execute_script(_INNER_TEXT_JS, account_options)
+            
+            accounts = _parse_accounts(option_texts)
             
             logger.info(f"Found {len(accounts)} accounts")
+            if key and accounts:
+                scrape_cache.put(key, accounts, tag='fidelity')
             return accounts
             
         except Exception as e:
             logger.error(f"Error getting accounts: {e}")
             return []
     
-    def get_holdings(self, account_id: Optional[str] = None) -> List[Dict]:
+    def get_holdings(self, account_id: Optional[str] = None, force_refresh: bool = False) -> List[HoldingDTO]:
         """
         Scrape holdings for a specific account or all accounts
-        Returns list of holding dictionaries
+        Returns list of HoldingDTOs
+        Results are cached for the day; pass force_refresh=True to re-scrape.
         """
-        holdings = []
-        
+        key = self._cache_key(account_id, 'holdings')
+        if key and not force_refresh:
+            cached = scrape_cache.get(key)
+            if cached is not None:
+                return cached
         try:
             if not self.driver:
                 raise Exception("Driver not initialized - call login() first")
             
             # Navigate to positions page
-            self.driver.get("https://digital.fidelity.com/ftgw/digital/portfolio/positions")
-            time.sleep(3)
+            self.driver.get(POSITIONS_URL)
             
             wait = WebDriverWait(self.driver, 20)
             
@@ -239,56 +374,13 @@ class FidelityScraper:
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".positions-table, [data-testid='positions-table']"))
             )
             
-            # Get all position rows
-            rows = self.driver.find_elements(By.CSS_SELECTOR, "tr[data-row-type='position']")
-            
-            for row in rows:
-                try:
-                    # Extract data from cells
-                    cells = row.find_elements(By.TAG_NAME, "td")
-                    
-                    if len(cells) < 5:
-                        continue
-                    
-                    symbol_elem = row.find_element(By.CSS_SELECTOR, ".symbol, [data-testid='symbol']")
-                    symbol = symbol_elem.text.strip()
-                    
-                    name_elem = row.find_element(By.CSS_SELECTOR, ".description, [data-testid='description']")
-                    name = name_elem.text.strip()
-                    
-                    quantity_elem = row.find_element(By.CSS_SELECTOR, ".quantity, [data-testid='quantity']")
-                    quantity_str = quantity_elem.text.replace(',', '').strip()
-                    
-                    price_elem = row.find_element(By.CSS_SELECTOR, ".last-price, [data-testid='last-price']")
-                    price_str = price_elem.text.replace('$', '').replace(',', '').strip()
-                    
-                    value_elem = row.find_element(By.CSS_SELECTOR, ".current-value, [data-testid='current-value']")
-                    value_str = value_elem.text.replace('$', '').replace(',', '').strip()
-                    
-                    # Try to get cost basis
-                    try:
-                        cost_elem = row.find_element(By.CSS_SELECTOR, ".cost-basis, [data-testid='cost-basis']")
-                        cost_str = cost_elem.text.replace('$', '').replace(',', '').strip()
-                        cost_basis = Decimal(cost_str) if cost_str else None
-                    except:
-                        cost_basis = None
-                    
-                    holdings.append({
-                        'symbol': symbol,
-                        'name': name,
-                        'quantity': Decimal(quantity_str) if quantity_str else Decimal('0'),
-                        'current_price': Decimal(price_str) if price_str else None,
-                        'current_value': Decimal(value_str) if value_str else None,
-                        'cost_basis': cost_basis,
-                        'asset_type': 'stock',
-                        'snapshot_date': date.today()
-                    })
-                    
-                except Exception as e:
-                    logger.error(f"Error parsing holding row: {e}")
-                    continue
+            # Get all position rows in one call
+            rows = self.driver.execute_script(_POSITIONS_JS)
+            holdings = _parse_holdings(rows)
             
             logger.info(f"Found {len(holdings)} holdings")
+            if key and holdings:
+                scrape_cache.put(key, holdings, tag='fidelity')
             return holdings
             
         except Exception as e:
@@ -296,9 +388,12 @@ class FidelityScraper:
             return []
     
     def close(self):
-        """Close the browser"""
+        """Close the browser, or hand it back to the pool"""
         if self.driver:
-            self.driver.quit()
+            if self.pool is not None:
+                self.pool.release(self.driver)
+            else:
+                self.driver.quit()
             self.driver = None
     
     def __enter__(self):
@@ -306,3 +401,183 @@ class FidelityScraper:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
+
+
+# CSS equivalents of the Selenium login conditions, for Playwright locators
+_PW_USER_SELECTOR = "#userId-input, input[name='username'], input[autocomplete='username'], input[type='text'][name*='user'], input[type='text'][id*='user']"
+_PW_PASSWORD_SELECTOR = "#password, input[name='password'], input[type='password']"
+_PW_LOGIN_BUTTON_SELECTOR = "#fs-login-button, button[type='submit'], input[type='submit']"
+_PW_POST_LOGIN_JS = "() => document.querySelector('.acct-selector') || /mfa|authenticate/i.test(location.href)"
+_PW_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'font', 'stylesheet', 'media'})
+_PW_BLOCKED_URL_RE = re.compile(r'analytics|doubleclick|/ads/')
+
+
+class AsyncFidelityScraper:
+    """
+    FidelityScraper on Playwright: one persistent CDP connection to Chrome
+    instead of a chromedriver HTTP round-trip per command.
+    Same results as FidelityScraper; every method is a coroutine.
+    """
+    
+    def __init__(self, headless: bool = True, storage_state: Optional[str] = None):
+        if not _USE_PLAYWRIGHT:
+            raise RuntimeError("playwright is not installed")
+        self.headless = headless
+        # Path to a saved session (cookies/localStorage) to resume, see save_session()
+        self.storage_state = storage_state
+        self.username: Optional[str] = None
+        self._playwright = None
+        self.browser = None
+        self.context = None
+        self.page = None
+    
+    async def _init_browser(self):
+        self._playwright = await async_playwright().start()
+        self.browser = await self._playwright.chromium.launch(
+            headless=self.headless,
+            args=[
+                '--no-sandbox',
+                '--disable-dev-shm-usage',
+                '--disable-gpu',
+                '--disable-extensions',
+                '--disable-blink-features=AutomationControlled',
+                '--disable-features=Translate,BackForwardCache,MediaRouter',
+                '--js-flags=--max-old-space-size=512',
+                '--renderer-process-limit=2',
+            ],
+        )
+        self.context = await self.browser.new_context(
+            user_agent=USER_AGENT,
+            viewport={'width': 1920, 'height': 1080},
+            storage_state=self.storage_state,
+        )
+        await self.context.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        await self.context.route('**/*', self._route)
+        self.page = await self.context.new_page()
+    
+    @staticmethod
+    async def _route(route):
+        request = route.request
+        if request.resource_type in _PW_BLOCKED_RESOURCE_TYPES or _PW_BLOCKED_URL_RE.search(request.url):
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def login(self, username: str, password: str) -> bool:
+        """
+        Login to Fidelity
+        Returns True if successful, False otherwise
+        """
+        self.username = username
+        try:
+            if not self.page:
+                await self._init_browser()
+            
+            logger.info("Navigating to Fidelity login page")
+            await self.page.goto(LOGIN_URL)
+            
+            await self.page.locator(_PW_USER_SELECTOR).first.fill(username, timeout=30000)
+            await self.page.locator(_PW_PASSWORD_SELECTOR).first.fill(password, timeout=30000)
+            await self.page.locator(_PW_LOGIN_BUTTON_SELECTOR).first.click(timeout=30000)
+            
+            # Wait for either dashboard or MFA prompt
+            try:
+                await self.page.wait_for_function(_PW_POST_LOGIN_JS, timeout=30000)
+            except PlaywrightTimeoutError:
+                logger.error("Login failed - unknown state")
+                return False
+            
+            current_url = self.page.url.lower()
+            if 'mfa' not in current_url and 'authenticate' not in current_url:
+                logger.info("Login successful")
+                return True
+            
+            logger.warning("MFA required - manual intervention needed")
+            try:
+                await self.page.wait_for_selector('.acct-selector', timeout=MFA_TIMEOUT_SECONDS * 1000)
+                logger.info("Login successful after MFA")
+                return True
+            except PlaywrightTimeoutError:
+                logger.error("MFA timeout or failed")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Login error: {repr(e)}")
+            return False
+    
+    def _cache_key(self, account_id: Optional[str], kind: str) -> Optional[str]:
+        if not self.username:
+            return None
+        return scrape_cache.cache_key('Fidelity', self.username, account_id, kind)
+    
+    async def get_accounts(self, force_refresh: bool = False) -> List[AccountDTO]:
+        """Scrape account balances; see FidelityScraper.get_accounts"""
+        key = self._cache_key(None, 'accounts')
+        if key and not force_refresh:
+            cached = scrape_cache.get(key)
+            if cached is not None:
+                return cached
+        try:
+            if not self.page:
+                raise Exception("Browser not initialized - call login() first")
+            
+            await self.page.goto(POSITIONS_URL)
+            await self.page.locator('.acct-selector').first.click(timeout=20000)
+            await self.page.wait_for_selector('.acct-selector-option', state='visible', timeout=20000)
+            option_texts = await self.page.locator('.acct-selector-option').all_inner_texts()
+            accounts = _parse_accounts(option_texts)
+            
+            logger.info(f"Found {len(accounts)} accounts")
+            if key and accounts:
+                scrape_cache.put(key, accounts, tag='fidelity')
+            return accounts
+        
+        except Exception as e:
+            logger.error(f"Error getting accounts: {e}")
+            return []
+    
+    async def get_holdings(self, account_id: Optional[str] = None, force_refresh: bool = False) -> List[HoldingDTO]:
+        """Scrape holdings; see FidelityScraper.get_holdings"""
+        key = self._cache_key(account_id, 'holdings')
+        if key and not force_refresh:
+            cached = scrape_cache.get(key)
+            if cached is not None:
+                return cached
+        try:
+            if not self.page:
+                raise Exception("Browser not initialized - call login() first")
+            
+            await self.page.goto(POSITIONS_URL)
+            await self.page.wait_for_selector(".positions-table, [data-testid='positions-table']", timeout=20000)
+            # _POSITIONS_JS is a function body for execute_script; wrap it for evaluate()
+            rows = await self.page.evaluate("() => {" + _POSITIONS_JS + "}")
+            holdings = _parse_holdings(rows)
+            
+            logger.info(f"Found {len(holdings)} holdings")
+            if key and holdings:
+                scrape_cache.put(key, holdings, tag='fidelity')
+            return holdings
+        
+        except Exception as e:
+            logger.error(f"Error getting holdings: {e}")
+            return []
+    
+    async def save_session(self, path: str):
+        """Persist cookies/localStorage so a later scraper can skip login (and MFA)"""
+        if self.context:
+            await self.context.storage_state(path=path)
+    
+    async def close(self):
+        """Close the browser"""
+        if self.browser:
+            await self.browser.close()
+            self.browser = self.context = self.page = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
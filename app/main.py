@@ -1,11 +1,14 @@
 import os
+from datetime import date
 from decimal import Decimal
 from typing import Optional
 
 from fastapi import FastAPI, Depends, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from fastapi.exceptions import HTTPException
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import func, case, extract
 from sqlalchemy.orm import Session
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
@@ -21,41 +24,77 @@ from .routers import portfolio as portfolio_router
 from .routers import mortgage as mortgage_router
 from .routers import tax as tax_router
 from .routers import business as business_router
-from .auth import get_current_user
-from .auth import verify_password
+from .auth import get_current_user_html, HTMLAuthRequired
+from .auth import verify_password, login_throttled, record_login_failure
+
+# orjson serializes JSON responses in native code; fall back to stdlib json
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse
+    _USE_ORJSON = True
+except ImportError:
+    _USE_ORJSON = False
 
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Personal Finance LAN App")
+# Feature flags are fixed for the life of the process; resolve them once
+GPT5_ENABLED = str(os.getenv("ENABLE_GPT5", "false")).lower() in ("1", "true", "yes")
+_GPT5_HEADER = "true" if GPT5_ENABLED else "false"
+
+app = FastAPI(
+    title="Personal Finance LAN App",
+    default_response_class=ORJSONResponse if _USE_ORJSON else JSONResponse,
+)
+
+RECEIPTS_PAGE_SIZE = 50
+RECEIPTS_MAX_PAGE_SIZE = 500
+
+# Redirect unauthenticated browser requests to login page. Page routes depend on
+# get_current_user_html, which raises HTMLAuthRequired; API requests (fetch/XHR)
+# expect JSON and get the plain HTTPException handler.
+@app.exception_handler(HTMLAuthRequired)
+async def html_auth_required_handler(request: Request, exc: HTMLAuthRequired):
+    return RedirectResponse(url=f"/login?next={request.url.path}", status_code=302)
+
 
-# Redirect unauthenticated browser requests to login page
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    if exc.status_code == 401:
-        # API requests (fetch/XHR) expect JSON — return 401 as-is
-        accept = request.headers.get("accept", "")
-        if "text/html" in accept:
-            return RedirectResponse(url=f"/login?next={request.url.path}", status_code=302)
-    from fastapi.responses import JSONResponse
     return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
 
-# Static files
-app.mount("/static", StaticFiles(directory=os.path.join(os.path.dirname(__file__), "static")), name="static")
+# Static files. In production nginx serves /static/ directly (deploy/nginx);
+# this mount is the fallback for running uvicorn on its own.
+app.mount(
+    "/static",
+    StaticFiles(directory=os.path.join(os.path.dirname(__file__), "static"), check_dir=False, follow_symlink=False),
+    name="static",
+)
 
 # Templates
 templates_dir = os.path.join(os.path.dirname(__file__), "templates")
 jinja_env = Environment(
     loader=FileSystemLoader(templates_dir),
     autoescape=select_autoescape(["html", "xml"]),
+    # Skip the per-render mtime check outside development
+    auto_reload=bool(os.getenv("DEV")),
+    cache_size=400,
 )
 
+# Page templates are compiled once at import rather than looked up per request
+_TPL_INDEX = jinja_env.get_template("index.html")
+_TPL_RECEIPTS = jinja_env.get_template("receipts.html")
+_TPL_ANALYTICS = jinja_env.get_template("analytics.html")
+_TPL_EQUITY_AWARDS = jinja_env.get_template("equity_awards.html")
+_TPL_PORTFOLIO = jinja_env.get_template("portfolio.html")
+_TPL_PORTFOLIO_UPLOAD = jinja_env.get_template("portfolio_upload.html")
+_TPL_PLAID_CONNECT = jinja_env.get_template("plaid_connect.html")
+_TPL_BROKER_CREDENTIALS = jinja_env.get_template("broker_credentials.html")
+_TPL_LOGIN = jinja_env.get_template("login.html")
+
 # Feature flag response header middleware
 @app.middleware("http")
 async def add_feature_headers(request, call_next):
-    import os
     response = await call_next(request)
-    gpt5_enabled = str(os.getenv("ENABLE_GPT5", "false")).lower() in ("1", "true", "yes")
-    response.headers["X-GPT5-Enabled"] = "true" if gpt5_enabled else "false"
+    response.headers["X-GPT5-Enabled"] = _GPT5_HEADER
     return response
 
 # Routers
@@ -70,19 +109,21 @@ app.include_router(mortgage_router.router)
 app.include_router(tax_router.router)
 app.include_router(business_router.router)
 
+# Routes that query the database are plain `def` (or hand blocking work to
+# run_in_threadpool) so the sync Session never blocks the event loop.
 @app.get("/", response_class=HTMLResponse)
-async def index(request: Request, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    income_total = Decimal("0")
-    expense_total = Decimal("0")
-    for t in db.query(Transaction).filter(Transaction.user_id == user.id).all():
-        if t.is_income:
-            income_total += Decimal(str(t.amount))
-        else:
-            expense_total += Decimal(str(t.amount))
+def index(request: Request, db: Session = Depends(get_db), user=Depends(get_current_user_html)):
+    # Anything not flagged as income (including NULL) counts as an expense
+    row = db.query(
+        func.coalesce(func.sum(case((Transaction.is_income == True, Transaction.amount), else_=0)), 0),
+        func.coalesce(func.sum(Transaction.amount), 0),
+    ).filter(Transaction.user_id == user.id).one()
+    # Numeric columns already come back as Decimal; no str() round-trip needed
+    income_total = Decimal(row[0])
+    expense_total = Decimal(row[1]) - income_total
     net = income_total - expense_total
 
-    template = jinja_env.get_template("index.html")
-    return template.render(
+    return _TPL_INDEX.render(
         request=request,
         username=user.username,
         income_total=str(income_total),
@@ -93,75 +134,96 @@ async def index(request: Request, db: Session = Depends(get_db), user=Depends(ge
 
 @app.get("/health")
 def health():
-    import os
-    gpt5_enabled = str(os.getenv("ENABLE_GPT5", "false")).lower() in ("1", "true", "yes")
-    return {"status": "ok", "gpt5_enabled": gpt5_enabled}
+    return {"status": "ok", "gpt5_enabled": GPT5_ENABLED}
 
 @app.get("/receipts", response_class=HTMLResponse)
-async def receipts_page(request: Request, db: Session = Depends(get_db), user=Depends(get_current_user)):
+def receipts_page(request: Request, db: Session = Depends(get_db), user=Depends(get_current_user_html)):
     from .models import Receipt
-    from sqlalchemy.orm import joinedload
+    from sqlalchemy.orm import selectinload
+    
+    # Keyset pagination: newest first, ?before=<id> continues from the last page.
+    # ?year= filters on the server so the filter and counts cover every page
+    try:
+        limit = min(max(int(request.query_params.get("limit", RECEIPTS_PAGE_SIZE)), 1), RECEIPTS_MAX_PAGE_SIZE)
+    except ValueError:
+        limit = RECEIPTS_PAGE_SIZE
+    before_id = request.query_params.get("before")
+    year = request.query_params.get("year", "")
+    year = int(year) if year.isdigit() and len(year) == 4 else None
     
-    rows = (
-        db.query(Receipt)
-        .options(joinedload(Receipt.files))
+    years = [
+        y for (y,) in db.query(extract("year", Receipt.service_date))
         .filter(Receipt.user_id == user.id)
-        .order_by(Receipt.uploaded_at.desc())
+        .distinct()
         .all()
-    )
+    ]
+    
+    base = db.query(Receipt).filter(Receipt.user_id == user.id)
+    if year is not None:
+        base = base.filter(Receipt.service_date >= date(year, 1, 1), Receipt.service_date < date(year + 1, 1, 1))
+    total = base.count()
+    
+    query = base.options(selectinload(Receipt.files))
+    if before_id and before_id.isdigit():
+        query = query.filter(Receipt.id < int(before_id))
+    # Fetch one extra row to know whether another page exists
+    rows = query.order_by(Receipt.id.desc()).limit(limit + 1).all()
+    next_cursor = rows[limit - 1].id if len(rows) > limit else None
+    rows = rows[:limit]
     
-    template = jinja_env.get_template("receipts.html")
-    return template.render(request=request, username=user.username, receipts=rows)
+    return _TPL_RECEIPTS.render(
+        request=request,
+        username=user.username,
+        receipts=rows,
+        next_cursor=next_cursor,
+        is_first_page=not (before_id and before_id.isdigit()),
+        page_limit=limit,
+        years=sorted((int(y) for y in years if y is not None), reverse=True),
+        selected_year=year,
+        total_count=total,
+    )
 
 
 @app.get("/analytics", response_class=HTMLResponse)
-async def analytics_page(request: Request, user=Depends(get_current_user)):
-    template = jinja_env.get_template("analytics.html")
-    return template.render(request=request, username=user.username)
+async def analytics_page(request: Request, user=Depends(get_current_user_html)):
+    return _TPL_ANALYTICS.render(request=request, username=user.username)
 
 
 @app.get("/equity-awards", response_class=HTMLResponse)
-async def equity_awards_page(request: Request, user=Depends(get_current_user)):
-    template = jinja_env.get_template("equity_awards.html")
-    return template.render(request=request, username=user.username)
+async def equity_awards_page(request: Request, user=Depends(get_current_user_html)):
+    return _TPL_EQUITY_AWARDS.render(request=request, username=user.username)
 
 
 @app.get("/portfolio", response_class=HTMLResponse)
-async def portfolio_page(request: Request, user=Depends(get_current_user)):
-    template = jinja_env.get_template("portfolio.html")
-    return template.render(request=request, username=user.username)
+async def portfolio_page(request: Request, user=Depends(get_current_user_html)):
+    return _TPL_PORTFOLIO.render(request=request, username=user.username)
 
 
 @app.get("/portfolio/upload", response_class=HTMLResponse)
-async def portfolio_upload_page(request: Request, user=Depends(get_current_user)):
-    template = jinja_env.get_template("portfolio_upload.html")
-    return template.render(request=request, username=user.username)
+async def portfolio_upload_page(request: Request, user=Depends(get_current_user_html)):
+    return _TPL_PORTFOLIO_UPLOAD.render(request=request, username=user.username)
 
 
 @app.get("/portfolio/connect", response_class=HTMLResponse)
-async def plaid_connect_page(request: Request, user=Depends(get_current_user)):
-    template = jinja_env.get_template("plaid_connect.html")
-    return template.render(request=request, username=user.username)
+async def plaid_connect_page(request: Request, user=Depends(get_current_user_html)):
+    return _TPL_PLAID_CONNECT.render(request=request, username=user.username)
 
 
 @app.get("/portfolio/credentials", response_class=HTMLResponse)
-async def portfolio_credentials_page(request: Request, user=Depends(get_current_user)):
-    template = jinja_env.get_template("broker_credentials.html")
-    return template.render(request=request, username=user.username)
+async def portfolio_credentials_page(request: Request, user=Depends(get_current_user_html)):
+    return _TPL_BROKER_CREDENTIALS.render(request=request, username=user.username)
 
 
 @app.get("/login", response_class=HTMLResponse)
 async def login_page(request: Request):
     next_url = request.query_params.get('next', '/')
-    template = jinja_env.get_template("login.html")
-    return template.render(request=request, next_url=next_url)
+    return _TPL_LOGIN.render(request=request, next_url=next_url)
 
 
 @app.get("/plaid/oauth-return", response_class=HTMLResponse)
 async def plaid_oauth_return(request: Request):
     """OAuth redirect landing page — re-initializes Plaid Link with receivedRedirectUri to complete the OAuth flow."""
-    template = jinja_env.get_template("plaid_connect.html")
-    return template.render(request=request, oauth_return=True, oauth_redirect_uri=str(request.url))
+    return _TPL_PLAID_CONNECT.render(request=request, oauth_return=True, oauth_redirect_uri=str(request.url))
 
 
 @app.post("/login")
@@ -173,13 +235,24 @@ async def login_form(request: Request, db: Session = Depends(get_db)):
     # Safety: only allow relative paths
     if not next_url.startswith("/"):
         next_url = "/"
-    from .models import User
-    user = db.query(User).filter(User.username == username).first()
-    if not user or not verify_password(password, user.hashed_password):
-        template = jinja_env.get_template("login.html")
-        return HTMLResponse(template.render(request=request, error="Invalid credentials", next_url=next_url), status_code=401)
+    client_ip = request.client.host if request.client else ""
+    if login_throttled(client_ip):
+        return HTMLResponse(_TPL_LOGIN.render(request=request, error="Too many failed attempts. Try again later.", next_url=next_url), status_code=429)
+    user = await run_in_threadpool(_authenticate, db, username, password)
+    if not user:
+        record_login_failure(client_ip)
+        return HTMLResponse(_TPL_LOGIN.render(request=request, error="Invalid credentials", next_url=next_url), status_code=401)
     from .auth import create_access_token, set_auth_cookie
     token = create_access_token({"sub": user.username})
     response = RedirectResponse(url=next_url, status_code=302)
     set_auth_cookie(response, token)
     return response
+
+
+def _authenticate(db: Session, username: str, password: str):
+    """Look up the user and check the password (bcrypt is slow; run off the event loop)"""
+    from .models import User
+    user = db.query(User).filter(User.username == username).first()
+    if not user or not verify_password(password, user.hashed_password):
+        return None
+    return user
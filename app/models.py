@@ -1,15 +1,76 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Numeric, Text
-from sqlalchemy.orm import relationship
-from datetime import datetime
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, Date, DateTime, Enum, ForeignKey, JSON, Numeric, Text, Uuid, Index, func, insert, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.types import TypeDecorator
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
 from .database import Base
 
+# Deferred columns too large or rarely needed for list views; load them with
+# .options(undefer_group(BIG_BLOBS)) where a view does need them
+BIG_BLOBS = "big_blobs"
+
+# Dict columns: JSONB on Postgres, JSON text elsewhere; None is stored as SQL NULL
+JSONDict = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+
+def brin_index(name: str, column: str) -> Index:
+    """
+    Postgres BRIN index for a date column of an append-mostly table: min/max
+    per 32 pages, a tiny fraction of a B-tree, for date-range scans across
+    all users. Not created on other databases.
+    """
+    return Index(name, column, postgresql_using="brin",
+                 postgresql_with={"pages_per_range": 32}).ddl_if(dialect="postgresql")
+
+
+class MinorUnits(TypeDecorator):
+    """
+    Decimal amount stored as a BIGINT count of 10**-scale units (cents for
+    scale=2). Sums and comparisons run on native integers in the database;
+    Python code still reads and writes Decimal.
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    def __init__(self, scale: int = 2):
+        super().__init__()
+        self.scale = scale
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, Decimal):
+            value = Decimal(str(value))
+        return int(value.scaleb(self.scale).to_integral_value(ROUND_HALF_UP))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return Decimal(value).scaleb(-self.scale)
+
+
+class BulkInsertMixin:
+    """Insert imported rows as multi-row INSERTs instead of one ORM object each"""
+
+    @classmethod
+    def bulk_insert(cls, session, rows: list) -> int:
+        """
+        Insert a list of column-name dicts in the session's transaction.
+        Rows skip object construction and the unit of work; the engine
+        sends them in pages of insertmanyvalues_page_size.
+        """
+        if rows:
+            session.execute(insert(cls), rows)
+        return len(rows)
+
 
 class User(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String(64), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
 
     accounts = relationship("Account", back_populates="owner")
     transactions = relationship("Transaction", back_populates="user")
@@ -21,6 +82,9 @@ class User(Base):
     mortgage_accounts = relationship("MortgageAccount", back_populates="user")
     tax_documents = relationship("TaxDocument", back_populates="user")
     business_transactions = relationship("BusinessTransaction", back_populates="user")
+    plaid_items = relationship("PlaidItem", back_populates="user")
+    espp_grants = relationship("ESPPGrant", back_populates="user")
+    rsu_grants = relationship("RSUGrant", back_populates="user")
 
 
 class Account(Base):
@@ -45,8 +109,8 @@ class Category(Base):
 
 class Transaction(Base):
     __tablename__ = "transactions"
-    id = Column(Integer, primary_key=True, index=True)
-    amount = Column(Numeric(12, 2), nullable=False)
+    id = Column(Integer, primary_key=True)
+    amount = Column(MinorUnits(), nullable=False)
     date = Column(Date, nullable=False)
     notes = Column(Text, nullable=True)
 
@@ -60,6 +124,13 @@ class Transaction(Base):
     account = relationship("Account", back_populates="transactions")
     category = relationship("Category", back_populates="transactions")
 
+    __table_args__ = (
+        # Dashboard income/expense totals aggregate per user split by is_income
+        Index("ix_transactions_user_income", "user_id", "is_income", "amount"),
+        # Transaction list is per user, newest first
+        Index("ix_transactions_user_date", "user_id", "date"),
+    )
+
 
 class Receipt(Base):
     __tablename__ = "receipts"
@@ -70,21 +141,23 @@ class Receipt(Base):
     provider = Column(String(150), nullable=False)
     patient_name = Column(String(100), nullable=True)
     category = Column(String(100), nullable=True)
-    amount = Column(Numeric(12, 2), nullable=True)
+    amount = Column(MinorUnits(), nullable=True)
     payment_method = Column(String(50), nullable=True)  # HSA Card, Personal Card, Cash
     paid_date = Column(Date, nullable=True)
     submitted_date = Column(Date, nullable=True)
     reimbursed = Column(Boolean, default=False)
-    reimbursement_amount = Column(Numeric(12, 2), nullable=True)
+    reimbursement_amount = Column(MinorUnits(), nullable=True)
     reimbursement_date = Column(Date, nullable=True)
     claim_number = Column(String(100), nullable=True)
     tax_year = Column(Integer, nullable=True)
     hsa_eligible = Column(Boolean, default=True)
     notes = Column(Text, nullable=True)
-    uploaded_at = Column(DateTime, default=datetime.utcnow)
+    uploaded_at = Column(DateTime, default=func.now(), server_default=func.now())
 
     user = relationship("User", back_populates="receipts")
-    files = relationship("ReceiptFile", back_populates="receipt", cascade="all, delete-orphan")
+    # Receipts are always shown with their files: one IN query per page of receipts
+    files = relationship("ReceiptFile", back_populates="receipt", cascade="all, delete-orphan",
+                         lazy="selectin")
 
 
 class ReceiptFile(Base):
@@ -96,7 +169,7 @@ class ReceiptFile(Base):
     file_name = Column(String(255), nullable=False)  # stored filename
     original_name = Column(String(255), nullable=False)
     content_type = Column(String(100), nullable=True)
-    uploaded_at = Column(DateTime, default=datetime.utcnow)
+    uploaded_at = Column(DateTime, default=func.now(), server_default=func.now())
     
     receipt = relationship("Receipt", back_populates="files")
 
@@ -112,42 +185,54 @@ class PortfolioAccount(Base):
     account_name = Column(String(150), nullable=True)  # Custom name/nickname
     account_holder = Column(String(150), nullable=True)  # Actual account holder name (e.g., "John Doe")
     account_number_last4 = Column(String(4), nullable=True)  # Last 4 digits for identification
-    balance = Column(Numeric(15, 2), default=0)
+    balance = Column(MinorUnits(), default=0)
     currency = Column(String(3), default="USD")
     last_synced = Column(DateTime, nullable=True)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
     
     user = relationship("User", back_populates="portfolio_accounts")
     holdings = relationship("Holding", back_populates="account")
     bank_transactions = relationship("BankTransaction", back_populates="account")
+    espp_grants = relationship("ESPPGrant", back_populates="account")
+    rsu_grants = relationship("RSUGrant", back_populates="account")
 
 
 class Holding(Base):
     """Investment holdings - stocks, ETFs, mutual funds"""
     __tablename__ = "holdings"
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     account_id = Column(Integer, ForeignKey("portfolio_accounts.id"), nullable=False)
     
     symbol = Column(String(20), nullable=False)  # Stock ticker
     name = Column(String(200), nullable=True)  # Full name
-    quantity = Column(Numeric(15, 6), nullable=False)
-    cost_basis = Column(Numeric(15, 2), nullable=True)  # Total purchase price
-    current_price = Column(Numeric(15, 2), nullable=True)
-    current_value = Column(Numeric(15, 2), nullable=True)
+    quantity = Column(MinorUnits(6), nullable=False)
+    cost_basis = Column(MinorUnits(), nullable=True)  # Total purchase price
+    current_price = Column(MinorUnits(), nullable=True)
+    current_value = Column(MinorUnits(), nullable=True)
     asset_type = Column(String(50), nullable=True)  # stock, etf, mutual_fund, bond, crypto
     snapshot_date = Column(Date, nullable=False)  # Date of this data
     
     user = relationship("User", back_populates="holdings")
     account = relationship("PortfolioAccount", back_populates="holdings")
 
+    __table_args__ = (
+        Index("ix_holdings_user_snapshot", "user_id", "snapshot_date"),
+        # Imports replace an account's holdings for the snapshot date
+        Index("ix_holdings_account_snapshot", "account_id", "snapshot_date"),
+        brin_index("ix_holdings_snapshot_brin", "snapshot_date"),
+    )
+
 
-class BankTransaction(Base):
+# Mapped instances keep ORM state in __dict__, so they cannot use __slots__.
+# Read-only lists and reports should query columns (Row tuples, ~400 B/row)
+# instead of whole BankTransaction objects (~1.4 KB/row).
+class BankTransaction(BulkInsertMixin, Base):
     """Bank and credit card transactions"""
     __tablename__ = "bank_transactions"
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     account_id = Column(Integer, ForeignKey("portfolio_accounts.id"), nullable=False)
@@ -155,17 +240,40 @@ class BankTransaction(Base):
     transaction_date = Column(Date, nullable=False)
     post_date = Column(Date, nullable=True)
     description = Column(String(255), nullable=False)
-    amount = Column(Numeric(12, 2), nullable=False)  # Negative for expenses, positive for income
+    amount = Column(MinorUnits(), nullable=False)  # Negative for expenses, positive for income
     category = Column(String(100), nullable=True)  # Auto-categorized or manual
     transaction_type = Column(String(50), nullable=True)  # debit, credit, transfer, fee, etc.
-    balance_after = Column(Numeric(15, 2), nullable=True)
-    notes = Column(Text, nullable=True)
+    balance_after = Column(MinorUnits(), nullable=True)
+    notes = deferred(Column(Text, nullable=True), group=BIG_BLOBS)
     import_id = Column(String(100), nullable=True)  # External transaction ID to prevent duplicates
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
     
     user = relationship("User", back_populates="bank_transactions")
     account = relationship("PortfolioAccount", back_populates="bank_transactions")
 
+    @classmethod
+    def existing_import_ids(cls, session, user_id: int, import_ids) -> set:
+        """Subset of import_ids the user already has, one query per 500 ids"""
+        import_ids = list(import_ids)
+        found = set()
+        for i in range(0, len(import_ids), 500):
+            found.update(session.scalars(
+                select(cls.import_id).where(
+                    cls.user_id == user_id,
+                    cls.import_id.in_(import_ids[i:i + 500]),
+                )
+            ))
+        return found
+
+    __table_args__ = (
+        # Covering on Postgres so the recent-transactions list skips the heap
+        Index("ix_bank_tx_user_date", "user_id", "transaction_date",
+              postgresql_include=["amount", "description"]),
+        # Imports skip rows whose import_id the user already has
+        Index("ix_bank_tx_user_import", "user_id", "import_id", unique=True),
+        brin_index("ix_bank_tx_date_brin", "transaction_date"),
+    )
+
 
 class BrokerCredential(Base):
     """Encrypted broker credentials for automated sync"""
@@ -176,10 +284,10 @@ class BrokerCredential(Base):
     institution = Column(String(100), nullable=False)  # Fidelity, E*TRADE, etc.
     username = Column(String(255), nullable=False)
     encrypted_password = Column(Text, nullable=False)  # Encrypted password
-    additional_data = Column(Text, nullable=True)  # JSON for MFA tokens, security questions, etc.
+    additional_data = deferred(Column(JSONDict, nullable=True), group=BIG_BLOBS)  # MFA tokens, security questions, etc.
     is_active = Column(Boolean, default=True)
     last_used = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
     
     user = relationship("User", back_populates="broker_credentials")
 
@@ -196,9 +304,9 @@ class PlaidItem(Base):
     institution_id = Column(String(255), nullable=True)
     is_active = Column(Boolean, default=True)
     last_synced = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
     
-    user = relationship("User", backref="plaid_items")
+    user = relationship("User", back_populates="plaid_items")
 
 
 class ESPPGrant(Base):
@@ -212,17 +320,17 @@ class ESPPGrant(Base):
     symbol = Column(String(20), nullable=False, index=True)
     record_type = Column(String(50), nullable=True)  # e.g., "Employee Stock Purchase Plan"
     purchase_date = Column(Date, nullable=True)
-    purchase_price = Column(Numeric(12, 4), nullable=True)  # Price per share at purchase
-    purchased_qty = Column(Numeric(16, 6), nullable=True)  # Original purchased quantity
-    sellable_qty = Column(Numeric(16, 6), nullable=True)  # Current sellable quantity
-    expected_gain_loss = Column(Numeric(12, 2), nullable=True)
-    est_market_value = Column(Numeric(12, 2), nullable=True)
+    purchase_price = Column(MinorUnits(4), nullable=True)  # Price per share at purchase
+    purchased_qty = Column(MinorUnits(6), nullable=True)  # Original purchased quantity
+    sellable_qty = Column(MinorUnits(6), nullable=True)  # Current sellable quantity
+    expected_gain_loss = Column(MinorUnits(), nullable=True)
+    est_market_value = Column(MinorUnits(), nullable=True)
     
-    last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    last_updated = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
     
-    user = relationship("User", backref="espp_grants")
-    account = relationship("PortfolioAccount", backref="espp_grants")
+    user = relationship("User", back_populates="espp_grants")
+    account = relationship("PortfolioAccount", back_populates="espp_grants")
 
 
 class RSUGrant(Base):
@@ -239,18 +347,23 @@ class RSUGrant(Base):
     grant_date = Column(Date, nullable=True)
     settlement_type = Column(String(50), nullable=True)
     
-    granted_qty = Column(Numeric(16, 6), nullable=True)  # Total granted shares
-    withheld_qty = Column(Numeric(16, 6), nullable=True)  # Shares withheld for taxes
-    vested_qty = Column(Numeric(16, 6), nullable=True)  # Total vested shares
-    unvested_qty = Column(Numeric(16, 6), nullable=True)  # Shares still vesting
-    sellable_qty = Column(Numeric(16, 6), nullable=True)  # Shares available to sell
-    est_market_value = Column(Numeric(12, 2), nullable=True)
+    granted_qty = Column(MinorUnits(6), nullable=True)  # Total granted shares
+    withheld_qty = Column(MinorUnits(6), nullable=True)  # Shares withheld for taxes
+    vested_qty = Column(MinorUnits(6), nullable=True)  # Total vested shares
+    unvested_qty = Column(MinorUnits(6), nullable=True)  # Shares still vesting
+    sellable_qty = Column(MinorUnits(6), nullable=True)  # Shares available to sell
+    est_market_value = Column(MinorUnits(), nullable=True)
     
-    last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    last_updated = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
     
-    user = relationship("User", backref="rsu_grants")
-    account = relationship("PortfolioAccount", backref="rsu_grants")
+    user = relationship("User", back_populates="rsu_grants")
+    account = relationship("PortfolioAccount", back_populates="rsu_grants")
+
+
+def _statement_date(stmt):
+    # Undated statements sort as oldest, like NULLs under ORDER BY ... DESC on SQLite
+    return stmt.statement_date or date.min
 
 
 class MortgageAccount(Base):
@@ -262,18 +375,28 @@ class MortgageAccount(Base):
     servicer_name = Column(String(100), nullable=False)           # e.g., RoundPoint
     loan_number = Column(String(50), nullable=True)
     property_address = Column(String(250), nullable=True)
-    original_balance = Column(Numeric(12, 2), nullable=True)
+    original_balance = Column(MinorUnits(), nullable=True)
     interest_rate = Column(Numeric(6, 4), nullable=True)          # e.g., 6.875
     loan_term_months = Column(Integer, nullable=True)             # 360 = 30yr
     origination_date = Column(Date, nullable=True)
     maturity_date = Column(Date, nullable=True)
-    monthly_payment = Column(Numeric(12, 2), nullable=True)       # P+I+Escrow
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    monthly_payment = Column(MinorUnits(), nullable=True)        # P+I+Escrow
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
 
     user = relationship("User", back_populates="mortgage_accounts")
+    # Unordered; sort where the order matters (see statements_newest_first)
     statements = relationship("MortgageStatement", back_populates="mortgage",
-                              cascade="all, delete-orphan", order_by="MortgageStatement.statement_date.desc()")
+                              cascade="all, delete-orphan", lazy="selectin")
+
+    @property
+    def latest_statement(self):
+        """Most recent statement by statement_date, or None"""
+        return max(self.statements, key=_statement_date, default=None)
+
+    @property
+    def statements_newest_first(self):
+        return sorted(self.statements, key=_statement_date, reverse=True)
 
 
 class MortgageStatement(Base):
@@ -284,20 +407,31 @@ class MortgageStatement(Base):
     mortgage_id = Column(Integer, ForeignKey("mortgage_accounts.id"), nullable=False)
     statement_date = Column(Date, nullable=True)
     due_date = Column(Date, nullable=True)
-    unpaid_principal = Column(Numeric(12, 2), nullable=True)
+    unpaid_principal = Column(MinorUnits(), nullable=True)
     interest_rate = Column(Numeric(6, 4), nullable=True)
-    payment_amount = Column(Numeric(12, 2), nullable=True)        # Total amount due
-    principal_portion = Column(Numeric(12, 2), nullable=True)
-    interest_portion = Column(Numeric(12, 2), nullable=True)
-    escrow_portion = Column(Numeric(12, 2), nullable=True)
-    escrow_balance = Column(Numeric(12, 2), nullable=True)
-    ytd_interest = Column(Numeric(12, 2), nullable=True)
-    ytd_taxes = Column(Numeric(12, 2), nullable=True)
-    raw_text = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    payment_amount = Column(MinorUnits(), nullable=True)         # Total amount due
+    principal_portion = Column(MinorUnits(), nullable=True)
+    interest_portion = Column(MinorUnits(), nullable=True)
+    escrow_portion = Column(MinorUnits(), nullable=True)
+    escrow_balance = Column(MinorUnits(), nullable=True)
+    ytd_interest = Column(MinorUnits(), nullable=True)
+    ytd_taxes = Column(MinorUnits(), nullable=True)
+    raw_text = deferred(Column(Text, nullable=True), group=BIG_BLOBS)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
 
     mortgage = relationship("MortgageAccount", back_populates="statements")
 
+    __table_args__ = (
+        Index("ix_mortgage_statements_mortgage_date", "mortgage_id", "statement_date"),
+        brin_index("ix_mortgage_statements_date_brin", "statement_date"),
+    )
+
+
+# Codes behind FORM_TYPES in routers/tax.py; keep the two in sync
+TAX_FORM_TYPES = ("W2", "1099_INT", "1098_T", "1098", "3922", "1099_CONSOLIDATED",
+                  "1099_R", "SSA_1099", "1099_SA")
+TAX_DOC_STATUSES = ("expected", "uploaded", "filed")
+
 
 class TaxDocument(Base):
     """Tax document vault — store and track annual tax forms (W-2, 1099s, 1098s, etc.)"""
@@ -305,42 +439,51 @@ class TaxDocument(Base):
     id = Column(Integer, primary_key=True, index=True)
 
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    tax_year = Column(Integer, nullable=False, index=True)
-    # W2 | 1099_INT | 1098_T | 1098 | 3922 | 1099_CONSOLIDATED
-    form_type = Column(String(40), nullable=False)
+    tax_year = Column(Integer, nullable=False)
+    # Native ENUM on Postgres, VARCHAR sized to the longest code elsewhere
+    form_type = Column(Enum(*TAX_FORM_TYPES, name="tax_form_type"), nullable=False)
     issuer = Column(String(150), nullable=True)       # Employer, bank, brokerage, university
     description = Column(String(255), nullable=True)  # e.g., "Primary employment", "Brokerage XXXX"
     # expected = received but not yet uploaded / uploaded = file stored / filed = used in return
-    status = Column(String(20), default="uploaded")
-    extracted_data = Column(Text, nullable=True)      # JSON blob of form-specific key figures
+    status = Column(Enum(*TAX_DOC_STATUSES, name="tax_doc_status"), default="uploaded")
+    extracted_data = deferred(Column(JSONDict, nullable=True), group=BIG_BLOBS)  # form-specific key figures
     file_name = Column(String(255), nullable=True)    # stored filename on disk
     original_name = Column(String(255), nullable=True)
     content_type = Column(String(100), nullable=True)
     notes = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
 
     user = relationship("User", back_populates="tax_documents")
 
+    __table_args__ = (
+        Index("ix_tax_documents_user_year", "user_id", "tax_year"),
+    )
+
 
-class BusinessTransaction(Base):
+class BusinessTransaction(BulkInsertMixin, Base):
     """Wave CSV imported transactions for Schedule C / sole proprietorship P&L"""
     __tablename__ = "business_transactions"
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
 
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    tax_year = Column(Integer, nullable=False, index=True)
+    tax_year = Column(Integer, nullable=False)
 
     transaction_date = Column(Date, nullable=False)
     description = Column(String(255), nullable=False)
-    amount = Column(Numeric(12, 2), nullable=False)        # positive = income, negative = expense
+    amount = Column(MinorUnits(), nullable=False)         # positive = income, negative = expense
     account_name = Column(String(150), nullable=True)
     wave_category = Column(String(150), nullable=True)     # raw Wave category name
     schedule_c_line = Column(String(10), nullable=True)    # e.g. "1", "8", "18", "24b"
     schedule_c_label = Column(String(150), nullable=True)  # human label for that line
     is_income = Column(Boolean, default=False)
     notes = Column(Text, nullable=True)
-    import_batch = Column(String(36), nullable=True)       # UUID — lets user replace a batch
-    created_at = Column(DateTime, default=datetime.utcnow)
+    import_batch = Column(Uuid, nullable=True)             # UUIDv7 — lets user replace a batch
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
 
     user = relationship("User", back_populates="business_transactions")
+
+    __table_args__ = (
+        Index("ix_business_tx_user_year", "user_id", "tax_year"),
+        brin_index("ix_business_tx_date_brin", "transaction_date"),
+    )
@@ -3,11 +3,23 @@ Parse RoundPoint (and generic) mortgage PDF statements.
 Extracts: principal balance, interest rate, payment due date,
 payment breakdown (P/I/escrow), escrow balance, YTD interest/taxes.
 """
+import hashlib
+import os
 import re
+from collections import OrderedDict
 from datetime import date
+from functools import lru_cache
 from typing import Optional, Dict, Any
 
-# Try pdfplumber first (more accurate), fall back to pypdf
+# PyMuPDF (C, MuPDF) reads the text layer far faster than pdfplumber, which
+# lays pages out in Python on top of pdfminer; pdfplumber and pypdf remain
+# as fallbacks
+try:
+    import pymupdf
+    _USE_PYMUPDF = True
+except ImportError:
+    _USE_PYMUPDF = False
+
 try:
     import pdfplumber
     _USE_PDFPLUMBER = True
@@ -20,17 +32,86 @@ try:
 except ImportError:
     _USE_PYPDF = False
 
+# google-re2 (linear-time, no backtracking) for the field patterns if installed
+try:
+    import re2
+    _USE_RE2 = True
+except ImportError:
+    _USE_RE2 = False
+
+
+# Text of recently read PDFs keyed by SHA-256 of the file bytes. Previewing a
+# statement and then uploading it reads the same bytes from two temp paths;
+# the second read skips text extraction. Set PDF_TEXT_CACHE_MAX_SIZE=0 to disable.
+PDF_TEXT_CACHE_MAX_SIZE = int(os.getenv("PDF_TEXT_CACHE_MAX_SIZE", "32"))
+_pdf_text_cache: "OrderedDict[tuple, str]" = OrderedDict()
+
+# The statement summary (balances, rate, payment breakdown, YTD totals) is on
+# the first pages; later pages are transaction history and notices
+STATEMENT_MAX_PAGES = 2
+
+# Loan number and statement/due dates sit in the page-1 header; only this
+# many leading characters are searched for them
+STATEMENT_HEAD_CHARS = 4000
+
+# Parsed fields of recently seen statement texts. Parsing is deterministic in
+# the text, so re-parsing the same statement skips every regex. Set
+# STATEMENT_PARSE_CACHE_MAX_SIZE=0 to disable.
+STATEMENT_PARSE_CACHE_MAX_SIZE = int(os.getenv("STATEMENT_PARSE_CACHE_MAX_SIZE", "64"))
+
+
+def extract_pdf_text(file_path: str, max_pages: Optional[int] = None) -> str:
+    """Extract text from a PDF file: every page, or only the first max_pages."""
+    if not PDF_TEXT_CACHE_MAX_SIZE:
+        return _extract_pdf_text(file_path, max_pages)
+
+    try:
+        with open(file_path, "rb") as f:
+            key = (hashlib.sha256(f.read()).hexdigest(), max_pages)
+    except OSError:
+        return _extract_pdf_text(file_path, max_pages)
+    text = _pdf_text_cache.get(key)
+    if text is not None:
+        _pdf_text_cache.move_to_end(key)
+        return text
+
+    text = _extract_pdf_text(file_path, max_pages)
+    _pdf_text_cache[key] = text
+    if len(_pdf_text_cache) > PDF_TEXT_CACHE_MAX_SIZE:
+        _pdf_text_cache.popitem(last=False)
+    return text
+
+
+def _extract_pdf_text(file_path: str, max_pages: Optional[int]) -> str:
+    # Pages are collected in a list and joined once; += would recopy the
+    # whole text for every page
+    parts = []
+    if _USE_PYMUPDF:
+        try:
+            with pymupdf.open(file_path) as doc:
+                stop = min(max_pages, doc.page_count) if max_pages else None
+                for page in doc.pages(0, stop):
+                    # sort=True puts blocks in top-to-bottom, left-to-right order
+                    t = page.get_text("text", sort=True)
+                    if t:
+                        parts.append(t + "\n")
+            text = "".join(parts)
+            if text.strip():
+                return text
+        except Exception:
+            pass
+        parts = []
 
-def extract_pdf_text(file_path: str) -> str:
-    """Extract all text from a PDF file."""
-    text = ""
     if _USE_PDFPLUMBER:
+        # pdfplumber page numbers are 1-based; it never parses the others
+        pages = list(range(1, max_pages + 1)) if max_pages else None
         try:
-            with pdfplumber.open(file_path) as pdf:
+            with pdfplumber.open(file_path, pages=pages) as pdf:
                 for page in pdf.pages:
                     t = page.extract_text()
                     if t:
-                        text += t + "\n"
+                        parts.append(t + "\n")
+            text = "".join(parts)
             if text.strip():
                 return text
         except Exception:
@@ -39,21 +120,33 @@ def extract_pdf_text(file_path: str) -> str:
     if _USE_PYPDF:
         try:
             reader = PdfReader(file_path)
-            for page in reader.pages:
+            for page in reader.pages[:max_pages]:
                 t = page.extract_text()
                 if t:
-                    text += t + "\n"
+                    parts.append(t + "\n")
         except Exception:
             pass
 
-    return text
+    return "".join(parts)
+
+
+# Deletes thousands separators, dollar signs and stray spaces in one C pass
+_AMOUNT_JUNK = str.maketrans('', '', ',$ ')
+_RE_MDY = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+_RE_MONTH_DATE = re.compile(r'([A-Za-z]{3,9})\.?\s+(\d{1,2}),?\s+(\d{4})$')
+_MONTH_NAMES = ('january', 'february', 'march', 'april', 'may', 'june', 'july',
+                'august', 'september', 'october', 'november', 'december')
+# Full and three-letter month names (plus 'sept') -> month number
+_MONTHS = {**{n: i for i, n in enumerate(_MONTH_NAMES, 1)},
+           **{n[:3]: i for i, n in enumerate(_MONTH_NAMES, 1)},
+           'sept': 9}
 
 
 def _parse_amount(s: str) -> Optional[float]:
     """Convert '$1,234.56' or '1234.56' to float."""
     if not s:
         return None
-    s = re.sub(r'[,$]', '', s.strip())
+    s = s.translate(_AMOUNT_JUNK)
     try:
         return float(s)
     except ValueError:
@@ -66,13 +159,21 @@ def _parse_date(s: str) -> Optional[date]:
         return None
     s = s.strip()
     # Try MM/DD/YYYY
-    m = re.match(r'(\d{1,2})/(\d{1,2})/(\d{4})', s)
+    m = _RE_MDY.match(s)
     if m:
         try:
             return date(int(m.group(3)), int(m.group(1)), int(m.group(2)))
         except ValueError:
             pass
-    # Try Month DD, YYYY
+    # Try Month DD, YYYY without loading dateutil
+    m = _RE_MONTH_DATE.match(s)
+    month = _MONTHS.get(m.group(1).lower()) if m else None
+    if month:
+        try:
+            return date(int(m.group(3)), month, int(m.group(2)))
+        except ValueError:
+            pass
+    # Anything else
     try:
         from dateutil import parser as dp
         return dp.parse(s).date()
@@ -81,10 +182,60 @@ def _parse_date(s: str) -> Optional[date]:
     return None
 
 
-def _find(pattern: str, text: str, group: int = 1, flags: int = re.IGNORECASE) -> Optional[str]:
-    """Return first match group or None."""
-    m = re.search(pattern, text, flags)
-    return m.group(group).strip() if m else None
+def _patterns(*patterns: str) -> tuple:
+    """
+    Compile alternatives, tried in order by _first(). Patterns are lowercase
+    and run case-sensitively against the lowercased statement: one lower()
+    pass lets re skip ahead on each literal prefix, which IGNORECASE (or one
+    fused alternation of every field) defeats.
+    """
+    compile_ = re2.compile if _USE_RE2 else re.compile
+    return tuple(compile_(p) for p in patterns)
+
+
+# Field patterns, compiled once at import
+_RE_LOAN_NO = _patterns(r'loan\s+(?:number|#|no\.?)\s*[:\-]?\s*(\d[\d\-]+)')
+_RE_STMT_DATE = _patterns(
+    r'statement\s+date\s*[:\-]?\s*(\d{1,2}/\d{1,2}/\d{4})',
+    r'cycle\s+date\s*[:\-]?\s*(\d{1,2}/\d{1,2}/\d{4})',
+)
+_RE_DUE_DATE = _patterns(
+    r'(?:payment\s+)?due\s+date\s*[:\-]?\s*(\d{1,2}/\d{1,2}/\d{4})',
+    r'amount\s+due\s+by\s+(\d{1,2}/\d{1,2}/\d{4})',
+)
+_RE_UPB = _patterns(
+    r'unpaid\s+principal\s+balance\s*[:\-]?\s*\$?([\d,]+\.\d{2})',
+    r'principal\s+balance\s*[:\-]?\s*\$?([\d,]+\.\d{2})',
+    r'outstanding\s+principal\s*[:\-]?\s*\$?([\d,]+\.\d{2})',
+)
+_RE_RATE = _patterns(r'interest\s+rate\s*[:\-]?\s*([\d.]+)\s*%')
+_RE_AMOUNT_DUE = _patterns(
+    r'total\s+amount\s+due\s*[:\-]?\s*\$?([\d,]+\.\d{2})',
+    r'amount\s+due\s*[:\-]?\s*\$?([\d,]+\.\d{2})',
+    r'regular\s+monthly\s+payment\s*[:\-]?\s*\$?([\d,]+\.\d{2})',
+)
+# Payment breakdown often appears as a table: Principal | Interest | Escrow
+_RE_PRINCIPAL = _patterns(r'principal\s*[:\-]?\s*\$?([\d,]+\.\d{2})\s')
+_RE_INTEREST = _patterns(r'interest\s*[:\-]?\s*\$?([\d,]+\.\d{2})\s')
+_RE_ESCROW = _patterns(r'escrow\s*[:\-]?\s*\$?([\d,]+\.\d{2})\s')
+_RE_ESCROW_BAL = _patterns(r'escrow\s+balance\s*[:\-]?\s*\$?([\d,]+\.\d{2})')
+_RE_YTD_INTEREST = _patterns(
+    r'year[\s\-]to[\s\-]date\s+interest(?:\s+paid)?\s*[:\-]?\s*\$?([\d,]+\.\d{2})',
+    r'ytd\s+interest\s*[:\-]?\s*\$?([\d,]+\.\d{2})',
+)
+_RE_YTD_TAXES = _patterns(
+    r'year[\s\-]to[\s\-]date\s+(?:real\s+estate\s+)?tax(?:es)?\s+paid\s*[:\-]?\s*\$?([\d,]+\.\d{2})',
+    r'ytd\s+tax(?:es)?\s*[:\-]?\s*\$?([\d,]+\.\d{2})',
+)
+
+
+def _first(patterns, text: str) -> Optional[str]:
+    """Return group 1 of the first pattern that matches, or None."""
+    for p in patterns:
+        m = p.search(text)
+        if m:
+            return m.group(1).strip()
+    return None
 
 
 def parse_roundpoint_statement(text: str) -> Dict[str, Any]:
@@ -92,6 +243,13 @@ def parse_roundpoint_statement(text: str) -> Dict[str, Any]:
     Parse a RoundPoint mortgage statement text.
     Returns a dict with all found fields (None if not found).
     """
+    # The cached dict is shared; callers get their own copy to modify. Its
+    # values (str, float, date) are immutable.
+    return dict(_parse_roundpoint_statement(text))
+
+
+@lru_cache(maxsize=STATEMENT_PARSE_CACHE_MAX_SIZE)
+def _parse_roundpoint_statement(text: str) -> Dict[str, Any]:
     data: Dict[str, Any] = {
         "statement_date": None,
         "due_date": None,
@@ -107,88 +265,80 @@ def parse_roundpoint_statement(text: str) -> Dict[str, Any]:
         "loan_number": None,
         "property_address": None,
     }
+    # Captured values are digits and punctuation, unaffected by lower()
+    text = text.lower()
+    head = text[:STATEMENT_HEAD_CHARS]
 
     # ── Loan number ────────────────────────────────────────────────────────────
-    ln = _find(r'loan\s+(?:number|#|no\.?)\s*[:\-]?\s*(\d[\d\-]+)', text)
+    ln = _first(_RE_LOAN_NO, head)
     if ln:
         data["loan_number"] = ln
 
     # ── Statement / cycle date ─────────────────────────────────────────────────
-    sd = _find(r'statement\s+date\s*[:\-]?\s*(\d{1,2}/\d{1,2}/\d{4})', text)
-    if not sd:
-        sd = _find(r'cycle\s+date\s*[:\-]?\s*(\d{1,2}/\d{1,2}/\d{4})', text)
+    sd = _first(_RE_STMT_DATE, head)
     if sd:
         data["statement_date"] = _parse_date(sd)
 
     # ── Payment due date ───────────────────────────────────────────────────────
-    dd = _find(r'(?:payment\s+)?due\s+date\s*[:\-]?\s*(\d{1,2}/\d{1,2}/\d{4})', text)
-    if not dd:
-        dd = _find(r'amount\s+due\s+by\s+(\d{1,2}/\d{1,2}/\d{4})', text)
+    dd = _first(_RE_DUE_DATE, head)
     if dd:
         data["due_date"] = _parse_date(dd)
 
     # ── Unpaid principal balance ───────────────────────────────────────────────
-    pb = _find(r'unpaid\s+principal\s+balance\s*[:\-]?\s*\$?([\d,]+\.\d{2})', text)
-    if not pb:
-        pb = _find(r'principal\s+balance\s*[:\-]?\s*\$?([\d,]+\.\d{2})', text)
-    if not pb:
-        pb = _find(r'outstanding\s+principal\s*[:\-]?\s*\$?([\d,]+\.\d{2})', text)
+    pb = _first(_RE_UPB, text)
     if pb:
         data["unpaid_principal"] = _parse_amount(pb)
 
     # ── Interest rate ──────────────────────────────────────────────────────────
-    ir = _find(r'interest\s+rate\s*[:\-]?\s*([\d.]+)\s*%', text)
+    ir = _first(_RE_RATE, text)
     if ir:
         data["interest_rate"] = float(ir)
 
     # ── Total amount due / payment amount ─────────────────────────────────────
-    ta = _find(r'total\s+amount\s+due\s*[:\-]?\s*\$?([\d,]+\.\d{2})', text)
-    if not ta:
-        ta = _find(r'amount\s+due\s*[:\-]?\s*\$?([\d,]+\.\d{2})', text)
-    if not ta:
-        ta = _find(r'regular\s+monthly\s+payment\s*[:\-]?\s*\$?([\d,]+\.\d{2})', text)
+    ta = _first(_RE_AMOUNT_DUE, text)
     if ta:
         data["payment_amount"] = _parse_amount(ta)
 
     # ── Payment breakdown ──────────────────────────────────────────────────────
-    # Often appears as a table: Principal | Interest | Escrow
-    pp = _find(r'principal\s*[:\-]?\s*\$?([\d,]+\.\d{2})\s', text)
+    pp = _first(_RE_PRINCIPAL, text)
     if pp:
         data["principal_portion"] = _parse_amount(pp)
 
-    ip = _find(r'interest\s*[:\-]?\s*\$?([\d,]+\.\d{2})\s', text)
+    ip = _first(_RE_INTEREST, text)
     if ip:
         data["interest_portion"] = _parse_amount(ip)
 
-    ep = _find(r'escrow\s*[:\-]?\s*\$?([\d,]+\.\d{2})\s', text)
+    ep = _first(_RE_ESCROW, text)
     if ep:
         data["escrow_portion"] = _parse_amount(ep)
 
     # ── Escrow balance ─────────────────────────────────────────────────────────
-    eb = _find(r'escrow\s+balance\s*[:\-]?\s*\$?([\d,]+\.\d{2})', text)
+    eb = _first(_RE_ESCROW_BAL, text)
     if eb:
         data["escrow_balance"] = _parse_amount(eb)
 
     # ── YTD interest paid ──────────────────────────────────────────────────────
-    yi = _find(r'year[\s\-]to[\s\-]date\s+interest(?:\s+paid)?\s*[:\-]?\s*\$?([\d,]+\.\d{2})', text)
-    if not yi:
-        yi = _find(r'ytd\s+interest\s*[:\-]?\s*\$?([\d,]+\.\d{2})', text)
+    yi = _first(_RE_YTD_INTEREST, text)
     if yi:
         data["ytd_interest"] = _parse_amount(yi)
 
     # ── YTD taxes paid ─────────────────────────────────────────────────────────
-    yt = _find(r'year[\s\-]to[\s\-]date\s+(?:real\s+estate\s+)?tax(?:es)?\s+paid\s*[:\-]?\s*\$?([\d,]+\.\d{2})', text)
-    if not yt:
-        yt = _find(r'ytd\s+tax(?:es)?\s*[:\-]?\s*\$?([\d,]+\.\d{2})', text)
+    yt = _first(_RE_YTD_TAXES, text)
     if yt:
         data["ytd_taxes"] = _parse_amount(yt)
 
     return data
 
 
-def parse_mortgage_pdf(file_path: str) -> Dict[str, Any]:
-    """Extract text from PDF and parse mortgage statement fields."""
-    text = extract_pdf_text(file_path)
+def parse_mortgage_pdf(file_path: str, max_pages: Optional[int] = STATEMENT_MAX_PAGES,
+                       include_raw: bool = False) -> Dict[str, Any]:
+    """
+    Extract text from PDF and parse mortgage statement fields. Only the
+    first max_pages pages are read; pass None to read the whole file.
+    The extracted text is returned as "raw_text" only if include_raw is set.
+    """
+    text = extract_pdf_text(file_path, max_pages)
     result = parse_roundpoint_statement(text)
-    result["raw_text"] = text
+    if include_raw:
+        result["raw_text"] = text
     return result
@@ -1,30 +1,129 @@
 import re
 import os
+import importlib.util
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, Dict
-from PIL import Image
-import pytesseract
-from pdf2image import convert_from_path
-from dateutil import parser as date_parser
+
+# PIL, pytesseract, pdf2image and dateutil are imported where they are used:
+# they are slow to load and only needed once a receipt is actually OCR'd
+
+# PyMuPDF reads a PDF's text layer and rasterizes pages in-process (no Poppler)
+try:
+    import pymupdf
+    _USE_PYMUPDF = True
+except ImportError:
+    _USE_PYMUPDF = False
+
+# google-re2 (linear-time, no backtracking) for the receipt patterns if installed
+try:
+    import re2
+    _USE_RE2 = True
+except ImportError:
+    _USE_RE2 = False
+
+# Aho-Corasick automaton for the category keyword scan if installed
+try:
+    import ahocorasick
+    _USE_AHOCORASICK = True
+except ImportError:
+    _USE_AHOCORASICK = False
+
+# tesserocr keeps Tesseract loaded in-process instead of spawning the CLI per
+# page like pytesseract; checked without importing it (see above)
+_USE_TESSEROCR = importlib.util.find_spec("tesserocr") is not None
+
+# A PDF text layer shorter than this is treated as a scan and OCR'd
+MIN_TEXT_LAYER_CHARS = 40
+
+# Pages OCR'd at once, one tesserocr API or pytesseract process per worker
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", os.cpu_count() or 1))
+
+# Scanned pages rendered and OCR'd per batch, bounding how many page images
+# are held at once; a few per worker so tesserocr reuses each model load
+OCR_BATCH_PAGES = int(os.getenv("OCR_BATCH_PAGES", 4 * OCR_WORKERS))
+
+# Scanned pages are rasterized in grayscale at this DPI; 200 is plenty for
+# receipt print and under half the pixels of 300
+OCR_DPI = 200
+
+# LSTM engine only, and treat each page as one block of text: skips
+# Tesseract's full page-layout analysis, which receipts don't need. The
+# tesserocr path uses the same engine and page segmentation mode.
+TESSERACT_CONFIG = os.getenv("TESSERACT_CONFIG", "--oem 1 --psm 6")
+
+
+def _compile(pattern: str):
+    """Compile with re2 when installed, else re; use inline (?i) for case"""
+    return re2.compile(pattern) if _USE_RE2 else re.compile(pattern)
+
+
+def _keyword_automaton(keyword_values):
+    """Aho-Corasick automaton over (keyword, value); a repeated keyword keeps its first value"""
+    automaton = ahocorasick.Automaton()
+    for keyword, value in keyword_values:
+        if keyword not in automaton:
+            automaton.add_word(keyword, value)
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=1024)
+def _compile_ci(pattern: str, flags: int = re.IGNORECASE):
+    """re.compile memoized on (pattern, flags), for patterns assembled per call"""
+    return re.compile(pattern, flags)
+
+
+@lru_cache(maxsize=512)
+def _label_re(labels: tuple, tail: str):
+    """
+    Case-insensitive (?:label|label…) followed by tail, memoized on the label
+    tuple so the escaping and assembly happen once per call site
+    """
+    label_re = "|".join(re.escape(l) for l in labels)
+    return re.compile(f"(?:{label_re}){tail}", re.IGNORECASE)
 
 
 class ReceiptOCR:
     """Extract structured data from receipt images/PDFs using OCR"""
     
-    def __init__(self):
-        # Common HSA providers and categories for matching
-        self.providers_keywords = [
-            'medical', 'dental', 'vision', 'pharmacy', 'hospital', 'clinic',
-            'cvs', 'walgreens', 'rite aid', 'urgent care', 'doctor', 'dr.',
-            'optometry', 'orthodontics', 'pediatrics', 'urgent care'
-        ]
-        
-        self.categories = {
-            'dental': ['dental', 'dentist', 'orthodont', 'teeth', 'braces'],
-            'vision': ['vision', 'eye', 'optometry', 'glasses', 'contacts', 'ophthalmology'],
-            'pharmacy': ['pharmacy', 'cvs', 'walgreens', 'rite aid', 'prescription', 'rx'],
-            'medical': ['medical', 'hospital', 'clinic', 'doctor', 'dr.', 'urgent care', 'emergency']
-        }
+    # Common HSA providers and categories for matching
+    providers_keywords = [
+        'medical', 'dental', 'vision', 'pharmacy', 'hospital', 'clinic',
+        'cvs', 'walgreens', 'rite aid', 'urgent care', 'doctor', 'dr.',
+        'optometry', 'orthodontics', 'pediatrics', 'urgent care'
+    ]
+    
+    categories = {
+        'dental': ['dental', 'dentist', 'orthodont', 'teeth', 'braces'],
+        'vision': ['vision', 'eye', 'optometry', 'glasses', 'contacts', 'ophthalmology'],
+        'pharmacy': ['pharmacy', 'cvs', 'walgreens', 'rite aid', 'prescription', 'rx'],
+        'medical': ['medical', 'hospital', 'clinic', 'doctor', 'dr.', 'urgent care', 'emergency']
+    }
+    
+    # Every date shape in one alternation, so one scan finds them in document
+    # order; the group that matched tells extract_dates which format to parse
+    _DATE_RE = _compile(
+        r'(\d{4}[/-]\d{1,2}[/-]\d{1,2})'     # YYYY-MM-DD
+        r'|(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})'  # MM/DD/YYYY or MM-DD-YYYY
+        r'|((?i:(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*) \d{1,2},? \d{4})'  # Month DD, YYYY
+    )
+    # $100.00 or $1,000.00 | Total: $100.00, in one scan of the text
+    _AMOUNT_RE = _compile(
+        r'\$\s*(\d+[,\d]*\.?\d{0,2})'
+        r'|(?i:total|amount|due|paid)[\s:]*\$?\s*(\d+[,\d]*\.?\d{2})'
+    )
+    if _USE_AHOCORASICK:
+        # Every category keyword -> (category position, category), found in one pass
+        _CATEGORY_AUTOMATON = _keyword_automaton(
+            (keyword, (position, category))
+            for position, (category, keywords) in enumerate(categories.items())
+            for keyword in keywords
+        )
+        # Provider keywords, any of which marks a line as the provider
+        _PROVIDER_AUTOMATON = _keyword_automaton((keyword, keyword) for keyword in providers_keywords)
     
     def extract_text(self, file_path: str) -> str:
         """Extract text from image or PDF"""
@@ -32,21 +131,112 @@ class ReceiptOCR:
         
         try:
             if ext == '.pdf':
-                # Convert PDF to images and extract text
-                images = convert_from_path(file_path, dpi=300)
-                text = ""
-                for img in images:
-                    text += pytesseract.image_to_string(img) + "\n"
+                if _USE_PYMUPDF:
+                    try:
+                        return self._extract_pdf_pymupdf(file_path)
+                    except Exception as e:
+                        # Fall back to pypdf/Poppler, which may cope with a file MuPDF rejects
+                        print(f"PyMuPDF extraction error, using pdf2image: {e}")
+                # Without PyMuPDF, still skip OCR for PDFs with a text layer
+                text = self._pdf_digital_text(file_path)
+                if len(text.strip()) >= MIN_TEXT_LAYER_CHARS:
+                    return text
+                # Convert PDF to images and extract text. pdftoppm renders
+                # pages on several threads and writes them to disk, so they
+                # are read back as they are OCR'd rather than all held in RAM
+                from pdf2image import convert_from_path
+                with tempfile.TemporaryDirectory() as tmp:
+                    images = convert_from_path(file_path, dpi=OCR_DPI, grayscale=True,
+                                               thread_count=OCR_WORKERS,
+                                               output_folder=tmp, fmt='png')
+                    text = self._ocr_pages(images)
             else:
                 # Direct image OCR
-                img = Image.open(file_path)
-                text = pytesseract.image_to_string(img)
+                from PIL import Image
+                text = self._ocr_pages([Image.open(file_path)])
             
             return text
         except Exception as e:
             print(f"OCR extraction error: {e}")
             return ""
     
+    @staticmethod
+    def _pdf_digital_text(file_path: str) -> str:
+        """The PDF's own text layer via pypdf, or "" if it can't be read"""
+        try:
+            import pypdf
+            parts = []
+            reader = pypdf.PdfReader(file_path)
+            for page in reader.pages:
+                t = page.extract_text()
+                if t:
+                    parts.append(t)
+            return "\n".join(parts)
+        except Exception:
+            return ""
+    
+    @staticmethod
+    def _extract_pdf_pymupdf(file_path: str) -> str:
+        """Use the PDF's own text layer; rasterize and OCR only scanned PDFs"""
+        with pymupdf.open(file_path) as doc:
+            text = "\n".join(page.get_text("text") for page in doc)
+            if len(text.strip()) >= MIN_TEXT_LAYER_CHARS:
+                return text
+            
+            from PIL import Image
+            parts = []
+            for start in range(0, doc.page_count, OCR_BATCH_PAGES):
+                images = []
+                for page in doc.pages(start, min(start + OCR_BATCH_PAGES, doc.page_count)):
+                    pix = page.get_pixmap(dpi=OCR_DPI, colorspace=pymupdf.csGRAY)
+                    images.append(Image.frombytes("L", (pix.width, pix.height), pix.samples))
+                parts.append(ReceiptOCR._ocr_pages(images))
+        return "".join(parts)
+    
+    @staticmethod
+    def _ocr_pages(images) -> str:
+        """
+        OCR page images, several at a time. Tesseract runs as a subprocess per
+        call (or releases the GIL under tesserocr), so threads are enough to
+        keep one Tesseract per core busy.
+        """
+        if _USE_TESSEROCR:
+            return ReceiptOCR._ocr_pages_tesserocr(images)
+        import pytesseract
+        
+        def ocr(img):
+            return pytesseract.image_to_string(img, config=TESSERACT_CONFIG)
+        
+        if len(images) <= 1:
+            return "".join(ocr(img) + "\n" for img in images)
+        with ThreadPoolExecutor(max_workers=min(len(images), OCR_WORKERS)) as pool:
+            return "".join(t + "\n" for t in pool.map(ocr, images))
+    
+    @staticmethod
+    def _ocr_pages_tesserocr(images) -> str:
+        """
+        OCR page images with tesserocr. Each worker loads the model once and
+        reads a contiguous run of pages with it, so page order is kept.
+        """
+        import tesserocr
+        
+        def ocr(run):
+            with tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.SINGLE_BLOCK,
+                                         oem=tesserocr.OEM.LSTM_ONLY) as api:
+                parts = []
+                for img in run:
+                    api.SetImage(img)
+                    parts.append(api.GetUTF8Text() + "\n")
+                return "".join(parts)
+        
+        workers = min(len(images), OCR_WORKERS)
+        if workers <= 1:
+            return ocr(images)
+        size = -(-len(images) // workers)
+        runs = [images[i:i + size] for i in range(0, len(images), size)]
+        with ThreadPoolExecutor(max_workers=len(runs)) as pool:
+            return "".join(pool.map(ocr, runs))
+    
     def extract_dates(self, text: str) -> Dict[str, Optional[str]]:
         """Extract dates from text"""
         dates = {
@@ -54,24 +244,13 @@ class ReceiptOCR:
             'paid_date': None,
         }
         
-        # Common date patterns
-        date_patterns = [
-            r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}',  # MM/DD/YYYY or MM-DD-YYYY
-            r'\d{4}[/-]\d{1,2}[/-]\d{1,2}',    # YYYY-MM-DD
-            r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2},? \d{4}',  # Month DD, YYYY
-        ]
-        
         found_dates = []
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                try:
-                    parsed_date = date_parser.parse(match, fuzzy=True)
-                    found_dates.append(parsed_date.strftime('%Y-%m-%d'))
-                except:
-                    pass
+        for m in self._DATE_RE.finditer(text):
+            parsed_date = self._parse_date(*m.groups())
+            if parsed_date:
+                found_dates.append(parsed_date.strftime('%Y-%m-%d'))
         
-        # Assign first found date as service date, second as paid date
+        # Assign the first date in the text as service date, the second as paid date
         if found_dates:
             dates['service_date'] = found_dates[0]
             if len(found_dates) > 1:
@@ -79,50 +258,68 @@ class ReceiptOCR:
         
         return dates
     
+    @staticmethod
+    def _parse_date(iso: Optional[str], numeric: Optional[str], named: Optional[str]) -> Optional[datetime]:
+        """
+        Parse one _DATE_RE match with the strptime formats for the branch that
+        matched; dateutil is only loaded for what those reject (e.g. 'Sept')
+        """
+        if iso:
+            s, formats = iso.replace('/', '-'), ('%Y-%m-%d',)
+        elif numeric:
+            s = numeric.replace('-', '/')
+            formats = ('%m/%d/%Y',) if len(s.rsplit('/', 1)[1]) == 4 else ('%m/%d/%y',)
+        else:
+            s, formats = named.replace(',', ''), ('%b %d %Y', '%B %d %Y')
+        for fmt in formats:
+            try:
+                return datetime.strptime(s, fmt)
+            except ValueError:
+                pass
+        try:
+            from dateutil import parser as date_parser
+            return date_parser.parse(s)
+        except Exception:
+            return None
+    
     def extract_amounts(self, text: str) -> Dict[str, Optional[float]]:
         """Extract monetary amounts from text"""
         amounts = {
             'amount': None,
         }
         
-        # Look for dollar amounts
-        amount_patterns = [
-            r'\$\s*(\d+[,\d]*\.?\d{0,2})',  # $100.00 or $1,000.00
-            r'(?:total|amount|due|paid)[\s:]*\$?\s*(\d+[,\d]*\.?\d{2})',  # Total: $100.00
-        ]
-        
-        found_amounts = []
-        for pattern in amount_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                try:
-                    # Remove commas and convert to float
-                    clean_amount = match.replace(',', '')
-                    amount_val = float(clean_amount)
-                    if amount_val > 0 and amount_val < 100000:  # Sanity check
-                        found_amounts.append(amount_val)
-                except:
-                    pass
+        # Look for dollar amounts; the captures are digits, commas and at most
+        # one dot, so float() cannot fail once the commas are gone
+        found_amounts = (
+            float((m.group(1) or m.group(2)).replace(',', ''))
+            for m in self._AMOUNT_RE.finditer(text)
+        )
         
-        # Take the largest amount found (usually the total)
-        if found_amounts:
-            amounts['amount'] = max(found_amounts)
+        # Take the largest sane amount found (usually the total), filtering
+        # and reducing as the matches stream in rather than listing them first
+        amounts['amount'] = max((a for a in found_amounts if 0 < a < 100000), default=None)
         
         return amounts
     
     def extract_provider(self, text: str) -> Optional[str]:
         """Extract provider/vendor name from text"""
-        lines = text.split('\n')
-        
-        # Usually the provider is in the first few lines
-        for line in lines[:5]:
+        # Usually the provider is in the first few lines; maxsplit leaves the
+        # rest of the receipt as one unsplit tail
+        for line in text.split('\n', 5)[:5]:
             line = line.strip()
-            # Look for lines with provider keywords
-            if any(keyword in line.lower() for keyword in self.providers_keywords):
-                if len(line) > 3 and len(line) < 100:
+            # Neither rule below accepts these, so don't lowercase them
+            if not 3 < len(line) < 100:
+                continue
+            # Either rule returns a substantial line, so only short or
+            # '*'-prefixed lines need the keyword scan
+            if len(line) > 5 and not line.startswith('*'):
+                return line
+            # Look for lines with provider keywords (lowercased once, not per keyword)
+            line_lower = line.lower()
+            if _USE_AHOCORASICK:
+                if next(self._PROVIDER_AUTOMATON.iter(line_lower), None):
                     return line
-            # Or just return first substantial line
-            elif len(line) > 5 and len(line) < 100 and not line.startswith('*'):
+            elif any(keyword in line_lower for keyword in self.providers_keywords):
                 return line
         
         return None
@@ -131,13 +328,24 @@ class ReceiptOCR:
         """Determine category based on keywords"""
         text_lower = text.lower()
         
+        if _USE_AHOCORASICK:
+            # Categories are checked in dict order: the earliest-listed one with
+            # any keyword wins, wherever in the text its keyword appears
+            best = None
+            for _, hit in self._CATEGORY_AUTOMATON.iter(text_lower):
+                if best is None or hit < best:
+                    best = hit
+                    if best[0] == 0:
+                        break
+            return best[1].capitalize() if best else None
+        
         for category, keywords in self.categories.items():
             if any(keyword in text_lower for keyword in keywords):
                 return category.capitalize()
         
         return None
     
-    def process_receipt(self, file_path: str) -> Dict[str, any]:
+    def process_receipt(self, file_path: str, include_raw: bool = False) -> Dict[str, any]:
         """Process receipt and extract all relevant data"""
         text = self.extract_text(file_path)
         
@@ -145,10 +353,11 @@ class ReceiptOCR:
             return {'error': 'Could not extract text from receipt'}
         
         result = {
-            'raw_text': text[:500],  # First 500 chars for debugging
             'provider': self.extract_provider(text),
             'category': self.extract_category(text),
         }
+        if include_raw:
+            result['raw_text'] = text[:500]  # First 500 chars for debugging
         
         # Extract dates
         dates = self.extract_dates(text)
@@ -181,15 +390,73 @@ class TaxOCR:
          parsing so regex patterns don't pick up the wrong copy.
     """
 
+    # What follows the labels in _amt / _date / the 1098 dollar lookups:
+    # lazy multiline span, then a money amount (3+ digits, optional commas,
+    # optional cents) / a date / a $ amount up to 250 chars on
+    _AMT_TAIL = r"[\s\S]{0,200}?([-]?\$?\s*\d{1,3}(?:,\d{3})+\.?\d{0,2}|\d{3,}\.?\d{0,2})"
+    _DATE_TAIL = r"[\s\S]{0,80}?(\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4}|\d{4}[/\-]\d{1,2}[/\-]\d{1,2})"
+    _DOLLAR_TAIL = r"[\s\S]{0,250}?\$\s*([\d,]+\.\d{2})"
+
+    # Fixed patterns, compiled once for every form
+    _SSN_RE = re.compile(r'\d{3}-\d{2}-\d{4}')
+    _EIN_RE = re.compile(r'(\d{2}-\d{7})')
+    _MONEY_RE = re.compile(r'\b\d[\d,]*\.\d{2}\b')
+    _CENTS_RE = re.compile(r'\d+\.\d{2}')
+    _AMOUNT_JUNK_RE = re.compile(r"[\$,\s]")
+    _COPY_MARKER_RES = (
+        re.compile(r"Copy\s+2\s*[—\-–]", re.IGNORECASE),
+        re.compile(r"Copy\s+C\s*[—\-–]", re.IGNORECASE),
+    )
+    _STATE_LINE_RE = re.compile(
+        r'^([A-Z]{2})\s+[\w\-]+\s+([\d,]+\.\d{2})\s+([\d,]+\.\d{2})', re.MULTILINE)
+    _ADDR_STATE_RE = re.compile(r'[,\s]\s*([A-Z]{2})\s+\d{5}')
+    _EMPLOYER_NAME_RE = re.compile(r"Employer'?s\s+name[,\s].*?\n(.{3,80})", re.IGNORECASE)
+    _EIN_LABEL_RE = re.compile(
+        r'(?:EIN|Employer.{0,25}(?:FED\s+ID|ID|number))[\s\S]{0,80}?(\d{2}\s*[\-~–—]\s*\d{7})',
+        re.IGNORECASE)
+    _EIN_SEP_RE = re.compile(r'[\s~–—]+')
+    _OCR_DOT_GAP_RE = re.compile(r'(\d)\s+\.(\d)')
+    _BOX_NUMBER_AMOUNT_RE = re.compile(r'^\d\.\d{2}$')
+    _STATE_WAGES_RE = re.compile(
+        r'(?:16\s+)?state\s+wages[^\n]*\n[\w\-\s]{0,30}?([\d,]+\.\d{2})', re.IGNORECASE)
+    _STATE_TAX_RE = re.compile(
+        r'(?:17\s+)?state\s+income\s+tax[^\n]*\n\n?([\d,]+\.\d{2})', re.IGNORECASE)
+    _LENDER_NOISE_RE = re.compile(
+        r'RECIPIENT|LENDER|PAYER|BORROWER|OMB\s+No|zip|postal'
+        r'|telephone|city\s+or|state\s+or|www\.|Copy\s+[ABC\d]'
+        r'|department\s+of|internal\s+revenue|Phone\s*:',
+        re.IGNORECASE)
+    _LENDER_PROSE_RE = re.compile(
+        r'\b(you|may|this|that|was|been|incurred|deductible|fully'
+        r'|secured|caution|amount|reimbursed|information)\b',
+        re.IGNORECASE)
+    _UPPER_START_RE = re.compile(r'^[A-Z]')
+    _TEL_LENDER_RE = re.compile(
+        r'telephone\s+no\.?\s*([A-Z][^\n@]{2,80})(?:\n|$)', re.IGNORECASE)
+    _LENDER_HDR_RE = re.compile(
+        r"RECIPIENT.{0,5}S/LENDER.{0,5}S\s+name[^\n]*\n\s*\n?(.{3,100})", re.IGNORECASE)
+    _SAME_ADDRESS_RE = re.compile(
+        r'same\s+as|box\s+is\s+checked|If\s+address|\b7\s+If\b', re.IGNORECASE)
+    _BOX7_CHECKED_RE = re.compile(r'7\s*[\[(]?[Xx✓][\])]?\s*[Ii]f\s+address')
+    # The borrower name may be inline with the label (same text line)
+    # or on a separate line — handle both with an optional name group.
+    _BORROWER_ADDR_RE = re.compile(
+        r"PAYER.{0,5}S/BORROWER.{0,5}S\s+name[^\n]*\n"
+        r"(?:[A-Z][A-Z\s,.'\-]{3,80}\n)?"  # optional separate name line
+        r"(.{5,80})\n"                      # street address
+        r"([A-Z][^\n]{3,50})",              # city / state / zip
+        re.IGNORECASE)
+
     def __init__(self):
         self._receipt_ocr = ReceiptOCR()
 
     # ── Public entry point ────────────────────────────────────────────────────
 
     def scan(self, file_path: str, form_type: str) -> dict:
-        text = self._extract(file_path)
-        if not text or not text.strip():
+        raw = self._extract(file_path)
+        if not raw or not raw.strip():
             return {"_error": "Could not extract text from file"}
+        text = self._normalize_text(raw)
 
         extractor = {
             "W2":                self._parse_w2,
@@ -207,10 +474,10 @@ class TaxOCR:
 
         try:
             result = extractor(text)
-            result["_raw_preview"] = text[:800]
+            result["_raw_preview"] = raw[:800]
             return result
         except Exception as exc:
-            return {"_error": str(exc), "_raw_preview": text[:800]}
+            return {"_error": str(exc), "_raw_preview": raw[:800]}
 
     # ── Text extraction ───────────────────────────────────────────────────────
 
@@ -221,60 +488,71 @@ class TaxOCR:
         """
         ext = os.path.splitext(file_path)[1].lower()
         if ext == ".pdf":
-            digital = self._pdf_digital_text(file_path)
+            digital = ReceiptOCR._pdf_digital_text(file_path)
             if len(digital.strip()) > 120:
                 return digital
         return self._receipt_ocr.extract_text(file_path)
 
-    @staticmethod
-    def _pdf_digital_text(file_path: str) -> str:
-        try:
-            import pypdf
-            parts = []
-            reader = pypdf.PdfReader(file_path)
-            for page in reader.pages:
-                t = page.extract_text()
-                if t:
-                    parts.append(t)
-            return "\n".join(parts)
-        except Exception:
-            return ""
-
     # ── Core helpers ──────────────────────────────────────────────────────────
 
+    @classmethod
+    def _normalize_text(cls, text: str) -> str:
+        """
+        Fix OCR glitches once for every parser: glue amounts split before
+        the decimal point ("4458 .40" → "4458.40").
+        """
+        return cls._OCR_DOT_GAP_RE.sub(r'\1.\2', text)
+
     @staticmethod
-    def _clean_w2(text: str) -> str:
+    def _first_name_line(text: str, skip_numeric: bool = True) -> str:
+        """
+        First stripped line longer than 4 chars that isn't a "Form …" header
+        (or, with skip_numeric, a line starting with a digit). Lines are cut
+        one at a time from the top, so the rest of the form is never split;
+        a trailing carriage return or form feed is removed by strip().
+        """
+        start = 0
+        while start < len(text):
+            end = text.find("\n", start)
+            if end < 0:
+                end = len(text)
+            line = text[start:end].strip()
+            if len(line) > 4 and not line.startswith("Form") and not (skip_numeric and line[:1].isdecimal()):
+                return line
+            start = end + 1
+        return ""
+
+    @classmethod
+    def _clean_w2(cls, text: str) -> str:
         """
         W-2 PDFs contain multiple copies (B, C, 2, etc.) whose text gets
         concatenated by pypdf / OCR.  Truncate at the second occurrence of the
         SSN so only the first copy is parsed.
         """
-        ssn_m = re.search(r'\d{3}-\d{2}-\d{4}', text)
+        ssn_m = cls._SSN_RE.search(text)
         if ssn_m:
             second = text.find(ssn_m.group(), ssn_m.end())
             if second > 0:
                 return text[:second]
         # Tesseract: cut at "Copy 2" / "Copy C" header
-        for marker in [r"Copy\s+2\s*[—\-–]", r"Copy\s+C\s*[—\-–]"]:
-            m = re.search(marker, text, re.IGNORECASE)
+        for marker in cls._COPY_MARKER_RES:
+            m = marker.search(text)
             if m:
                 return text[:m.start()]
         return text
 
-    @staticmethod
-    def _amt(text: str, *labels, allow_negative: bool = False) -> str:
+    @classmethod
+    def _amt(cls, text: str, *labels, allow_negative: bool = False) -> str:
         """
         Find the first dollar-style amount (≥ 3 digits before decimal) that
         appears within ~200 chars of any of the given label strings.
         Searches across newlines so it works when values appear on the next line.
         Requires at least 3 digits to avoid matching bare box numbers (1, 2, …).
         """
-        label_re = "|".join(re.escape(l) for l in labels)
-        # lazy multiline span, then a money amount (3+ digits, optional commas, optional cents)
-        pattern = rf"(?:{label_re})[\s\S]{{0,200}}?([-]?\$?\s*\d{{1,3}}(?:,\d{{3}})+\.?\d{{0,2}}|\d{{3,}}\.?\d{{0,2}})"
-        m = re.search(pattern, text, re.IGNORECASE)
+        # allow_negative only affects the value, so labels alone key the pattern
+        m = _label_re(labels, cls._AMT_TAIL).search(text)
         if m:
-            raw = re.sub(r"[\$,\s]", "", m.group(1))
+            raw = cls._AMOUNT_JUNK_RE.sub("", m.group(1))
             try:
                 val = float(raw)
                 if not allow_negative:
@@ -286,14 +564,12 @@ class TaxOCR:
 
     @staticmethod
     def _find(text: str, pattern: str, group: int = 1, flags: int = re.IGNORECASE) -> str:
-        m = re.search(pattern, text, flags)
+        m = _compile_ci(pattern, flags).search(text)
         return m.group(group).strip() if m else ""
 
-    @staticmethod
-    def _date(text: str, *labels) -> str:
-        label_re = "|".join(re.escape(l) for l in labels)
-        pattern = rf"(?:{label_re})[\s\S]{{0,80}}?(\d{{1,2}}[/\-]\d{{1,2}}[/\-]\d{{2,4}}|\d{{4}}[/\-]\d{{1,2}}[/\-]\d{{1,2}})"
-        m = re.search(pattern, text, re.IGNORECASE)
+    @classmethod
+    def _date(cls, text: str, *labels) -> str:
+        m = _label_re(labels, cls._DATE_TAIL).search(text)
         if not m:
             return ""
         raw = m.group(1)
@@ -327,7 +603,7 @@ class TaxOCR:
 
         def _amts_on_line(line: str) -> list:
             """Return all decimal amounts on a line (handles both 327968.97 and 327,968.97)."""
-            return [m.replace(",", "") for m in re.findall(r'\b\d[\d,]*\.\d{2}\b', line)]
+            return [m.replace(",", "") for m in self._MONEY_RE.findall(line)]
 
         lines = [l.strip() for l in text.splitlines() if l.strip()]
         result = {k: "" for k in [
@@ -336,48 +612,47 @@ class TaxOCR:
             "state", "state_wages", "state_withheld",
         ]}
 
+        # One forward pass: the SSN row, then an EIN within 4 lines, then the
+        # SS row (≥2 amounts) within 3 lines of it, then the Medicare row
+        # within 3 lines of that. Missing a window ends the scan.
+        expecting, last = "ssn", len(lines)
         for i, line in enumerate(lines):
-            # ── Row anchored on SSN ──────────────────────────────────────────
-            if re.match(r'\d{3}-\d{2}-\d{4}', line):
+            if i > last:
+                break
+            if expecting == "ssn":
+                if self._SSN_RE.match(line):
+                    vals = _amts_on_line(line)
+                    if len(vals) >= 2:
+                        result["wages"]           = vals[0]
+                        result["federal_withheld"]= vals[1]
+                    expecting, last = "ein", i + 4
+            elif expecting == "ein":
+                ein_m = self._EIN_RE.search(line)
+                if ein_m:
+                    result["employer_ein"] = ein_m.group(1)
+                    expecting, last = "ss", i + 3
+            else:
                 vals = _amts_on_line(line)
-                if len(vals) >= 2:
-                    result["wages"]           = vals[0]
-                    result["federal_withheld"]= vals[1]
-
-                # next few lines: look for EIN
-                for j in range(i + 1, min(i + 5, len(lines))):
-                    ein_m = re.search(r'(\d{2}-\d{7})', lines[j])
-                    if ein_m:
-                        result["employer_ein"] = ein_m.group(1)
-                        # after EIN: first line with ≥2 amounts → SS
-                        for k2 in range(j + 1, min(j + 4, len(lines))):
-                            ss_vals = _amts_on_line(lines[k2])
-                            if len(ss_vals) >= 2:
-                                result["ss_wages"]   = ss_vals[0]
-                                result["ss_withheld"]= ss_vals[1]
-                                # next line with ≥2 amounts → Medicare
-                                for m2 in range(k2 + 1, min(k2 + 4, len(lines))):
-                                    med_vals = _amts_on_line(lines[m2])
-                                    if len(med_vals) >= 2:
-                                        result["medicare_wages"]   = med_vals[0]
-                                        result["medicare_withheld"]= med_vals[1]
-                                        break
-                                break
-                        break
-                break   # found first SSN — stop outer loop
+                if len(vals) < 2:
+                    continue
+                if expecting == "ss":
+                    result["ss_wages"]   = vals[0]
+                    result["ss_withheld"]= vals[1]
+                    expecting, last = "medicare", i + 3
+                else:
+                    result["medicare_wages"]   = vals[0]
+                    result["medicare_withheld"]= vals[1]
+                    break
 
         # ── State line (pypdf): "CA  196-0988-2  336518.97  24452.56" ───────────
-        state_m = re.search(
-            r'^([A-Z]{2})\s+[\w\-]+\s+([\d,]+\.\d{2})\s+([\d,]+\.\d{2})',
-            text, re.MULTILINE,
-        )
+        state_m = self._STATE_LINE_RE.search(text)
         if state_m:
             result["state"]          = state_m.group(1)
             result["state_wages"]    = state_m.group(2).replace(",", "")
             result["state_withheld"] = state_m.group(3).replace(",", "")
         else:
             # fallback: state from address (with or without comma before state code)
-            addr_m = re.search(r'[,\s]\s*([A-Z]{2})\s+\d{5}', text)
+            addr_m = self._ADDR_STATE_RE.search(text)
             if addr_m:
                 result["state"] = addr_m.group(1)
 
@@ -385,12 +660,12 @@ class TaxOCR:
         # Guard: wages are set by the SSN positional parser only on the pypdf path.
         # On the Tesseract path wages are still empty here, so skip this block.
         if result["wages"]:
-            ein_idx = next((i for i, l in enumerate(lines) if re.match(r'\d{2}-\d{7}', l)), -1)
+            ein_idx = next((i for i, l in enumerate(lines) if self._EIN_RE.match(l)), -1)
             if ein_idx >= 0:
                 for emp_line in lines[ein_idx + 3:]:  # skip SS and Medicare rows
-                    if re.search(r'\d+\.\d{2}', emp_line):
+                    if self._CENTS_RE.search(emp_line):
                         continue  # skip lines with amounts
-                    if re.match(r'\d', emp_line):
+                    if emp_line[:1].isdecimal():
                         continue  # skip lines starting with digits
                     if len(emp_line) > 3:
                         result["issuer"] = emp_line
@@ -398,35 +673,30 @@ class TaxOCR:
 
         # ── Employer name (Tesseract path): look for label ───────────────────
         if not result["issuer"]:
-            emp_m = re.search(r"Employer'?s\s+name[,\s].*?\n(.{3,80})", text, re.IGNORECASE)
+            emp_m = self._EMPLOYER_NAME_RE.search(text)
             if emp_m:
                 name = emp_m.group(1).strip()
-                if not re.match(r'^\d', name) and len(name) > 3:
+                if not name[:1].isdecimal() and len(name) > 3:
                     result["issuer"] = name
 
         # ── EIN fallback via label (Tesseract path) ──────────────────────────
         if not result["employer_ein"]:
-            ein_m = re.search(
-                r'(?:EIN|Employer.{0,25}(?:FED\s+ID|ID|number))[\s\S]{0,80}?(\d{2}\s*[\-~–—]\s*\d{7})',
-                text, re.IGNORECASE)
+            ein_m = self._EIN_LABEL_RE.search(text)
             if ein_m:
-                result["employer_ein"] = re.sub(r'[\s~–—]+', '-', ein_m.group(1)).strip('-')
+                result["employer_ein"] = self._EIN_SEP_RE.sub('-', ein_m.group(1)).strip('-')
 
         # ── Label-based fallback for wages/withheld (Tesseract path) ─────────
         if not result["wages"]:
-            # Normalize OCR glitch "4458 .40" → "4458.40" before any matching
-            tn = re.sub(r'(\d)\s+\.(\d)', r'\1.\2', text)
-
             def _last_pair(label1: str, label2: str):
                 """Find the LAST occurrence where label1 and label2 appear on
                 the same line (or close together), followed by a line with 2+
                 amounts. Returns (val1, val2) or None."""
-                hits = list(re.finditer(
-                    rf'(?:{re.escape(label1)})[\s\S]{{0,150}}?(?:{re.escape(label2)}).*?\n(.+)',
-                    tn, re.IGNORECASE))
+                hits = list(_compile_ci(
+                    rf'(?:{re.escape(label1)})[\s\S]{{0,150}}?(?:{re.escape(label2)}).*?\n(.+)'
+                ).finditer(text))
                 for m in reversed(hits):
-                    vals = [v.replace(',', '') for v in re.findall(r'\b\d[\d,]*\.\d{2}\b', m.group(1))
-                        if not re.match(r'^\d\.\d{2}$', v.replace(',', ''))]
+                    vals = [v.replace(',', '') for v in self._MONEY_RE.findall(m.group(1))
+                        if not self._BOX_NUMBER_AMOUNT_RE.match(v.replace(',', ''))]
                     if len(vals) >= 2:
                         return vals[0], vals[1]
                 return None
@@ -435,30 +705,30 @@ class TaxOCR:
             if p:
                 result["wages"], result["federal_withheld"] = p
             else:
-                result["wages"]            = self._amt(tn, "wages, tips, other comp")
-                result["federal_withheld"] = self._amt(tn, "federal income tax withheld")
+                result["wages"]            = self._amt(text, "wages, tips, other comp")
+                result["federal_withheld"] = self._amt(text, "federal income tax withheld")
 
             p = _last_pair("social security wages", "social security tax withheld")
             if p:
                 result["ss_wages"], result["ss_withheld"] = p
             else:
-                result["ss_wages"]   = self._amt(tn, "social security wages")
-                result["ss_withheld"]= self._amt(tn, "social security tax withheld")
+                result["ss_wages"]   = self._amt(text, "social security wages")
+                result["ss_withheld"]= self._amt(text, "social security tax withheld")
 
             p = _last_pair("medicare wages", "medicare tax withheld")
             if p:
                 result["medicare_wages"], result["medicare_withheld"] = p
             else:
-                result["medicare_wages"]   = self._amt(tn, "medicare wages")
-                result["medicare_withheld"]= self._amt(tn, "medicare tax withheld")
+                result["medicare_wages"]   = self._amt(text, "medicare wages")
+                result["medicare_withheld"]= self._amt(text, "medicare tax withheld")
 
             # State for Tesseract path (different layout from pypdf)
             if not result["state_wages"]:
-                sw_m = re.search(r'(?:16\s+)?state\s+wages[^\n]*\n[\w\-\s]{0,30}?([\d,]+\.\d{2})', tn, re.IGNORECASE)
+                sw_m = self._STATE_WAGES_RE.search(text)
                 if sw_m:
                     result["state_wages"] = sw_m.group(1).replace(',', '')
             if not result["state_withheld"]:
-                st_m = re.search(r'(?:17\s+)?state\s+income\s+tax[^\n]*\n\n?([\d,]+\.\d{2})', tn, re.IGNORECASE)
+                st_m = self._STATE_TAX_RE.search(text)
                 if st_m:
                     result["state_withheld"] = st_m.group(1).replace(',', '')
 
@@ -466,12 +736,7 @@ class TaxOCR:
 
     def _parse_1099_int(self, text: str) -> dict:
         a = self._amt
-        payer = ""
-        for line in text.splitlines():
-            line = line.strip()
-            if len(line) > 4 and not line.startswith("Form") and not re.match(r'^\d', line):
-                payer = line
-                break
+        payer = self._first_name_line(text)
         return {
             "issuer":                    payer,
             "interest_income":           a(text, "interest income", "1 interest income", "box 1"),
@@ -482,12 +747,7 @@ class TaxOCR:
 
     def _parse_1098_t(self, text: str) -> dict:
         a, f = self._amt, self._find
-        institution = ""
-        for line in text.splitlines():
-            line = line.strip()
-            if len(line) > 4 and not line.startswith("Form") and not re.match(r'^\d', line):
-                institution = line
-                break
+        institution = self._first_name_line(text)
         return {
             "issuer":        institution,
             "student_name":  f(text, r"(?:student'?s?\s+name|student)[^\n]{0,10}\n(.{3,60})"),
@@ -504,33 +764,21 @@ class TaxOCR:
         # on the SAME text line as the header, right after "telephone no."
         # e.g. "...telephone no.CrossCountry Mortgage powered by RoundPoint"
         # Fallback: first non-blank line that follows the header (older layouts).
-        _lender_noise = re.compile(
-            r'RECIPIENT|LENDER|PAYER|BORROWER|OMB\s+No|zip|postal'
-            r'|telephone|city\s+or|state\s+or|www\.|Copy\s+[ABC\d]'
-            r'|department\s+of|internal\s+revenue|Phone\s*:',
-            re.IGNORECASE)
-
         def _lender_ok(s: str) -> bool:
             return (len(s) > 3
-                    and bool(re.match(r'^[A-Z]', s))
-                    and not _lender_noise.search(s)
-                    and not re.search(
-                        r'\b(you|may|this|that|was|been|incurred|deductible|fully'
-                        r'|secured|caution|amount|reimbursed|information)\b',
-                        s, re.IGNORECASE))
+                    and bool(self._UPPER_START_RE.match(s))
+                    and not self._LENDER_NOISE_RE.search(s)
+                    and not self._LENDER_PROSE_RE.search(s))
 
         lender = ""
         # Primary: lender name appears inline right after "telephone no."
-        tel_m = re.search(
-            r'telephone\s+no\.?\s*([A-Z][^\n@]{2,80})(?:\n|$)', text, re.IGNORECASE)
+        tel_m = self._TEL_LENDER_RE.search(text)
         if tel_m and _lender_ok(tel_m.group(1).strip()):
             lender = tel_m.group(1).strip()
 
         if not lender:
             # Fallback: first non-blank line after RECIPIENT'S/LENDER'S name label
-            lender_hdr = re.search(
-                r"RECIPIENT.{0,5}S/LENDER.{0,5}S\s+name[^\n]*\n\s*\n?(.{3,100})",
-                text, re.IGNORECASE)
+            lender_hdr = self._LENDER_HDR_RE.search(text)
             if lender_hdr:
                 candidate = lender_hdr.group(1).strip()
                 if _lender_ok(candidate):
@@ -540,10 +788,7 @@ class TaxOCR:
             """Find a $ amount after a label — span widened to 250 chars to cross
             blank lines between the box label and its value."""
             for label in labels:
-                m = re.search(
-                    rf'(?:{re.escape(label)})[\s\S]{{0,250}}?\$\s*([\d,]+\.\d{{2}})',
-                    text, re.IGNORECASE,
-                )
+                m = _label_re((label,), self._DOLLAR_TAIL).search(text)
                 if m:
                     return m.group(1).replace(',', '')
             return ""
@@ -571,20 +816,12 @@ class TaxOCR:
         }
 
         # Box 7 checked → property address is same as borrower's — fill it in
-        if not result["property_address"] or re.search(
-                r'same\s+as|box\s+is\s+checked|If\s+address|\b7\s+If\b',
-                result["property_address"], re.IGNORECASE):
+        if not result["property_address"] or self._SAME_ADDRESS_RE.search(
+                result["property_address"]):
             result["property_address"] = ""
-            box7_m = re.search(r'7\s*[\[(]?[Xx✓][\])]?\s*[Ii]f\s+address', text)
+            box7_m = self._BOX7_CHECKED_RE.search(text)
             if box7_m:
-                # The borrower name may be inline with the label (same text line)
-                # or on a separate line — handle both with an optional name group.
-                baddr = re.search(
-                    r"PAYER.{0,5}S/BORROWER.{0,5}S\s+name[^\n]*\n"
-                    r"(?:[A-Z][A-Z\s,.'\-]{3,80}\n)?"  # optional separate name line
-                    r"(.{5,80})\n"                      # street address
-                    r"([A-Z][^\n]{3,50})",              # city / state / zip
-                    text, re.IGNORECASE)
+                baddr = self._BORROWER_ADDR_RE.search(text)
                 if baddr:
                     result["property_address"] = (
                         baddr.group(1).strip() + ", " + baddr.group(2).strip())
@@ -595,11 +832,7 @@ class TaxOCR:
         a, d, f = self._amt, self._date, self._find
         company = f(text, r"(?:corporation|company|employer)[^\n]{0,15}\n(.{3,80})")
         if not company:
-            for line in text.splitlines():
-                line = line.strip()
-                if len(line) > 4 and not line.startswith("Form") and not re.match(r'^\d', line):
-                    company = line
-                    break
+            company = self._first_name_line(text)
         return {
             "issuer":               company,
             "company_name":         company,
@@ -613,12 +846,7 @@ class TaxOCR:
 
     def _parse_1099_consolidated(self, text: str) -> dict:
         a, f = self._amt, self._find
-        broker = ""
-        for line in text.splitlines():
-            line = line.strip()
-            if len(line) > 4 and not line.startswith("Form") and not re.match(r'^\d', line):
-                broker = line
-                break
+        broker = self._first_name_line(text)
         return {
             "issuer":              broker,
             "account_last4":       f(text, r"(?:account|acct)[\s\S]{0,30}?(?:x+|[*]+)?(\d{4})\b"),
@@ -635,12 +863,7 @@ class TaxOCR:
     def _parse_1099_r(self, text: str) -> dict:
         a, f = self._amt, self._find
         # payer name is typically the first non-empty line
-        payer = ""
-        for line in text.splitlines():
-            line = line.strip()
-            if len(line) > 4 and not line.startswith("Form"):
-                payer = line
-                break
+        payer = self._first_name_line(text, skip_numeric=False)
         return {
             "issuer":              payer,
             "gross_distribution":  a(text, "gross distribution", "1 gross"),
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
 
 from ..database import get_db, Base, engine
 from ..models import User
 from ..schemas import UserCreate
 from ..auth import get_password_hash, verify_password, create_access_token, set_auth_cookie, clear_auth_cookie
+from ..auth import login_throttled, record_login_failure
 
 # Ensure tables exist
 Base.metadata.create_all(bind=engine)
@@ -25,9 +26,13 @@ def register(payload: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login")
-def login(payload: UserCreate, response: Response, db: Session = Depends(get_db)):
+def login(payload: UserCreate, request: Request, response: Response, db: Session = Depends(get_db)):
+    client_ip = request.client.host if request.client else ""
+    if login_throttled(client_ip):
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Too many failed attempts")
     user = db.query(User).filter(User.username == payload.username).first()
     if not user or not verify_password(payload.password, user.hashed_password):
+        record_login_failure(client_ip)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     token = create_access_token({"sub": user.username})
     set_auth_cookie(response, token)
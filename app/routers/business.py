@@ -4,6 +4,7 @@ Supports Wave's standard transaction CSV export format.
 """
 import csv
 import json
+import time
 import uuid
 from collections import defaultdict
 from datetime import date
@@ -19,7 +20,7 @@ from sqlalchemy.orm import Session
 import os
 
 from ..database import get_db
-from ..auth import get_current_user
+from ..auth import get_current_user, get_current_user_html
 from ..models import BusinessTransaction
 
 router = APIRouter(prefix="/business", tags=["business"])
@@ -30,6 +31,8 @@ jinja_env = Environment(
     autoescape=select_autoescape(["html", "xml"]),
 )
 
+_ZERO = Decimal("0")
+
 # ── Schedule C line mapping ────────────────────────────────────────────────────
 # Maps lowercase Wave category keywords → (line_number, display_label)
 # Meals are 50% deductible — flagged in UI.
@@ -257,7 +260,7 @@ def _parse_wave_csv(content: str, tax_year: int) -> list[dict]:
         def _to_dec(s: str) -> Decimal:
             s = s.replace("$", "").replace(",", "").strip()
             if not s:
-                return Decimal("0")
+                return _ZERO
             return Decimal(s)
 
         if debit_str or credit_str:
@@ -290,20 +293,20 @@ def _parse_wave_csv(content: str, tax_year: int) -> list[dict]:
 
 def _schedule_c_summary(rows: list[BusinessTransaction]) -> dict:
     """Aggregate transactions into Schedule C line totals."""
-    income = Decimal("0")
+    income = _ZERO
     expenses: dict[str, dict] = {}     # line → {label, amount}
 
     for r in rows:
-        amt = abs(Decimal(str(r.amount)))
+        amt = abs(r.amount)  # Numeric column: already a Decimal
         if r.is_income:
             income += amt
         else:
             key = r.schedule_c_line or "48"
             if key not in expenses:
-                expenses[key] = {"label": r.schedule_c_label or "Other Expenses", "amount": Decimal("0")}
+                expenses[key] = {"label": r.schedule_c_label or "Other Expenses", "amount": _ZERO}
             expenses[key]["amount"] += amt
 
-    total_expenses = sum(v["amount"] for v in expenses.values())
+    total_expenses = sum((v["amount"] for v in expenses.values()), _ZERO)
     net_profit = income - total_expenses
 
     # Sort by line number (treat letters as decimal: 16a < 16b < 17)
@@ -321,9 +324,9 @@ def _schedule_c_summary(rows: list[BusinessTransaction]) -> dict:
         if "deductible" not in sorted_expenses[k]:
             sorted_expenses[k]["deductible"] = sorted_expenses[k]["amount"]
 
-    deductible_expenses = sum(v["deductible"] for v in sorted_expenses.values())
+    deductible_expenses = sum((v["deductible"] for v in sorted_expenses.values()), _ZERO)
     net_profit_after_meals = income - deductible_expenses
-    se_tax = max(net_profit_after_meals, Decimal("0")) * Decimal("0.9235") * Decimal("0.153")
+    se_tax = max(net_profit_after_meals, _ZERO) * Decimal("0.9235") * Decimal("0.153")
 
     return {
         "gross_income":         income,
@@ -343,7 +346,7 @@ async def business_page(
     request: Request,
     year: int = 2025,
     db: Session = Depends(get_db),
-    user=Depends(get_current_user),
+    user=Depends(get_current_user_html),
 ):
     rows = (
         db.query(BusinessTransaction)
@@ -379,6 +382,17 @@ async def business_page(
     ))
 
 
+def new_batch_id() -> uuid.UUID:
+    """
+    UUIDv7: 48-bit Unix-ms timestamp then random bits, so batch ids sort by
+    import time and a batch's rows stay together in the index
+    """
+    value = (int(time.time() * 1000) << 80) | int.from_bytes(os.urandom(10), "big")
+    value &= ~(0xF << 76) & ~(0x3 << 62)
+    value |= (0x7 << 76) | (0x2 << 62)  # version 7, RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
 @router.post("/import-wave")
 async def import_wave(
     request: Request,
@@ -405,7 +419,7 @@ async def import_wave(
                                    "For P&L: set the report period to Jan 1–Dec 31 and export. "
                                    "For Transactions: filter to the same date range.")
 
-    batch_id = str(uuid.uuid4())
+    batch_id = new_batch_id()
 
     if replace:
         db.query(BusinessTransaction).filter(
@@ -413,13 +427,10 @@ async def import_wave(
             BusinessTransaction.tax_year == year,
         ).delete()
 
-    for p in parsed:
-        db.add(BusinessTransaction(
-            user_id=user.id,
-            tax_year=year,
-            import_batch=batch_id,
-            **p,
-        ))
+    BusinessTransaction.bulk_insert(db, [
+        {"user_id": user.id, "tax_year": year, "import_batch": batch_id, **p}
+        for p in parsed
+    ])
 
     db.commit()
     return RedirectResponse(url=f"/business?year={year}", status_code=303)
@@ -5,12 +5,12 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload, raiseload, lazyload
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 from ..database import get_db
 from ..models import MortgageAccount, MortgageStatement
-from ..auth import get_current_user
+from ..auth import get_current_user, get_current_user_html
 from ..mortgage_parser import parse_mortgage_pdf
 
 router = APIRouter(prefix="/mortgage", tags=["mortgage"])
@@ -34,7 +34,7 @@ def _render(template_name: str, **ctx) -> HTMLResponse:
 
 @router.get("", response_class=HTMLResponse)
 async def mortgage_dashboard(request: Request, db: Session = Depends(get_db),
-                              user=Depends(get_current_user)):
+                              user=Depends(get_current_user_html)):
     mortgages = db.query(MortgageAccount).filter(
         MortgageAccount.user_id == user.id
     ).all()
@@ -110,7 +110,7 @@ async def upload_statement(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    m = db.query(MortgageAccount).filter(
+    m = db.query(MortgageAccount).options(lazyload(MortgageAccount.statements)).filter(
         MortgageAccount.id == mortgage_id,
         MortgageAccount.user_id == user.id
     ).first()
@@ -126,7 +126,7 @@ async def upload_statement(
         shutil.copyfileobj(file.file, f)
 
     try:
-        parsed = parse_mortgage_pdf(tmp_path)
+        parsed = parse_mortgage_pdf(tmp_path, include_raw=True)
     finally:
         os.remove(tmp_path)
 
@@ -182,12 +182,14 @@ async def mortgage_summary(
     user=Depends(get_current_user),
 ):
     """Return all mortgage accounts with their latest statement data for the dashboard."""
-    mortgages = db.query(MortgageAccount).filter(
+    mortgages = db.query(MortgageAccount).options(
+        selectinload(MortgageAccount.statements), raiseload("*")
+    ).filter(
         MortgageAccount.user_id == user.id
     ).all()
     result = []
     for m in mortgages:
-        latest = m.statements[0] if m.statements else None
+        latest = m.latest_statement
         result.append({
             "id": m.id,
             "servicer_name": m.servicer_name,
@@ -239,7 +241,6 @@ async def parse_preview(
     finally:
         os.remove(tmp_path)
 
-    parsed.pop("raw_text", None)
     # Convert dates to strings for JSON
     for k, v in parsed.items():
         if hasattr(v, "isoformat"):
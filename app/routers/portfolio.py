@@ -1,30 +1,33 @@
+import asyncio
 import os
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 import csv
 import io
 import logging
 import re
-import yfinance as yf
-import plaid
 from typing import Dict, List
 
 from ..database import get_db
 from ..models import PortfolioAccount, Holding, BankTransaction, BrokerCredential, PlaidItem
 from ..auth import get_current_user
-from ..fidelity_scraper import FidelityScraper
 from ..crypto_utils import CredentialEncryptor
 from ..csv_parser import CSVParser
-from ..plaid_client import get_plaid_client
 
 router = APIRouter(prefix="/portfolio", tags=["portfolio"])
 logger = logging.getLogger(__name__)
 
 
+def get_plaid_client():
+    # The generated Plaid SDK takes ~0.3s to import; defer it to the first Plaid call
+    from ..plaid_client import get_plaid_client as _get_plaid_client
+    return _get_plaid_client()
+
+
 @router.get("/summary")
 def get_portfolio_summary(db: Session = Depends(get_db), user=Depends(get_current_user)):
     """Get overall portfolio summary"""
@@ -73,13 +76,12 @@ def get_portfolio_summary(db: Session = Depends(get_db), user=Depends(get_curren
     # For backward compat keep bank_accounts as checking+savings combined
     bank_accounts = checking_accounts + savings_accounts
     
-    # Get total holdings count
-    holdings_count = db.query(func.count(Holding.id)).filter(Holding.user_id == user.id).scalar()
-    
-    # Get recent transactions count
-    recent_txns = db.query(func.count(BankTransaction.id)).filter(
-        BankTransaction.user_id == user.id
-    ).scalar()
+    # Holdings and transactions counts in one round trip; both are answered
+    # from the (user_id, ...) indexes without touching the table rows
+    holdings_count, recent_txns = db.query(
+        select(func.count(Holding.id)).where(Holding.user_id == user.id).scalar_subquery(),
+        select(func.count(BankTransaction.id)).where(BankTransaction.user_id == user.id).scalar_subquery(),
+    ).one()
     
     net_worth = total_investments + total_cash - total_credit_debt
     
@@ -102,15 +104,22 @@ def get_portfolio_summary(db: Session = Depends(get_db), user=Depends(get_curren
 def get_holdings(db: Session = Depends(get_db), user=Depends(get_current_user)):
     """Get all investment holdings"""
     
-    holdings = db.query(Holding).filter(Holding.user_id == user.id).all()
+    # Only the listed columns, as rows: no mapped objects to build
+    holdings = db.query(
+        Holding.id, Holding.symbol, Holding.name, Holding.quantity, Holding.cost_basis,
+        Holding.current_price, Holding.current_value, Holding.asset_type, Holding.snapshot_date,
+        PortfolioAccount.institution, PortfolioAccount.account_name, PortfolioAccount.account_number_last4,
+    ).join(PortfolioAccount, Holding.account_id == PortfolioAccount.id).filter(
+        Holding.user_id == user.id
+    ).all()
     
     result = []
     for h in holdings:
         result.append({
             'id': h.id,
-            'institution': h.account.institution,
-            'account': h.account.account_name or h.account.institution,
-            'account_number_last4': h.account.account_number_last4,
+            'institution': h.institution,
+            'account': h.account_name or h.institution,
+            'account_number_last4': h.account_number_last4,
             'symbol': h.symbol,
             'name': h.name,
             'quantity': float(h.quantity),
@@ -129,7 +138,11 @@ def get_holdings(db: Session = Depends(get_db), user=Depends(get_current_user)):
 def get_transactions(limit: int = 100, db: Session = Depends(get_db), user=Depends(get_current_user)):
     """Get recent bank transactions"""
     
-    txns = db.query(BankTransaction).filter(
+    txns = db.query(
+        BankTransaction.id, BankTransaction.transaction_date, BankTransaction.description,
+        BankTransaction.amount, BankTransaction.category, BankTransaction.transaction_type,
+        BankTransaction.balance_after, PortfolioAccount.account_name, PortfolioAccount.institution,
+    ).join(PortfolioAccount, BankTransaction.account_id == PortfolioAccount.id).filter(
         BankTransaction.user_id == user.id
     ).order_by(BankTransaction.transaction_date.desc()).limit(limit).all()
     
@@ -137,7 +150,7 @@ def get_transactions(limit: int = 100, db: Session = Depends(get_db), user=Depen
     for t in txns:
         result.append({
             'id': t.id,
-            'account': t.account.account_name or t.account.institution,
+            'account': t.account_name or t.institution,
             'date': t.transaction_date.isoformat(),
             'description': t.description,
             'amount': float(t.amount),
@@ -1082,8 +1095,9 @@ async def upload_transactions_csv(
     csv_data = io.StringIO(content.decode('utf-8'))
     reader = csv.DictReader(csv_data)
     
-    imported_count = 0
     skipped_count = 0
+    rows = {}  # import_id -> row
+    seen = {}  # base import_id -> rows so far in this file
     
     for row in reader:
         # Parse date
@@ -1104,30 +1118,26 @@ async def upload_transactions_csv(
         amount = Decimal(amount_str.replace('$', '').replace(',', '').strip())
         
         # Create unique import ID to prevent duplicates
-        import_id = f"{account_id}_{date_str}_{amount}_{row.get('Description', '')[:50]}"
-        
-        # Check if already imported
-        existing = db.query(BankTransaction).filter(
-            BankTransaction.import_id == import_id
-        ).first()
-        
-        if existing:
-            skipped_count += 1
-            continue
-        
-        transaction = BankTransaction(
-            user_id=user.id,
-            account_id=account_id,
-            transaction_date=txn_date,
-            description=row.get('Description') or row.get('DESCRIPTION') or '',
-            amount=amount,
-            transaction_type=row.get('Type') or row.get('Transaction Type'),
-            balance_after=Decimal(str(row.get('Balance') or 0)) if row.get('Balance') else None,
-            import_id=import_id
-        )
-        db.add(transaction)
-        imported_count += 1
+        import_id = file_import_id(
+            f"{account_id}_{date_str}_{amount}_{row.get('Description', '')[:50]}", seen)
+        
+        rows[import_id] = {
+            'user_id': user.id,
+            'account_id': account_id,
+            'transaction_date': txn_date,
+            'description': row.get('Description') or row.get('DESCRIPTION') or '',
+            'amount': amount,
+            'transaction_type': row.get('Type') or row.get('Transaction Type'),
+            'balance_after': Decimal(str(row.get('Balance') or 0)) if row.get('Balance') else None,
+            'import_id': import_id
+        }
     
+    # Skip rows imported before, then insert the rest in one multi-row INSERT
+    existing = BankTransaction.existing_import_ids(db, user.id, rows)
+    skipped_count += len(existing)
+    imported_count = BankTransaction.bulk_insert(
+        db, [r for import_id, r in rows.items() if import_id not in existing]
+    )
     db.commit()
     
     return {'imported': imported_count, 'skipped': skipped_count}
@@ -1153,6 +1163,8 @@ async def sync_prices(db: Session = Depends(get_db), user=Depends(get_current_us
     
     # Batch fetch prices
     try:
+        # yfinance pulls in pandas/numpy (~1s); import it on first price sync, not at startup
+        import yfinance as yf
         # Create ticker objects
         tickers = yf.Tickers(' '.join(symbols))
         
@@ -1228,6 +1240,7 @@ async def get_espp_grants(db: Session = Depends(get_db), user=Depends(get_curren
     live_prices = {}
     if symbols:
         try:
+            import yfinance as yf
             tickers = yf.Tickers(' '.join(symbols))
             for sym in symbols:
                 ticker = tickers.tickers.get(sym)
@@ -1284,6 +1297,7 @@ async def get_rsu_grants(db: Session = Depends(get_db), user=Depends(get_current
     live_prices = {}
     if symbols:
         try:
+            import yfinance as yf
             tickers = yf.Tickers(' '.join(symbols))
             for sym in symbols:
                 ticker = tickers.tickers.get(sym)
@@ -1655,28 +1669,25 @@ async def bulk_upload_files(
                 db.flush()
                 results['summary']['accounts_updated'] += 1
             
-            # Import transactions
-            transactions_added = 0
+            # Import transactions, skipping duplicates
+            new_rows = {}
+            seen = {}
             for txn in parsed['transactions']:
-                # Check for duplicates
-                import_id = f"{filename}_{txn['date']}_{txn['amount']}"
-                existing = db.query(BankTransaction).filter(
-                    BankTransaction.import_id == import_id
-                ).first()
-                
-                if not existing:
-                    bank_txn = BankTransaction(
-                        user_id=user.id,
-                        account_id=account.id,
-                        transaction_date=txn['date'],
-                        description=txn['description'],
-                        amount=txn['amount'],
-                        transaction_type=txn.get('transaction_type'),
-                        balance_after=txn.get('balance'),
-                        import_id=import_id
-                    )
-                    db.add(bank_txn)
-                    transactions_added += 1
+                import_id = file_import_id(f"{filename}_{txn['date']}_{txn['amount']}", seen)
+                new_rows[import_id] = {
+                    'user_id': user.id,
+                    'account_id': account.id,
+                    'transaction_date': txn['date'],
+                    'description': txn['description'],
+                    'amount': txn['amount'],
+                    'transaction_type': txn.get('transaction_type'),
+                    'balance_after': txn.get('balance'),
+                    'import_id': import_id
+                }
+            existing = BankTransaction.existing_import_ids(db, user.id, new_rows)
+            transactions_added = BankTransaction.bulk_insert(
+                db, [r for import_id, r in new_rows.items() if import_id not in existing]
+            )
             
             # Update account balance from parsed data
             if parsed['account_balances']:
@@ -1785,6 +1796,18 @@ def guess_account_type(filename: str, parsed_data: dict) -> str:
         return 'checking'
 
 
+def file_import_id(base: str, seen: dict) -> str:
+    """
+    import_id for one row of an uploaded file. Two real transactions can share
+    a date and amount (two $4.50 coffees), so the nth row with the same base
+    id gets a "#n" suffix; the first keeps the bare id used by earlier imports,
+    and re-uploading the file yields the same ids again.
+    """
+    n = seen.get(base, 0) + 1
+    seen[base] = n
+    return base if n == 1 else f"{base}#{n}"
+
+
 # ==================== Plaid Integration ====================
 
 @router.post("/plaid/create-link-token")
@@ -1881,6 +1904,12 @@ async def list_plaid_items(db: Session = Depends(get_db), user=Depends(get_curre
     } for item in items]
 
 
+def _fetch_plaid_item(plaid_client, access_token: str, start_date: datetime, end_date: datetime):
+    """Blocking Plaid calls for one item: (accounts, transactions)"""
+    return (plaid_client.get_accounts(access_token),
+            plaid_client.get_transactions(access_token, start_date, end_date))
+
+
 @router.post("/plaid/sync/all")
 async def sync_all_plaid_items(db: Session = Depends(get_db), user=Depends(get_current_user)):
     """Sync all connected Plaid items at once"""
@@ -1892,19 +1921,38 @@ async def sync_all_plaid_items(db: Session = Depends(get_db), user=Depends(get_c
     if not items:
         return {'synced': 0, 'message': 'No connected Plaid items found'}
 
+    # Sync transactions (last 30 days)
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=30)
+
+    # Plaid round-trips dominate; fetch every item at once on worker threads so
+    # the sync takes the slowest item's latency rather than the sum of them
+    fetched = []
+    try:
+        plaid_client = get_plaid_client()
+        fetched = await asyncio.gather(
+            *(asyncio.to_thread(_fetch_plaid_item, plaid_client, item.access_token, start_date, end_date)
+              for item in items),
+            return_exceptions=True
+        )
+    except Exception as e:
+        fetched = [e] * len(items)
+
     results = []
-    for item in items:
+    for item, data in zip(items, fetched):
         try:
-            # Reuse the per-item sync logic inline
-            plaid_client = get_plaid_client()
-            accounts_data = plaid_client.get_accounts(item.access_token)
+            if isinstance(data, Exception):
+                raise data
+            accounts_data, transactions_data = data
+            accounts = {
+                a.account_number_last4: a for a in db.query(PortfolioAccount).filter(
+                    PortfolioAccount.user_id == user.id,
+                    PortfolioAccount.institution == item.institution_name
+                )
+            }
             accounts_synced = 0
             for acc in accounts_data['accounts']:
-                account = db.query(PortfolioAccount).filter(
-                    PortfolioAccount.user_id == user.id,
-                    PortfolioAccount.institution == item.institution_name,
-                    PortfolioAccount.account_number_last4 == acc['mask']
-                ).first()
+                account = accounts.get(acc['mask'])
                 if account:
                     acc_type = acc['type'].lower()
                     if acc_type == 'credit':
@@ -1915,45 +1963,35 @@ async def sync_all_plaid_items(db: Session = Depends(get_db), user=Depends(get_c
                     account.last_synced = datetime.now()
                     accounts_synced += 1
 
-            # Sync transactions (last 30 days)
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=30)
             plaid_account_map = {a['account_id']: a['mask'] for a in accounts_data['accounts']}
-            transactions_added = 0
-            transactions_data = plaid_client.get_transactions(item.access_token, start_date, end_date)
+            new_rows = {}
             for txn in transactions_data.get('transactions', []):
-                mask = plaid_account_map.get(txn['account_id'])
-                if not mask:
-                    continue
-                account = db.query(PortfolioAccount).filter(
-                    PortfolioAccount.user_id == user.id,
-                    PortfolioAccount.institution == item.institution_name,
-                    PortfolioAccount.account_number_last4 == mask
-                ).first()
+                account = accounts.get(plaid_account_map.get(txn['account_id']))
                 if account:
                     import_id = f"plaid_{txn['transaction_id']}"
-                    existing = db.query(BankTransaction).filter(BankTransaction.import_id == import_id).first()
-                    if not existing:
-                        txn_date = txn['date']
-                        if isinstance(txn_date, str):
-                            txn_date = datetime.strptime(txn_date, '%Y-%m-%d').date()
-                        bt = BankTransaction(
-                            user_id=user.id,
-                            account_id=account.id,
-                            import_id=import_id,
-                            transaction_date=txn_date,
-                            description=txn.get('name', ''),
-                            amount=Decimal(str(-txn['amount'])),
-                            transaction_type=txn.get('category', [None])[0] if txn.get('category') else None,
-                            category=txn.get('personal_finance_category', {}).get('primary') if txn.get('personal_finance_category') else (txn.get('category', [''])[0] if txn.get('category') else ''),
-                        )
-                        db.add(bt)
-                        transactions_added += 1
+                    txn_date = txn['date']
+                    if isinstance(txn_date, str):
+                        txn_date = datetime.strptime(txn_date, '%Y-%m-%d').date()
+                    new_rows.setdefault(import_id, {
+                        'user_id': user.id,
+                        'account_id': account.id,
+                        'import_id': import_id,
+                        'transaction_date': txn_date,
+                        'description': txn.get('name', ''),
+                        'amount': Decimal(str(-txn['amount'])),
+                        'transaction_type': txn.get('category', [None])[0] if txn.get('category') else None,
+                        'category': txn.get('personal_finance_category', {}).get('primary') if txn.get('personal_finance_category') else (txn.get('category', [''])[0] if txn.get('category') else ''),
+                    })
+            existing = BankTransaction.existing_import_ids(db, user.id, new_rows)
+            transactions_added = BankTransaction.bulk_insert(
+                db, [r for import_id, r in new_rows.items() if import_id not in existing]
+            )
 
             item.last_synced = datetime.now()
             db.commit()
             results.append({'institution': item.institution_name, 'accounts': accounts_synced, 'transactions': transactions_added})
         except Exception as e:
+            db.rollback()
             logger.error(f"Error syncing Plaid item {item.id}: {e}")
             results.append({'institution': item.institution_name, 'error': str(e)})
 
@@ -1963,6 +2001,7 @@ async def sync_all_plaid_items(db: Session = Depends(get_db), user=Depends(get_c
 @router.post("/plaid/sync/{item_id}")
 async def sync_plaid_item(item_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
     """Sync data from a Plaid item"""
+    import plaid
     plaid_item = db.query(PlaidItem).filter(
         PlaidItem.id == item_id,
         PlaidItem.user_id == user.id,
@@ -2090,6 +2129,7 @@ async def sync_plaid_item(item_id: int, db: Session = Depends(get_db), user=Depe
                     # Check for duplicate
                     import_id = f"plaid_{txn['transaction_id']}"
                     existing = db.query(BankTransaction).filter(
+                        BankTransaction.user_id == user.id,
                         BankTransaction.import_id == import_id
                     ).first()
                     
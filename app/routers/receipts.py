@@ -7,12 +7,12 @@ from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
 from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, StreamingResponse
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, selectinload, raiseload
 
 from ..database import get_db, Base, engine
 from ..models import Receipt, ReceiptFile
 from ..schemas import ReceiptCreate, ReceiptRead
-from ..auth import get_current_user
+from ..auth import get_current_user, get_current_user_html
 from ..ocr_processor import ReceiptOCR
 from ..pdf_merger import merge_files_to_pdf
 
@@ -29,7 +29,7 @@ os.makedirs(UPLOAD_DIR, exist_ok=True)
 def list_receipts(db: Session = Depends(get_db), user=Depends(get_current_user)):
     rows = (
         db.query(Receipt)
-        .options(joinedload(Receipt.files))
+        .options(selectinload(Receipt.files), raiseload("*"))
         .filter(Receipt.user_id == user.id)
         .order_by(Receipt.uploaded_at.desc())
         .all()
@@ -38,7 +38,7 @@ def list_receipts(db: Session = Depends(get_db), user=Depends(get_current_user))
 
 
 @router.get("/export/csv")
-def export_csv(db: Session = Depends(get_db), user=Depends(get_current_user)):
+def export_csv(db: Session = Depends(get_db), user=Depends(get_current_user_html)):
     receipts = (
         db.query(Receipt)
         .filter(Receipt.user_id == user.id)
@@ -326,7 +326,7 @@ async def scan_receipt(
 
 
 @router.get("/files/{file_id}")
-def download_file_by_id(file_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
+def download_file_by_id(file_id: int, db: Session = Depends(get_db), user=Depends(get_current_user_html)):
     """View or download a file by its ID directly"""
     receipt_file = db.query(ReceiptFile).filter(ReceiptFile.id == file_id).first()
     if not receipt_file:
@@ -347,7 +347,7 @@ def download_file_by_id(file_id: int, db: Session = Depends(get_db), user=Depend
 
 
 @router.get("/{receipt_id}/file")
-def download_receipt(receipt_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
+def download_receipt(receipt_id: int, db: Session = Depends(get_db), user=Depends(get_current_user_html)):
     """Download first file of a receipt (for backward compatibility)"""
     rec = db.query(Receipt).filter(Receipt.id == receipt_id, Receipt.user_id == user.id).first()
     if not rec:
@@ -371,7 +371,7 @@ def download_receipt_file(
     receipt_id: int, 
     file_id: int, 
     db: Session = Depends(get_db), 
-    user=Depends(get_current_user)
+    user=Depends(get_current_user_html)
 ):
     """Download a specific file from a receipt"""
     rec = db.query(Receipt).filter(Receipt.id == receipt_id, Receipt.user_id == user.id).first()
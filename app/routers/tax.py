@@ -8,12 +8,12 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse, JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 from ..database import get_db
-from ..models import TaxDocument
-from ..auth import get_current_user
+from ..models import TaxDocument, TAX_FORM_TYPES, TAX_DOC_STATUSES, BIG_BLOBS
+from ..auth import get_current_user, get_current_user_html
 from ..ocr_processor import TaxOCR
 
 router = APIRouter(prefix="/tax", tags=["tax"])
@@ -139,10 +139,7 @@ def _compute_summary(docs: list) -> dict:
             return 0.0
 
     for doc in docs:
-        try:
-            d = json.loads(doc.extracted_data) if doc.extracted_data else {}
-        except Exception:
-            d = {}
+        d = doc.extracted_data or {}
 
         ft = doc.form_type
         if ft == "W2":
@@ -188,6 +185,14 @@ def _render(template_name: str, **ctx) -> HTMLResponse:
     return HTMLResponse(t.render(**ctx))
 
 
+def _check_choices(form_type: Optional[str] = None, status: Optional[str] = None):
+    """Reject values the form_type / status enum columns can't store"""
+    if form_type is not None and form_type not in TAX_FORM_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unknown form type: {form_type}")
+    if status is not None and status not in TAX_DOC_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Unknown status: {status}")
+
+
 async def _save_upload(file: UploadFile, user_id: int) -> tuple:
     """Save uploaded file; return (file_name, original_name, content_type)."""
     ext = os.path.splitext(file.filename)[1]
@@ -207,10 +212,16 @@ async def tax_dashboard(
     request: Request,
     year: Optional[int] = None,
     db: Session = Depends(get_db),
-    user=Depends(get_current_user),
+    user=Depends(get_current_user_html),
 ):
-    all_docs = db.query(TaxDocument).filter(TaxDocument.user_id == user.id).all()
-    available_years = sorted({d.tax_year for d in all_docs}, reverse=True)
+    # Distinct years come from the (user_id, tax_year) index alone; only the
+    # selected year's documents are loaded below
+    available_years = [
+        y for (y,) in db.query(TaxDocument.tax_year)
+        .filter(TaxDocument.user_id == user.id)
+        .distinct()
+        .order_by(TaxDocument.tax_year.desc())
+    ]
 
     current_year = datetime.now().year
     default_year = available_years[0] if available_years else current_year - 1
@@ -223,14 +234,14 @@ async def tax_dashboard(
         reverse=True,
     )
 
-    docs_for_year = [d for d in all_docs if d.tax_year == year]
+    docs_for_year = db.query(TaxDocument).options(undefer_group(BIG_BLOBS)).filter(
+        TaxDocument.user_id == user.id,
+        TaxDocument.tax_year == year,
+    ).all()
 
     docs_with_data = []
     for doc in sorted(docs_for_year, key=lambda d: d.form_type):
-        try:
-            ed = json.loads(doc.extracted_data) if doc.extracted_data else {}
-        except Exception:
-            ed = {}
+        ed = doc.extracted_data or {}
         kf_label, kf_value = _key_figure(doc.form_type, ed)
         docs_with_data.append({
             "doc": doc,
@@ -289,6 +300,7 @@ async def add_tax_document(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
+    _check_choices(form_type, status)
     form_data = await request.form()
     extracted = {
         k: str(form_data[f"ed_{k}"]).strip()
@@ -318,7 +330,7 @@ async def add_tax_document(
         description=description or None,
         status=status,
         notes=notes or None,
-        extracted_data=json.dumps(extracted) if extracted else None,
+        extracted_data=extracted or None,
         file_name=file_name,
         original_name=original_name,
         content_type=content_type,
@@ -377,6 +389,7 @@ async def edit_tax_document(
     ).first()
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
+    _check_choices(form_type, status)
 
     form_data = await request.form()
     extracted = {
@@ -399,7 +412,7 @@ async def edit_tax_document(
     doc.description = description or None
     doc.status = status
     doc.notes = notes or None
-    doc.extracted_data = json.dumps(extracted) if extracted else None
+    doc.extracted_data = extracted or None
     doc.updated_at = datetime.utcnow()
     db.commit()
     return RedirectResponse(url=f"/tax?year={tax_year}", status_code=303)
@@ -409,7 +422,7 @@ async def edit_tax_document(
 async def download_tax_file(
     doc_id: int,
     db: Session = Depends(get_db),
-    user=Depends(get_current_user),
+    user=Depends(get_current_user_html),
 ):
     doc = db.query(TaxDocument).filter(
         TaxDocument.id == doc_id, TaxDocument.user_id == user.id
@@ -430,7 +443,7 @@ async def download_tax_file(
 async def preview_tax_file(
     doc_id: int,
     db: Session = Depends(get_db),
-    user=Depends(get_current_user),
+    user=Depends(get_current_user_html),
 ):
     """Serve file inline for in-browser preview (PDF viewer / image)."""
     doc = db.query(TaxDocument).filter(
@@ -522,6 +535,7 @@ async def update_status(
     ).first()
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
+    _check_choices(status=status)
     doc.status = status
     doc.updated_at = datetime.utcnow()
     db.commit()
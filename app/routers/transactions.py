@@ -17,8 +17,12 @@ router = APIRouter(prefix="/transactions", tags=["transactions"])
 
 @router.get("/", response_model=List[TransactionRead])
 def list_transactions(db: Session = Depends(get_db), user=Depends(get_current_user)):
+    # TransactionRead's columns only; rows validate like ORM objects
     rows = (
-        db.query(Transaction)
+        db.query(
+            Transaction.id, Transaction.amount, Transaction.date, Transaction.notes,
+            Transaction.is_income, Transaction.account_id, Transaction.category_id,
+        )
         .filter(Transaction.user_id == user.id)
         .order_by(Transaction.date.desc())
         .all()
@@ -29,9 +33,10 @@ def list_transactions(db: Session = Depends(get_db), user=Depends(get_current_us
 @router.post("/", response_model=TransactionRead)
 def create_transaction(payload: TransactionCreate, db: Session = Depends(get_db), user=Depends(get_current_user)):
     # Validate FK existence
-    if not db.query(Account).filter(Account.id == payload.account_id).first():
+    # Session.get answers from the identity map when the row is already loaded
+    if db.get(Account, payload.account_id) is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
-    if not db.query(Category).filter(Category.id == payload.category_id).first():
+    if db.get(Category, payload.category_id) is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
 
     txn = Transaction(
@@ -0,0 +1,83 @@
+"""
+Day-stamped cache for scraped account/holdings snapshots
+"""
+import os
+import time
+import hashlib
+import threading
+from datetime import date
+from typing import Any, Optional
+
+try:
+    import diskcache
+    _USE_DISKCACHE = True
+except ImportError:
+    _USE_DISKCACHE = False
+
+SCRAPE_CACHE_DIR = os.getenv("SCRAPE_CACHE_DIR", "/var/cache/finlan/scrape")
+SCRAPE_CACHE_TTL_SECONDS = 3600
+
+_cache = None
+_memory = {}
+_lock = threading.Lock()
+
+
+def _disk_cache():
+    global _cache
+    if _cache is None:
+        _cache = diskcache.Cache(SCRAPE_CACHE_DIR)
+    return _cache
+
+
+def cache_key(institution: str, login: str, account: Optional[str], kind: str) -> str:
+    """
+    Key for one scrape result. Depends only on the institution, the login
+    (hashed, never stored in clear), the account and today's date, so every
+    snapshot is date-stamped and a new day always scrapes fresh.
+    """
+    login_hash = hashlib.sha256(login.encode()).hexdigest()[:16]
+    return f"{institution}:{login_hash}:{account or 'all'}:{kind}:{date.today().isoformat()}"
+
+
+def get(key: str) -> Optional[Any]:
+    """Return the cached value for key, or None if missing/expired"""
+    if _USE_DISKCACHE:
+        try:
+            return _disk_cache().get(key)
+        except Exception:
+            return None
+    with _lock:
+        entry = _memory.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del _memory[key]
+            return None
+        return entry[0]
+
+
+def put(key: str, value: Any, tag: str = "scrape"):
+    """Store value under key for SCRAPE_CACHE_TTL_SECONDS"""
+    if _USE_DISKCACHE:
+        try:
+            _disk_cache().set(key, value, expire=SCRAPE_CACHE_TTL_SECONDS, tag=tag)
+        except Exception:
+            pass
+        return
+    with _lock:
+        now = time.monotonic()
+        for k in [k for k, (_, exp) in _memory.items() if exp <= now]:
+            del _memory[k]
+        _memory[key] = (value, now + SCRAPE_CACHE_TTL_SECONDS)
+
+
+def invalidate(key: str):
+    """Drop a single cached entry"""
+    if _USE_DISKCACHE:
+        try:
+            _disk_cache().delete(key)
+        except Exception:
+            pass
+        return
+    with _lock:
+        _memory.pop(key, None)
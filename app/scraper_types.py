@@ -0,0 +1,34 @@
+"""
+Lightweight records returned by the broker scrapers
+"""
+import sys
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+# slots=True (no per-instance __dict__) needs Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
+class AccountDTO:
+    """One account row from a broker's account selector"""
+    institution: str
+    account_type: str
+    account_number_last4: str
+    balance: Decimal
+    raw_type: str
+
+
+@dataclass(**_SLOTS)
+class HoldingDTO:
+    """One position row; serialize with dataclasses.asdict (e.g. orjson default=asdict)"""
+    symbol: str
+    name: str
+    quantity: Decimal
+    current_price: Optional[Decimal]
+    current_value: Optional[Decimal]
+    cost_basis: Optional[Decimal]
+    asset_type: str = 'stock'
+    snapshot_date: date = field(default_factory=date.today)
@@ -6,11 +6,11 @@ CREATE TABLE IF NOT EXISTS espp_grants (
     symbol VARCHAR(20) NOT NULL,
     record_type VARCHAR(50),
     purchase_date DATE,
-    purchase_price DECIMAL(12, 4),
-    purchased_qty DECIMAL(16, 6),
-    sellable_qty DECIMAL(16, 6),
-    expected_gain_loss DECIMAL(12, 2),
-    est_market_value DECIMAL(12, 2),
+    purchase_price BIGINT,  -- 1e-4 dollars
+    purchased_qty BIGINT,  -- 1e-6 shares
+    sellable_qty BIGINT,  -- 1e-6 shares
+    expected_gain_loss BIGINT,  -- cents
+    est_market_value BIGINT,  -- cents
     last_updated DATETIME DEFAULT CURRENT_TIMESTAMP,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id),
@@ -31,12 +31,12 @@ CREATE TABLE IF NOT EXISTS rsu_grants (
     grant_number VARCHAR(50),
     grant_date DATE,
     settlement_type VARCHAR(50),
-    granted_qty DECIMAL(16, 6),
-    withheld_qty DECIMAL(16, 6),
-    vested_qty DECIMAL(16, 6),
-    unvested_qty DECIMAL(16, 6),
-    sellable_qty DECIMAL(16, 6),
-    est_market_value DECIMAL(12, 2),
+    granted_qty BIGINT,  -- 1e-6 shares
+    withheld_qty BIGINT,  -- 1e-6 shares
+    vested_qty BIGINT,  -- 1e-6 shares
+    unvested_qty BIGINT,  -- 1e-6 shares
+    sellable_qty BIGINT,  -- 1e-6 shares
+    est_market_value BIGINT,  -- cents
     last_updated DATETIME DEFAULT CURRENT_TIMESTAMP,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id),
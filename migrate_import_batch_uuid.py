@@ -0,0 +1,36 @@
+"""
+Migration script to store business_transactions.import_batch as UUID:
+- Postgres: VARCHAR(36) -> native uuid (16 bytes instead of 37)
+
+Elsewhere the column stays CHAR/VARCHAR; existing dashed values still load
+as uuid.UUID, new batches are written as 32 hex chars. Safe to re-run.
+"""
+
+from app.database import engine
+from sqlalchemy import text
+
+def migrate():
+    """Perform database migration"""
+
+    if engine.dialect.name != "postgresql":
+        print("Nothing to do - import_batch is stored as text on this database")
+        return
+
+    with engine.begin() as conn:
+        print("Starting migration...")
+        data_type = conn.execute(text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = 'business_transactions' AND column_name = 'import_batch'"
+        )).scalar()
+        if data_type in (None, "uuid"):
+            print("Migration already completed - import_batch is uuid")
+            return
+        print("Converting business_transactions.import_batch to uuid...")
+        conn.execute(text(
+            "ALTER TABLE business_transactions ALTER COLUMN import_batch "
+            "TYPE uuid USING NULLIF(import_batch, '')::uuid"
+        ))
+        print("Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
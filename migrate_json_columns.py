@@ -0,0 +1,42 @@
+"""
+Migration script to convert JSON-in-TEXT columns to JSONB:
+- tax_documents.extracted_data
+- broker_credentials.additional_data
+
+Only Postgres needs this: on SQLite the JSON columns are still TEXT and the
+existing values (written with json.dumps) load as-is. Safe to re-run.
+"""
+
+from app.database import engine
+from sqlalchemy import text
+
+COLUMNS = [
+    ("tax_documents", "extracted_data"),
+    ("broker_credentials", "additional_data"),
+]
+
+def migrate():
+    """Perform database migration"""
+
+    if engine.dialect.name != "postgresql":
+        print("Nothing to do - JSON columns are stored as TEXT on this database")
+        return
+
+    with engine.begin() as conn:
+        print("Starting migration...")
+        for table, column in COLUMNS:
+            data_type = conn.execute(text(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_name = :t AND column_name = :c"
+            ), {"t": table, "c": column}).scalar()
+            if data_type in (None, "jsonb"):
+                continue
+            print(f"Converting {table}.{column} to JSONB...")
+            conn.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE jsonb "
+                f"USING NULLIF({column}, '')::jsonb"
+            ))
+        print("Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,68 @@
+"""
+Migration script to store money and share quantities as BIGINT minor units:
+- Every column declared MinorUnits(scale) in app/models.py is rewritten
+  as round(value * 10**scale), e.g. 12.34 dollars -> 1234 cents
+
+Only columns still declared NUMERIC are converted, so databases created
+after the switch are left alone. SQLite columns are dynamically typed and
+keep their NUMERIC declaration, so there the converted state is also
+recorded in PRAGMA user_version. Back up the database before running.
+"""
+
+from app.database import engine, Base
+from app import models
+from sqlalchemy import Numeric, inspect, text
+
+# PRAGMA user_version once SQLite values are in minor units
+MINOR_UNITS_VERSION = 1
+
+
+def minor_unit_columns():
+    """(table, column, scale) for every MinorUnits column in the models"""
+    for table in Base.metadata.sorted_tables:
+        for column in table.columns:
+            if isinstance(column.type, models.MinorUnits):
+                yield table.name, column.name, column.type.scale
+
+
+def migrate():
+    """Perform database migration"""
+
+    with engine.begin() as conn:
+        print("Starting migration...")
+        inspector = inspect(conn)
+        existing_tables = set(inspector.get_table_names())
+        is_sqlite = conn.dialect.name == "sqlite"
+
+        if is_sqlite:
+            version = conn.execute(text("PRAGMA user_version")).scalar()
+            if version >= MINOR_UNITS_VERSION:
+                print("Migration already completed - amounts are in minor units")
+                return
+
+        for table, column, scale in minor_unit_columns():
+            if table not in existing_tables:
+                continue
+            declared = {c["name"]: c["type"] for c in inspector.get_columns(table)}
+            if not isinstance(declared.get(column), Numeric):
+                continue
+            factor = 10 ** scale
+            if is_sqlite:
+                print(f"Converting {table}.{column} to units of 1e-{scale}...")
+                conn.execute(text(
+                    f"UPDATE {table} SET {column} = CAST(ROUND({column} * {factor}) AS INTEGER) "
+                    f"WHERE {column} IS NOT NULL"
+                ))
+            else:
+                print(f"Converting {table}.{column} to BIGINT units of 1e-{scale}...")
+                conn.execute(text(
+                    f"ALTER TABLE {table} ALTER COLUMN {column} TYPE BIGINT "
+                    f"USING ROUND({column} * {factor})::bigint"
+                ))
+
+        if is_sqlite:
+            conn.execute(text(f"PRAGMA user_version = {MINOR_UNITS_VERSION}"))
+        print("Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,44 @@
+"""
+Migration script to convert tax_documents categorical columns to enums:
+- form_type -> tax_form_type
+- status    -> tax_doc_status
+
+Only Postgres needs this: elsewhere the Enum columns are plain VARCHARs and
+the existing data already fits. Safe to re-run.
+"""
+
+from app.database import engine
+from app.models import TAX_FORM_TYPES, TAX_DOC_STATUSES
+from sqlalchemy import text
+
+ENUMS = [
+    ("tax_form_type", "form_type", TAX_FORM_TYPES),
+    ("tax_doc_status", "status", TAX_DOC_STATUSES),
+]
+
+def migrate():
+    """Perform database migration"""
+
+    if engine.dialect.name != "postgresql":
+        print("Nothing to do - enum columns are VARCHAR on this database")
+        return
+
+    with engine.begin() as conn:
+        print("Starting migration...")
+        for type_name, column, values in ENUMS:
+            exists = conn.execute(
+                text("SELECT 1 FROM pg_type WHERE typname = :n"), {"n": type_name}
+            ).first()
+            if not exists:
+                labels = ", ".join(f"'{v}'" for v in values)
+                print(f"Creating type {type_name}...")
+                conn.execute(text(f"CREATE TYPE {type_name} AS ENUM ({labels})"))
+            print(f"Converting tax_documents.{column} to {type_name}...")
+            conn.execute(text(
+                f"ALTER TABLE tax_documents ALTER COLUMN {column} "
+                f"TYPE {type_name} USING {column}::text::{type_name}"
+            ))
+        print("Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
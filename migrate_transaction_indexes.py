@@ -0,0 +1,123 @@
+"""
+Migration script to add indexes to existing databases:
+- ix_transactions_user_income on transactions (user_id, is_income, amount)
+- ix_transactions_user_date on transactions (user_id, date)
+- ix_holdings_user_snapshot / ix_holdings_account_snapshot on holdings
+- ix_bank_tx_user_date and unique ix_bank_tx_user_import on bank_transactions;
+  rows that already share a (user_id, import_id) are kept and renumbered
+  first (import_id#2, #3, ... as uploads now assign them)
+- ix_tax_documents_user_year / ix_business_tx_user_year, replacing the
+  single-column tax_year indexes
+- ix_mortgage_statements_mortgage_date on mortgage_statements
+- drops the ix_<table>_id indexes on transactions, holdings,
+  bank_transactions and business_transactions, which duplicated the PK
+- Postgres only: BRIN date indexes on holdings, bank_transactions,
+  mortgage_statements and business_transactions
+
+create_all() only builds indexes for new tables, so databases created before
+an index was declared in app/models.py need this run once. Safe to re-run.
+"""
+
+from app.database import engine
+from sqlalchemy import text
+
+# (name, table, columns, unique)
+INDEXES = [
+    ("ix_transactions_user_income", "transactions", "user_id, is_income, amount", False),
+    ("ix_transactions_user_date", "transactions", "user_id, date", False),
+    ("ix_holdings_user_snapshot", "holdings", "user_id, snapshot_date", False),
+    ("ix_holdings_account_snapshot", "holdings", "account_id, snapshot_date", False),
+    ("ix_bank_tx_user_date", "bank_transactions", "user_id, transaction_date", False),
+    ("ix_bank_tx_user_import", "bank_transactions", "user_id, import_id", True),
+    ("ix_tax_documents_user_year", "tax_documents", "user_id, tax_year", False),
+    ("ix_business_tx_user_year", "business_transactions", "user_id, tax_year", False),
+    ("ix_mortgage_statements_mortgage_date", "mortgage_statements", "mortgage_id, statement_date", False),
+]
+
+# (name, table, date column); BRIN only exists on Postgres
+BRIN_INDEXES = [
+    ("ix_holdings_snapshot_brin", "holdings", "snapshot_date"),
+    ("ix_bank_tx_date_brin", "bank_transactions", "transaction_date"),
+    ("ix_mortgage_statements_date_brin", "mortgage_statements", "statement_date"),
+    ("ix_business_tx_date_brin", "business_transactions", "transaction_date"),
+]
+
+# Superseded by the (user_id, tax_year) composites above, or by the
+# primary key itself on the append-heavy transaction/holding tables
+DROPPED_INDEXES = [
+    "ix_tax_documents_tax_year",
+    "ix_business_transactions_tax_year",
+    "ix_transactions_id",
+    "ix_holdings_id",
+    "ix_bank_transactions_id",
+    "ix_business_transactions_id",
+]
+
+def renumber_duplicate_import_ids(conn):
+    """
+    Older imports could store several bank transactions of one user under the
+    same import_id (e.g. two same-day, same-amount rows of one file). Keep
+    them all, giving every one after the first the next free "#n" suffix, so
+    the unique (user_id, import_id) index can be built. Returns rows changed.
+    """
+    dupes = conn.execute(text(
+        "SELECT id, user_id, import_id FROM bank_transactions "
+        "WHERE import_id IS NOT NULL AND (user_id, import_id) IN ("
+        "  SELECT user_id, import_id FROM bank_transactions"
+        "  WHERE import_id IS NOT NULL"
+        "  GROUP BY user_id, import_id HAVING COUNT(*) > 1) "
+        "ORDER BY user_id, import_id, id"
+    )).fetchall()
+    if not dupes:
+        return 0
+
+    changed = 0
+    taken = {}  # user_id -> that user's import_ids
+    last = None
+    for row_id, user_id, import_id in dupes:
+        if (user_id, import_id) != last:
+            last, n = (user_id, import_id), 1
+            continue  # first row keeps its import_id
+        if user_id not in taken:
+            taken[user_id] = {r[0] for r in conn.execute(
+                text("SELECT import_id FROM bank_transactions "
+                     "WHERE user_id = :u AND import_id IS NOT NULL"),
+                {"u": user_id})}
+        n += 1
+        while f"{import_id}#{n}" in taken[user_id]:
+            n += 1
+        new_id = f"{import_id}#{n}"
+        taken[user_id].add(new_id)
+        print(f"  bank_transactions id={row_id}: import_id {import_id!r} -> {new_id!r}")
+        conn.execute(text("UPDATE bank_transactions SET import_id = :new WHERE id = :id"),
+                     {"new": new_id, "id": row_id})
+        changed += 1
+    return changed
+
+
+def migrate():
+    """Perform database migration"""
+    
+    with engine.begin() as conn:
+        print("Starting migration...")
+        changed = renumber_duplicate_import_ids(conn)
+        if changed:
+            print(f"Renumbered {changed} bank transaction(s) sharing an import_id")
+        for name, table, columns, unique in INDEXES:
+            print(f"Creating index {name} on {table} ({columns})...")
+            kind = "UNIQUE INDEX" if unique else "INDEX"
+            conn.execute(text(f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({columns})"))
+        if conn.dialect.name == "postgresql":
+            for name, table, column in BRIN_INDEXES:
+                print(f"Creating BRIN index {name} on {table} ({column})...")
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS {name} ON {table} "
+                    f"USING brin ({column}) WITH (pages_per_range = 32)"
+                ))
+        for name in DROPPED_INDEXES:
+            print(f"Dropping index {name}...")
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        print("Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,23 @@
+import base64
+
+from app.crypto_utils import CredentialEncryptor
+
+
+def test_encrypt_decrypt_roundtrip():
+    enc = CredentialEncryptor("test-secret")
+    token = enc.encrypt("hunter2")
+    assert token.startswith("gAAAA")
+    assert enc.decrypt(token) == "hunter2"
+
+
+def test_decrypt_legacy_double_encoded_value():
+    enc = CredentialEncryptor("test-secret")
+    legacy = base64.urlsafe_b64encode(enc.cipher.encrypt(b"hunter2")).decode()
+    assert enc.decrypt(legacy) == "hunter2"
+
+
+def test_bulk_decrypt_matches_decrypt():
+    enc = CredentialEncryptor("test-secret")
+    legacy = base64.urlsafe_b64encode(enc.cipher.encrypt(b"old")).decode()
+    tokens = [enc.encrypt("a"), "", legacy, "garbage", enc.encrypt("b" * 40)]
+    assert enc.bulk_decrypt(tokens) == ["a", "", "old", "", "b" * 40]
@@ -0,0 +1,96 @@
+import io
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app import csv_parser
+from app.csv_parser import CSVParser
+
+USB_CSV = (
+    '"Date","Transaction","Name","Memo","Amount"\n'
+    '"2025-01-02","DEBIT","Coffee Shop","card 1234","-4.50"\n'
+    '"2025-01-03","CREDIT","Payroll","","1,250.00"\n'
+)
+
+CHASE_CSV = (
+    "Details,Posting Date,Description,Amount,Type,Balance,Check or Slip #\n"
+    "DEBIT,01/05/2025,GROCERY STORE,-52.10,DEBIT_CARD,1947.90,\n"
+)
+
+
+def test_detect_format():
+    assert CSVParser.detect_format(USB_CSV) == "usb_bank"
+    assert CSVParser.detect_format(CHASE_CSV) == "chase"
+    assert CSVParser.detect_format("Plan Name: Example 401k\n") == "401k"
+    assert CSVParser.detect_format("Date,Amount,Description\n2025-01-01,1,x\n") == "generic"
+    assert CSVParser.detect_format("foo,bar\n1,2\n") == "unknown"
+
+
+def test_parse_usb_bank():
+    result = CSVParser.parse_csv(USB_CSV, "usb.csv")
+    assert result["format"] == "usb_bank"
+    txns = result["transactions"]
+    assert len(txns) == 2
+    assert txns[0]["date"] == date(2025, 1, 2)
+    assert txns[0]["amount"] == Decimal("-4.50")
+    assert txns[0]["transaction_type"] == "debit"
+    assert txns[1]["amount"] == Decimal("1250.00")
+    assert txns[1]["description"] == "CREDIT - Payroll"
+
+
+def test_parse_chase():
+    txns = CSVParser.parse_csv(CHASE_CSV, "chase.csv")["transactions"]
+    assert len(txns) == 1
+    assert txns[0]["date"] == date(2025, 1, 5)
+    assert txns[0]["amount"] == Decimal("-52.10")
+    assert txns[0]["balance"] == Decimal("1947.90")
+    assert txns[0]["transaction_type"] == "debit_card"
+
+
+def test_iter_transaction_batches_from_stream():
+    batches = list(CSVParser.iter_transaction_batches(io.StringIO(USB_CSV), batch_size=1))
+    assert [len(b) for b in batches] == [1, 1]
+    assert batches[1][0]["amount"] == Decimal("1250.00")
+
+
+def test_bad_rows_are_reported_without_failing_the_file():
+    content = USB_CSV + '"not-a-date","DEBIT","Bad","","1.00"\n'
+    result = CSVParser.parse_csv(content, "usb.csv")
+    assert result["errors"] == []
+    assert len(result["transactions"]) == 2
+    assert len(result["row_errors"]) == 1
+    assert result["row_errors"][0].startswith("row 4:")
+
+
+def test_two_digit_years_are_rejected():
+    content = CHASE_CSV + "DEBIT,01/05/24,GAS STATION,-30.00,DEBIT_CARD,1917.90,\n"
+    result = CSVParser.parse_csv(content, "chase.csv")
+    assert len(result["transactions"]) == 1
+    assert result["transactions"][0]["date"] == date(2025, 1, 5)
+    assert len(result["row_errors"]) == 1
+    assert "four-digit year" in result["row_errors"][0]
+
+
+@pytest.mark.parametrize("content, filename", [
+    (USB_CSV + '"not-a-date","DEBIT","Bad","","1.00"\n', "usb.csv"),
+    (CHASE_CSV + "DEBIT,01/06/2025,BAD AMOUNT,abc,DEBIT_CARD,,\n", "chase.csv"),
+])
+def test_pandas_path_matches_row_parser(monkeypatch, content, filename):
+    pytest.importorskip("pandas")
+    by_row = CSVParser.parse_csv(content, filename)
+    monkeypatch.setattr(csv_parser, "PANDAS_MIN_ROWS", 1)
+    by_frame = CSVParser.parse_csv(content, filename)
+
+    assert by_frame["transactions"] == by_row["transactions"]
+    # Messages differ between the paths; the reported rows must not
+    row_numbers = lambda errors: [e.split(":")[0] for e in errors]
+    assert len(by_row["row_errors"]) == 1
+    assert row_numbers(by_frame["row_errors"]) == row_numbers(by_row["row_errors"])
+
+
+def test_parse_csv_columnar():
+    cols = CSVParser.parse_csv(USB_CSV, "usb.csv", columnar=True)["transactions"]
+    assert cols["date"] == [date(2025, 1, 2), date(2025, 1, 3)]
+    assert cols["amount"] == [Decimal("-4.50"), Decimal("1250.00")]
+    assert cols["transaction_type"] == ["debit", "credit"]
@@ -0,0 +1,78 @@
+from datetime import date
+
+from app.mortgage_parser import STATEMENT_HEAD_CHARS, _parse_date, parse_roundpoint_statement
+
+ROUNDPOINT_TEXT = (
+    "RoundPoint Mortgage Servicing\n"
+    "Loan Number: 1234-5678\n"
+    "Statement Date: 03/15/2025\n"
+    "Payment Due Date: 04/01/2025\n"
+    "Unpaid Principal Balance: $312,456.78\n"
+    "Interest Rate: 6.125%\n"
+    "Total Amount Due: $2,845.12\n"
+    "Principal $612.34 Interest $1,595.40 Escrow $637.38 \n"
+    "Escrow Balance: $3,210.55\n"
+    "Year-to-Date Interest Paid: $4,780.22\n"
+    "Year-to-Date Real Estate Taxes Paid: $1,200.00\n"
+)
+
+FALLBACK_TEXT = (
+    "Loan # 99887766\n"
+    "Cycle Date 01/31/2024\n"
+    "Amount Due By 02/15/2024\n"
+    "Outstanding Principal: $99,000.00\n"
+    "Regular Monthly Payment: $900.10\n"
+    "YTD Taxes 0.00\n"
+)
+
+
+def test_parse_roundpoint_statement():
+    data = parse_roundpoint_statement(ROUNDPOINT_TEXT)
+    assert data["loan_number"] == "1234-5678"
+    assert data["statement_date"] == date(2025, 3, 15)
+    assert data["due_date"] == date(2025, 4, 1)
+    assert data["unpaid_principal"] == 312456.78
+    assert data["interest_rate"] == 6.125
+    assert data["payment_amount"] == 2845.12
+    assert (data["principal_portion"], data["interest_portion"], data["escrow_portion"]) == (612.34, 1595.40, 637.38)
+    assert data["escrow_balance"] == 3210.55
+    assert data["ytd_interest"] == 4780.22
+    assert data["ytd_taxes"] == 1200.00
+
+
+def test_parse_fallback_patterns():
+    data = parse_roundpoint_statement(FALLBACK_TEXT)
+    assert data["loan_number"] == "99887766"
+    assert data["statement_date"] == date(2024, 1, 31)
+    assert data["due_date"] == date(2024, 2, 15)
+    assert data["unpaid_principal"] == 99000.00
+    assert data["payment_amount"] == 900.10
+    assert data["ytd_taxes"] == 0.0
+    assert data["interest_rate"] is None
+
+
+def test_parse_empty_text():
+    data = parse_roundpoint_statement("")
+    assert all(value is None for value in data.values())
+
+
+def test_parse_date_month_names():
+    assert _parse_date("March 15, 2025") == date(2025, 3, 15)
+    assert _parse_date("sept 9 2024") == date(2024, 9, 9)
+    assert _parse_date("Feb. 1, 2023") == date(2023, 2, 1)
+    assert _parse_date("04/01/2025") == date(2025, 4, 1)
+
+
+def test_header_fields_only_read_from_statement_head():
+    data = parse_roundpoint_statement(" " * STATEMENT_HEAD_CHARS + ROUNDPOINT_TEXT)
+    assert (data["loan_number"], data["statement_date"], data["due_date"]) == (None, None, None)
+    assert data["unpaid_principal"] == 312456.78
+
+
+def test_parse_returns_independent_copies():
+    first = parse_roundpoint_statement(ROUNDPOINT_TEXT)
+    first["raw_text"] = ROUNDPOINT_TEXT
+    first["loan_number"] = None
+    second = parse_roundpoint_statement(ROUNDPOINT_TEXT)
+    assert second["loan_number"] == "1234-5678"
+    assert "raw_text" not in second
@@ -0,0 +1,89 @@
+from app.ocr_processor import ReceiptOCR, TaxOCR
+
+PHARMACY_RECEIPT = (
+    "CVS Pharmacy #1234\n"
+    "123 Main St\n"
+    "Date: 01/15/2025\n"
+    "Rx 55512\n"
+    "Total: $45.67\n"
+    "Paid 01/16/2025 $45.67\n"
+)
+
+DENTAL_RECEIPT = (
+    "*** RECEIPT ***\n"
+    "Bright Smiles Dental\n"
+    "Service Date Jan 5, 2024\n"
+    "Amount Due $1,250.00\n"
+    "estimate $250,000.00\n"
+)
+
+W2_DIGITAL = (
+    "123-45-6789 327968.97 54321.00\n"
+    "12-3456789\n"
+    "160200.00 9932.40\n"
+    "336518.97 4879.52\n"
+    "Acme Widgets Inc\n"
+    "CA  196-0988-2  336518.97  24452.56\n"
+    "123-45-6789 327968.97 54321.00\n"
+)
+
+W2_TESSERACT = (
+    "Employer's name, address\n"
+    "ACME CORP\n"
+    "1 Wages, tips, other comp 2 Federal income tax withheld\n"
+    " 1 55,000.00 4458 .40\n"
+    "3 Social security wages 4 Social security tax withheld\n"
+    " 55,000.00 3,410.00\n"
+    "5 Medicare wages and tips 6 Medicare tax withheld\n"
+    "55,000.00 797.50\n"
+    "17 State income tax\n"
+    "2,100.00\n"
+    "Copy 2 - for state\n"
+)
+
+ocr = ReceiptOCR()
+tax_ocr = TaxOCR()
+
+
+def test_extract_dates():
+    assert ocr.extract_dates(PHARMACY_RECEIPT) == {"service_date": "2025-01-15", "paid_date": "2025-01-16"}
+    assert ocr.extract_dates(DENTAL_RECEIPT) == {"service_date": "2024-01-05", "paid_date": None}
+    assert ocr.extract_dates("no dates here") == {"service_date": None, "paid_date": None}
+    # dates are taken in the order they appear, whatever their format
+    assert ocr.extract_dates("Visit Mar 3, 2024\nPaid 2024-03-10\n") == {"service_date": "2024-03-03", "paid_date": "2024-03-10"}
+
+
+def test_extract_amounts_takes_largest_sane_amount():
+    assert ocr.extract_amounts(PHARMACY_RECEIPT) == {"amount": 45.67}
+    assert ocr.extract_amounts(DENTAL_RECEIPT) == {"amount": 1250.00}
+    assert ocr.extract_amounts("") == {"amount": None}
+
+
+def test_extract_provider_and_category():
+    assert ocr.extract_provider(PHARMACY_RECEIPT) == "CVS Pharmacy #1234"
+    assert ocr.extract_provider(DENTAL_RECEIPT) == "Bright Smiles Dental"
+    assert ocr.extract_provider("dental " * 20 + "\nRx\nValley Clinic\n") == "Valley Clinic"
+    # short or '*'-prefixed lines only count when they name a provider
+    assert ocr.extract_provider("** CVS **\n*****\nDr. Ng\n") == "** CVS **"
+    assert ocr.extract_category(PHARMACY_RECEIPT) == "Pharmacy"
+    # dental is checked before medical/pharmacy keywords
+    assert ocr.extract_category(DENTAL_RECEIPT + "clinic\n") == "Dental"
+    assert ocr.extract_category("GROCERY STORE") is None
+
+
+def test_parse_w2_digital_layout():
+    result = tax_ocr._parse_w2(W2_DIGITAL)
+    assert (result["wages"], result["federal_withheld"]) == ("327968.97", "54321.00")
+    assert (result["ss_wages"], result["ss_withheld"]) == ("160200.00", "9932.40")
+    assert (result["medicare_wages"], result["medicare_withheld"]) == ("336518.97", "4879.52")
+    assert (result["employer_ein"], result["issuer"]) == ("12-3456789", "Acme Widgets Inc")
+    assert (result["state"], result["state_wages"], result["state_withheld"]) == ("CA", "336518.97", "24452.56")
+
+
+def test_parse_w2_tesseract_layout():
+    result = tax_ocr._parse_w2(tax_ocr._normalize_text(W2_TESSERACT))
+    assert (result["wages"], result["federal_withheld"]) == ("55000.00", "4458.40")
+    assert (result["ss_wages"], result["ss_withheld"]) == ("55000.00", "3410.00")
+    assert (result["medicare_wages"], result["medicare_withheld"]) == ("55000.00", "797.50")
+    assert result["issuer"] == "ACME CORP"
+    assert result["state_withheld"] == "2100.00"
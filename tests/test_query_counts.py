@@ -0,0 +1,163 @@
+from contextlib import contextmanager
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine.default import CACHE_HIT
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.auth import get_current_user
+from app.database import Base, INSERT_PAGE_SIZE, QUERY_CACHE_SIZE, get_db
+from app.models import User, MortgageAccount, MortgageStatement, PortfolioAccount, BankTransaction
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    """Serve requests from a throwaway SQLite file instead of finlan.db"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False},
+        insertmanyvalues_page_size=INSERT_PAGE_SIZE,
+        query_cache_size=QUERY_CACHE_SIZE,
+    )
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        yield SimpleNamespace(engine=engine, Session=session_factory)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        engine.dispose()
+
+
+@contextmanager
+def count_queries(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_mortgage_summary_query_count_is_constant(test_db):
+    db = test_db.Session()
+    user = User(username="query-count-user", hashed_password="x")
+    db.add(user)
+    db.flush()
+    for n in range(5):
+        m = MortgageAccount(user_id=user.id, servicer_name=f"Servicer {n}")
+        m.statements = [
+            MortgageStatement(statement_date=date(2025, month, 1), unpaid_principal=1000 - month)
+            for month in (1, 2, 3)
+        ]
+        db.add(m)
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=user_id)
+    try:
+        with count_queries(test_db.engine) as statements:
+            r = client.get("/mortgage/summary")
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+    assert r.status_code == 200
+    rows = r.json()
+    assert len(rows) == 5
+    assert all(row["statement_count"] == 3 for row in rows)
+    assert all(row["current_balance"] == 997 for row in rows)
+    assert len(statements) <= 3
+    # raw_text is deferred: list views never pull the statement text
+    assert not any("raw_text" in sql for sql in statements)
+
+
+def test_transactions_csv_import_is_batched(test_db):
+    db = test_db.Session()
+    user = User(username="bulk-import-user", hashed_password="x")
+    db.add(user)
+    db.flush()
+    account = PortfolioAccount(user_id=user.id, institution="Bank", account_type="checking")
+    db.add(account)
+    db.commit()
+    user_id, account_id = user.id, account.id
+    db.close()
+
+    lines = ["Date,Description,Amount"]
+    lines += [f"01/{day:02d}/2025,Coffee {day},-{day}.50" for day in range(1, 29)]
+    lines.append(lines[1])  # a second, identical purchase on the same day
+    csv_bytes = "\n".join(lines).encode()
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=user_id)
+    try:
+        with count_queries(test_db.engine) as statements:
+            r = client.post(f"/portfolio/upload/transactions?account_id={account_id}",
+                            files={"file": ("txns.csv", csv_bytes, "text/csv")})
+        again = client.post(f"/portfolio/upload/transactions?account_id={account_id}",
+                            files={"file": ("txns.csv", csv_bytes, "text/csv")})
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+    assert r.status_code == 200
+    assert r.json() == {"imported": 29, "skipped": 0}
+    # Re-uploading numbers the repeated row the same way, so it matches again
+    assert again.json() == {"imported": 0, "skipped": 29}
+    assert len(statements) <= 3
+
+    db = test_db.Session()
+    txns = db.query(BankTransaction).filter(BankTransaction.user_id == user_id).all()
+    db.close()
+    assert len(txns) == 29
+    repeated = [t for t in txns if t.import_id.endswith("#2")]
+    assert len(repeated) == 1
+    assert repeated[0].description == "Coffee 1"
+    assert any(t.import_id == repeated[0].import_id[:-2] for t in txns)
+
+
+def test_repeated_requests_reuse_compiled_sql(test_db):
+    db = test_db.Session()
+    user = User(username="statement-cache-user", hashed_password="x")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    cache_stats = []
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        cache_stats.append((context.cache_hit, statement))
+
+    urls = ["/mortgage/summary", "/portfolio/holdings", "/portfolio/transactions"]
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=user_id)
+    try:
+        for url in urls:
+            client.get(url)
+        event.listen(test_db.engine, "after_cursor_execute", after_cursor_execute)
+        try:
+            for url in urls:
+                assert client.get(url).status_code == 200
+        finally:
+            event.remove(test_db.engine, "after_cursor_execute", after_cursor_execute)
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+    assert cache_stats
+    assert [sql for hit, sql in cache_stats if hit != CACHE_HIT] == []
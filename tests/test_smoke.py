@@ -1,5 +1,6 @@
 from fastapi.testclient import TestClient
 from app.main import app
+from app.database import Base
 
 client = TestClient(app)
 
@@ -7,3 +8,9 @@ def test_health():
     r = client.get("/health")
     assert r.status_code == 200
     assert r.json()["status"] == "ok"
+
+
+def test_models_registered_once():
+    tables = [m.local_table.name for m in Base.registry.mappers]
+    assert len(tables) == len(set(tables))
+    assert set(tables) == set(Base.metadata.tables)